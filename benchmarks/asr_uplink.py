@@ -0,0 +1,112 @@
+"""
+Uplink benchmark for the ASR audio encodings.
+
+Streams ten seconds of synthetic voiced audio in 20 ms frames through
+AudioEncoder, as ASRProvider does once the ASR service has accepted an
+encoding, and reports the websocket payload rate and the CPU time the
+encoding adds to every frame. The raw row is the unencoded PCM stream sent
+today.
+
+Usage
+-----
+    python benchmarks/asr_uplink.py
+    python benchmarks/asr_uplink.py --mic-rate 48000 --seconds 30
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from providers.audio_encoder import AudioEncoder  # noqa: E402
+
+
+def _speech_like(seconds: float, rate: int) -> np.ndarray:
+    """
+    Harmonic signal with a syllable-rate envelope and some background noise.
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * rate)) / rate
+    f0 = 120 + 20 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 20))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    audio = 0.2 * voiced * envelope / np.abs(voiced).max()
+    audio += rng.normal(0, 0.003, len(t))
+    return (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+
+
+def _frames(samples: np.ndarray, rate: int, frame_ms: int) -> list:
+    size = rate * frame_ms // 1000
+    return [
+        json.dumps(
+            {
+                "audio": base64.b64encode(samples[i : i + size].tobytes()).decode(),
+                "rate": rate,
+            }
+        )
+        for i in range(0, len(samples) - size + 1, size)
+    ]
+
+
+def _measure(frames: list, seconds: float, encoding, target_rate) -> dict:
+    sent = []
+    if encoding is None:
+        send = sent.append
+        cpu = 0.0
+        for frame in frames:
+            send(frame)
+    else:
+        encoder = AudioEncoder(sent.append, encoding=encoding, target_rate=target_rate)
+        encoder.handle_reply(
+            json.dumps({"audio_encoding": {"accept": encoding, "rate": target_rate}})
+        )
+        start = time.process_time()
+        for frame in frames:
+            encoder(frame)
+        cpu = time.process_time() - start
+
+    return {
+        "bytes_per_s": sum(len(message) for message in sent) / seconds,
+        "cpu_us_per_frame": 1e6 * cpu / len(frames),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mic-rate", type=int, default=16000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--frame-ms", type=int, default=20)
+    args = parser.parse_args()
+
+    samples = _speech_like(args.seconds, args.mic_rate)
+    frames = _frames(samples, args.mic_rate, args.frame_ms)
+
+    modes = [("raw", None, None), ("mulaw", "mulaw", None)]
+    for target_rate in (16000, 8000):
+        if target_rate < args.mic_rate and args.mic_rate % target_rate == 0:
+            modes.append((f"pcm16 {target_rate} Hz", "pcm16", target_rate))
+            modes.append((f"mulaw {target_rate} Hz", "mulaw", target_rate))
+
+    print(f"mic {args.mic_rate} Hz, {len(frames)} frames of {args.frame_ms} ms")
+    print(f"{'mode':<18}{'bytes/s':>10}{'vs raw':>8}{'CPU us/frame':>14}")
+    raw = None
+    for name, encoding, target_rate in modes:
+        result = _measure(frames, args.seconds, encoding, target_rate)
+        raw = raw or result["bytes_per_s"]
+        print(
+            f"{name:<18}{result['bytes_per_s']:>10.0f}"
+            f"{result['bytes_per_s'] / raw:>8.2f}"
+            f"{result['cpu_us_per_frame']:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
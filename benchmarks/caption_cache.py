@@ -0,0 +1,107 @@
+"""
+Lookup latency benchmark for the VLM caption cache.
+
+Fills CaptionCache with signatures of synthetic scenes and reports the
+latency of lookups that hit a cached scene and of lookups that miss, for
+growing cache sizes, next to the time it takes to compute the signature of
+a frame. A cloud VLM call takes hundreds of milliseconds, so a lookup has
+to stay well below a millisecond to pay off even at a low hit rate.
+
+Usage
+-----
+    python benchmarks/caption_cache.py
+    python benchmarks/caption_cache.py --sizes 1000 100000 --lookups 2000
+"""
+
+import argparse
+import base64
+import os
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from providers.caption_cache import CaptionCache, frame_signature  # noqa: E402
+from providers.frame_dedupe import decode_frame  # noqa: E402
+
+
+def _scenes(count: int, rng) -> list:
+    noise = rng.integers(0, 256, (count, 60, 80, 3), dtype=np.uint8)
+    return [cv2.GaussianBlur(image, (9, 9), 0) for image in noise]
+
+
+def _percentiles(latencies: list) -> tuple:
+    latencies = sorted(latencies)
+    return (
+        1e6 * statistics.median(latencies),
+        1e6 * latencies[int(0.99 * (len(latencies) - 1))],
+    )
+
+
+def _signature_latency(rng) -> float:
+    image = cv2.GaussianBlur(
+        rng.integers(0, 256, (480, 640, 3), dtype=np.uint8), (31, 31), 0
+    )
+    frame = base64.b64encode(cv2.imencode(".jpg", image)[1]).decode()
+    latencies = []
+    for _ in range(200):
+        start = time.perf_counter()
+        frame_signature(decode_frame(frame, color=True))
+        latencies.append(time.perf_counter() - start)
+    return _percentiles(latencies)[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000]
+    )
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    scenes = _scenes(64, rng)
+    signatures = [frame_signature(scene) for scene in scenes]
+    print(f"signature of a 640x480 JPEG frame: {_signature_latency(rng):.0f} us (p50)")
+
+    print(
+        f"{'entries':>9}{'fill (s)':>10}{'hit p50 (us)':>14}{'hit p99 (us)':>14}"
+        f"{'miss p50 (us)':>15}{'miss p99 (us)':>15}"
+    )
+    for size in args.sizes:
+        cache = CaptionCache("benchmark", max_entries=size, max_age=float("inf"))
+        start = time.perf_counter()
+        # random hashes stand in for the frames of a long patrol
+        for i, phash in enumerate(rng.integers(0, 2**63, size - len(signatures))):
+            filler = signatures[i % len(signatures)]._replace(phash=int(phash))
+            cache.store(filler, f"caption {i}", now=0.0)
+        for i, signature in enumerate(signatures):
+            cache.store(signature, f"scene {i}", now=0.0)
+        fill = time.perf_counter() - start
+
+        hits, misses = [], []
+        for i in range(args.lookups):
+            query = signatures[i % len(signatures)]
+            start = time.perf_counter()
+            cache.lookup(query, now=1.0)
+            hits.append(time.perf_counter() - start)
+
+            query = query._replace(phash=query.phash ^ 0xFFFF)
+            start = time.perf_counter()
+            cache.lookup(query, now=1.0)
+            misses.append(time.perf_counter() - start)
+
+        print(
+            f"{size:>9}{fill:>10.2f}"
+            f"{_percentiles(hits)[0]:>14.1f}{_percentiles(hits)[1]:>14.1f}"
+            f"{_percentiles(misses)[0]:>15.1f}{_percentiles(misses)[1]:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
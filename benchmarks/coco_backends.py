@@ -0,0 +1,152 @@
+"""
+Accuracy and latency comparison of the COCO detector backends.
+
+Runs every COCODetectionProvider backend on a fixed set of images and
+compares it with the eager float32 model:
+
+eager        torchvision model as is, the reference
+torchscript  TorchScript-compiled model
+quantized    TorchScript-compiled model with int8 dynamically quantized
+             linear layers
+
+For every backend the script reports the startup time without and with the
+cached compiled model, the size of the cached model, the per-image latency,
+and the precision and recall of its detections against the reference ones.
+A detection matches a reference detection of the same label with an IoU of
+at least --iou. The compiled models are cached in a temporary directory, so
+the script does not touch the robot's model cache.
+
+Usage
+-----
+    python benchmarks/coco_backends.py --images ~/coco_samples
+    python benchmarks/coco_backends.py --images photos --threads 2 --runs 3
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import cv2
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from inputs.base.object_tracker import iou  # noqa: E402
+from providers.coco_detection_provider import (  # noqa: E402
+    BACKENDS,
+    COCODetectionProvider,
+)
+from providers.singleton import singleton  # noqa: E402
+
+
+def _images(directory: str) -> list:
+    images = []
+    for name in sorted(os.listdir(directory)):
+        image = cv2.imread(os.path.join(directory, name))
+        if image is not None:
+            images.append(image)
+    if not images:
+        sys.exit(f"No images in {directory}")
+    return images
+
+
+def _provider(backend: str, args, cache_dir: str) -> tuple:
+    # every backend gets its own provider instance
+    singleton.instances = {}
+    provider = COCODetectionProvider(
+        detection_threshold=args.threshold,
+        threads=args.threads,
+        backend=backend,
+        model_cache_dir=cache_dir,
+    )
+    start = time.perf_counter()
+    provider.load()
+    return provider, time.perf_counter() - start
+
+
+def _run(provider: COCODetectionProvider, images: list, runs: int) -> tuple:
+    def measure():
+        provider.detect_batch([images[0]])  # warm up
+        detections, latencies = [], []
+        for _ in range(runs):
+            detections = []
+            for image in images:
+                start = time.perf_counter()
+                detections.append(provider.detect_batch([image])[0])
+                latencies.append(time.perf_counter() - start)
+        return detections, latencies
+
+    return provider._executor.submit(measure).result()
+
+
+def _match(detections: list, reference: list, threshold: float) -> tuple:
+    """
+    Count the matched detections and the score differences of the matches.
+    """
+    matched, score_deltas = 0, []
+    for found, expected in zip(detections, reference):
+        unmatched = list(expected)
+        for detection in found:
+            candidates = [
+                (iou(detection.bbox, other.bbox), i)
+                for i, other in enumerate(unmatched)
+                if other.label == detection.label
+            ]
+            overlap, best = max(candidates, default=(0.0, None))
+            if best is not None and overlap >= threshold:
+                matched += 1
+                score_deltas.append(abs(detection.score - unmatched.pop(best).score))
+    return matched, score_deltas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--images", required=True, help="directory of test images")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--iou", type=float, default=0.5)
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    images = _images(args.images)
+    cache_dir = tempfile.mkdtemp(prefix="om1-coco-")
+
+    reference, _ = _run(_provider("eager", args, cache_dir)[0], images, 1)
+    expected = sum(len(found) for found in reference)
+
+    print(f"{len(images)} images, {expected} reference detections")
+    print(
+        f"{'backend':<13}{'cold (s)':>9}{'cached (s)':>11}{'size (MB)':>10}"
+        f"{'p50 (ms)':>10}{'p95 (ms)':>10}{'precision':>11}{'recall':>8}"
+        f"{'score delta':>13}"
+    )
+    for backend in args.backends:
+        provider, cold = _provider(backend, args, cache_dir)
+        cached, size = cold, 0.0
+        if backend != "eager":
+            # the second startup loads the model cached by the first one
+            path = provider.compiled_model_path
+            if os.path.exists(path):
+                size = os.path.getsize(path) / 2**20
+            provider, cached = _provider(backend, args, cache_dir)
+
+        detections, latencies = _run(provider, images, args.runs)
+        latencies.sort()
+        found = sum(len(d) for d in detections)
+        matched, score_deltas = _match(detections, reference, args.iou)
+        print(
+            f"{backend:<13}{cold:>9.2f}{cached:>11.2f}{size:>10.1f}"
+            f"{1000 * statistics.median(latencies):>10.1f}"
+            f"{1000 * latencies[int(0.95 * (len(latencies) - 1))]:>10.1f}"
+            f"{matched / found if found else 1.0:>11.3f}"
+            f"{matched / expected if expected else 1.0:>8.3f}"
+            f"{statistics.mean(score_deltas) if score_deltas else 0.0:>13.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
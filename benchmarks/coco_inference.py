@@ -0,0 +1,114 @@
+"""
+CPU inference benchmark for the COCO object detector.
+
+Runs FasterRCNN MobileNetV3 320 on camera-sized frames and reports frames
+per second and per-frame latency for two paths:
+
+baseline   the previous VLM_COCO_Local path: full resolution frame, float64
+           division, tensor copy and eager inference without inference_mode
+provider   COCODetectionProvider: resize to the 320 pixel input, in-place
+           float32 conversion, inference_mode and pinned torch threads
+
+The model weights are downloaded by torchvision on the first run.
+
+Usage
+-----
+    python benchmarks/coco_inference.py
+    python benchmarks/coco_inference.py --frames 50 --threads 2 --image room.jpg
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+import torch
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from providers.coco_detection_provider import COCODetectionProvider  # noqa: E402
+
+
+def _frames(args) -> list:
+    if args.image:
+        frame = cv2.imread(args.image)
+        if frame is None:
+            sys.exit(f"Cannot read {args.image}")
+        frame = cv2.resize(frame, (args.width, args.height))
+        return [frame] * args.frames
+
+    rng = np.random.default_rng(0)
+    return [
+        rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+        for _ in range(args.frames)
+    ]
+
+
+def _baseline(provider: COCODetectionProvider, frame: np.ndarray) -> None:
+    image = frame.copy().transpose((2, 0, 1))
+    batch_image = np.expand_dims(image, axis=0)
+    tensor_image = torch.tensor(batch_image / 255.0, dtype=torch.float)
+    provider.model(tensor_image)
+
+
+def _optimized(provider: COCODetectionProvider, frame: np.ndarray) -> None:
+    provider.detect_batch([frame])
+
+
+def _measure(run, provider, frames) -> dict:
+    run(provider, frames[0])  # warm up
+    latencies = []
+    start = time.perf_counter()
+    for frame in frames:
+        frame_start = time.perf_counter()
+        run(provider, frame)
+        latencies.append(time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "fps": len(frames) / elapsed,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p95_ms": 1000 * latencies[int(0.95 * (len(latencies) - 1))],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--image", help="use this image instead of noise frames")
+    args = parser.parse_args()
+
+    provider = COCODetectionProvider(threads=args.threads)
+    provider.load()
+    frames = _frames(args)
+
+    # the baseline runs on the calling thread, the provider on its worker
+    default_threads = torch.get_num_threads()
+    print(
+        f"{len(frames)} frames of {args.width}x{args.height}, "
+        f"provider uses {provider.threads} threads, baseline {default_threads}"
+    )
+    print(f"{'path':<10}{'FPS':>8}{'p50 (ms)':>11}{'p95 (ms)':>11}")
+    for name, run, on_worker in (
+        ("baseline", _baseline, False),
+        ("provider", _optimized, True),
+    ):
+        if on_worker:
+            result = provider._executor.submit(_measure, run, provider, frames).result()
+        else:
+            result = _measure(run, provider, frames)
+        print(
+            f"{name:<10}{result['fps']:>8.2f}"
+            f"{result['p50_ms']:>11.1f}{result['p95_ms']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
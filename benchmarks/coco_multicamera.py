@@ -0,0 +1,122 @@
+"""
+Multi-camera throughput benchmark for the COCO object detector.
+
+Feeds the frames of several simulated cameras through COCODetectionProvider
+and reports the camera frames per second and the latency of one round, in
+which every camera delivers one frame, for two paths:
+
+per-camera  one batch-size-1 forward pass per camera, as separate
+            VLM_COCO_Local instances do
+batched     one forward pass over the frames of all cameras, as a
+            VLM_COCO_Local instance with camera_indices does
+
+It also reports the model's parameter memory, which separate instances pay
+once per camera and the batched path once.
+
+Usage
+-----
+    python benchmarks/coco_multicamera.py
+    python benchmarks/coco_multicamera.py --cameras 2 4 --rounds 30 --image room.jpg
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from providers.coco_detection_provider import COCODetectionProvider  # noqa: E402
+
+
+def _frames(args, cameras: int) -> list:
+    rng = np.random.default_rng(0)
+    if args.image:
+        image = cv2.imread(args.image)
+        if image is None:
+            sys.exit(f"Cannot read {args.image}")
+        image = cv2.resize(image, (args.width, args.height))
+        # shift the image per camera, so every camera sees a different view
+        return [np.roll(image, 40 * i, axis=1) for i in range(cameras)]
+    return [
+        rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+        for _ in range(cameras)
+    ]
+
+
+def _per_camera(provider: COCODetectionProvider, frames: list) -> None:
+    for frame in frames:
+        provider.detect_batch([frame])
+
+
+def _batched(provider: COCODetectionProvider, frames: list) -> None:
+    provider.detect_batch(frames)
+
+
+def _measure(run, provider, frames, rounds) -> dict:
+    run(provider, frames)  # warm up
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        round_start = time.perf_counter()
+        run(provider, frames)
+        latencies.append(time.perf_counter() - round_start)
+    elapsed = time.perf_counter() - start
+    return {
+        "fps": rounds * len(frames) / elapsed,
+        "p50_ms": 1000 * statistics.median(latencies),
+    }
+
+
+def _model_megabytes(model) -> float:
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors) / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cameras", type=int, nargs="+", default=[1, 2, 3, 4])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--image", help="use this image instead of noise frames")
+    args = parser.parse_args()
+
+    provider = COCODetectionProvider(threads=args.threads)
+    provider.load()
+    model_mb = _model_megabytes(provider.model)
+
+    print(
+        f"{args.width}x{args.height} frames, {provider.threads} threads, "
+        f"model parameters {model_mb:.1f} MB"
+    )
+    print(
+        f"{'cameras':<9}{'path':<12}{'FPS':>8}{'round p50 (ms)':>16}"
+        f"{'model MB':>10}{'speedup':>9}"
+    )
+    for cameras in args.cameras:
+        frames = _frames(args, cameras)
+        baseline = None
+        for name, run, models in (
+            ("per-camera", _per_camera, cameras),
+            ("batched", _batched, 1),
+        ):
+            result = provider._executor.submit(
+                _measure, run, provider, frames, args.rounds
+            ).result()
+            baseline = baseline or result["fps"]
+            print(
+                f"{cameras:<9}{name:<12}{result['fps']:>8.2f}"
+                f"{result['p50_ms']:>16.1f}{models * model_mb:>10.1f}"
+                f"{result['fps'] / baseline:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
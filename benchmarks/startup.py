@@ -0,0 +1,122 @@
+"""
+Startup benchmark for the agent configurations in config/.
+
+For every config, a fresh interpreter resolves the input, LLM and simulator
+plugins and imports the action modules, then reports the wall time and peak
+resident memory that took. Components are not constructed, so no camera,
+microphone or network access is needed.
+
+Usage
+-----
+    python benchmarks/startup.py                  # all configs, lazy registry
+    python benchmarks/startup.py spot iris        # selected configs
+    python benchmarks/startup.py --eager          # import every plugin module
+"""
+
+import argparse
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CONFIG_DIR = os.path.join(ROOT, "config")
+SRC_DIR = os.path.join(ROOT, "src")
+
+
+def _import_all_plugins() -> None:
+    """
+    Import every plugin module, as the loaders did before the plugin registry.
+    """
+    for package in ("inputs", "llm", "simulators"):
+        plugins_dir = os.path.join(SRC_DIR, package, "plugins")
+        for plugin_file in sorted(os.listdir(plugins_dir)):
+            if plugin_file.endswith(".py") and plugin_file != "__init__.py":
+                importlib.import_module(f"{package}.plugins.{plugin_file[:-3]}")
+
+
+def _measure(config_name: str, eager: bool) -> dict:
+    """
+    Resolve all components of a config in the current interpreter.
+    """
+    sys.path.insert(0, SRC_DIR)
+    start = time.perf_counter()
+
+    from inputs import load_input
+    from llm import load_llm
+    from simulators import load_simulator
+
+    with open(os.path.join(CONFIG_DIR, f"{config_name}.json")) as f:
+        raw_config = json.load(f)
+
+    if eager:
+        _import_all_plugins()
+
+    for input in raw_config.get("agent_inputs", []):
+        load_input(input["type"])
+    load_llm(raw_config["cortex_llm"]["type"])
+    for simulator in raw_config.get("simulators", []):
+        load_simulator(simulator["type"])
+    for action in raw_config.get("agent_actions", []):
+        importlib.import_module(f"actions.{action['name']}.interface")
+        importlib.import_module(
+            f"actions.{action['name']}.connector.{action['connector']}"
+        )
+
+    return {
+        "config": config_name,
+        "wall_s": time.perf_counter() - start,
+        # ru_maxrss is reported in kilobytes on Linux
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "modules": len(sys.modules),
+    }
+
+
+def _run_child(config_name: str, eager: bool) -> dict:
+    """
+    Measure a config in a fresh interpreter so imports are not shared.
+    """
+    command = [sys.executable, __file__, "--child", config_name]
+    if eager:
+        command.append("--eager")
+    process = subprocess.run(command, capture_output=True, text=True)
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()
+        return {"config": config_name, "error": error[-1] if error else "failed"}
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("configs", nargs="*", help="config names, default: all")
+    parser.add_argument(
+        "--eager", action="store_true", help="import every plugin module first"
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_measure(args.configs[0], args.eager)))
+        return
+
+    configs = args.configs or sorted(
+        f[:-5] for f in os.listdir(CONFIG_DIR) if f.endswith(".json")
+    )
+
+    print(f"{'config':<22}{'wall (s)':>10}{'max RSS (MB)':>14}{'modules':>9}")
+    for config_name in configs:
+        result = _run_child(config_name, args.eager)
+        if "error" in result:
+            print(f"{config_name:<22}  error: {result['error']}")
+            continue
+        print(
+            f"{config_name:<22}{result['wall_s']:>10.3f}"
+            f"{result['max_rss_mb']:>14.1f}{result['modules']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Frame pipeline benchmark for the Unitree camera video stream.
+
+Runs synthetic camera JPEGs through the previous pipeline (full decode,
+INTER_AREA resize, encode at quality 70, base64) and through
+UnitreeCameraVideoStream.process_frame, which decodes at a reduced
+resolution and passes through frames that already fit the target size, and
+reports the milliseconds per frame of both and the fps they allow on one
+core.
+
+Usage
+-----
+    python benchmarks/unitree_camera_pipeline.py
+    python benchmarks/unitree_camera_pipeline.py --sizes 1280x720 --frames 500
+"""
+
+import argparse
+import base64
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from providers.unitree_camera_vlm_provider import (  # noqa: E402
+    UnitreeCameraVideoStream,
+    target_size,
+)
+
+
+def _camera_jpeg(width: int, height: int, rng) -> bytes:
+    noise = rng.integers(0, 256, (height // 8, width // 8, 3), dtype=np.uint8)
+    image = cv2.resize(noise, (width, height), interpolation=cv2.INTER_CUBIC)
+    return cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+
+def _previous_pipeline(data: bytes) -> str:
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    height, width = image.shape[:2]
+    ratio = width / height
+    if width > height:
+        size = (640, int(640 / ratio))
+    else:
+        size = (int(480 * ratio), 480)
+    image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    _, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 70])
+    return base64.b64encode(buffer).decode("utf-8")
+
+
+def _milliseconds(process, data: bytes, frames: int) -> float:
+    latencies = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        process(data)
+        latencies.append(time.perf_counter() - start)
+    return 1000 * statistics.median(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes", nargs="+", default=["640x480", "1280x720", "1920x1080"]
+    )
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    rng = np.random.default_rng(0)
+    # the camera itself is not needed to process frames
+    with patch("providers.unitree_camera_vlm_provider.VideoClient"):
+        stream = UnitreeCameraVideoStream(fps=30)
+
+    print(
+        f"{'camera':>10}{'sent':>10}{'previous (ms)':>15}{'new (ms)':>10}"
+        f"{'previous fps':>14}{'new fps':>9}"
+    )
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split("x"))
+        data = _camera_jpeg(width, height, rng)
+        previous = _milliseconds(_previous_pipeline, data, args.frames)
+        new = _milliseconds(stream.process_frame, data, args.frames)
+        sent = "x".join(str(v) for v in target_size(width, height))
+        print(
+            f"{size:>10}{sent:>10}{previous:>15.2f}{new:>10.2f}"
+            f"{1000 / previous:>14.0f}{1000 / new:>9.0f}"
+        )
+    print(f"stage timings: {stream.timings_summary()}")
+
+
+if __name__ == "__main__":
+    main()
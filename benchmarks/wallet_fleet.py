@@ -0,0 +1,136 @@
+"""
+Throughput benchmark for the batched Ethereum wallet monitor.
+
+Starts a local JSON-RPC stand-in that adds a fixed latency to every HTTP
+request, similar to the round trip to a public node, and measures how long a
+full balance refresh of 1, 100 and 1000 addresses takes with
+WalletEthereumFleet. For comparison, the same balances are read with one
+request per address, as WalletEthereum does for its single address.
+
+Usage
+-----
+    python benchmarks/wallet_fleet.py
+    python benchmarks/wallet_fleet.py --latency 0.05 --counts 1 10 100
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from inputs.base import SensorConfig  # noqa: E402
+from inputs.plugins.wallet_ethereum_fleet import WalletEthereumFleet  # noqa: E402
+
+
+def _start_stand_in(latency: float) -> ThreadingHTTPServer:
+    """
+    Start a JSON-RPC stand-in that advances one block per request.
+    """
+    state = {"block": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency)
+            calls = body if isinstance(body, list) else [body]
+            replies = []
+            for call in calls:
+                if call["method"] == "eth_blockNumber":
+                    state["block"] += 1
+                    result = hex(state["block"])
+                else:
+                    result = hex(10**18 + state["block"])
+                replies.append({"jsonrpc": "2.0", "id": call["id"], "result": result})
+            data = json.dumps(replies if isinstance(body, list) else replies[0])
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data.encode())
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _refresh_batched(fleet: WalletEthereumFleet) -> None:
+    fleet._fetch_changes()
+
+
+def _refresh_sequential(fleet: WalletEthereumFleet) -> None:
+    fleet._rpc([("eth_blockNumber", [])])
+    for address in fleet.addresses:
+        fleet._rpc([("eth_getBalance", [address, "latest"])])
+
+
+def _measure(fleet: WalletEthereumFleet, refresh, rounds: int) -> dict:
+    refresh(fleet)  # warm up the connection and the baseline balances
+    fleet.request_count = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        refresh(fleet)
+    elapsed = (time.perf_counter() - start) / rounds
+    return {
+        "refresh_s": elapsed,
+        "requests": fleet.request_count / rounds,
+        "addresses_per_s": len(fleet.addresses) / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=[1, 100, 1000], help="fleet sizes"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="seconds added to every request"
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=1)
+    args = parser.parse_args()
+
+    server = _start_stand_in(args.latency)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(
+        f"{'addresses':>10}  {'mode':<11}{'refresh (s)':>12}"
+        f"{'requests':>10}{'addresses/s':>13}"
+    )
+    try:
+        for count in args.counts:
+            fleet = WalletEthereumFleet(
+                SensorConfig(
+                    rpc_url=url,
+                    addresses=[f"0x{i:040x}" for i in range(count)],
+                    batch_size=args.batch_size,
+                )
+            )
+            for mode, refresh in (
+                ("batched", _refresh_batched),
+                ("sequential", _refresh_sequential),
+            ):
+                result = _measure(fleet, refresh, args.rounds)
+                print(
+                    f"{count:>10}  {mode:<11}{result['refresh_s']:>12.3f}"
+                    f"{result['requests']:>10.0f}{result['addresses_per_s']:>13.0f}"
+                )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
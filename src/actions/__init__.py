@@ -9,6 +9,7 @@ from actions.base import (
     AgentAction,
     Interface,
 )
+from providers.startup_profile_provider import StartupProfileProvider
 
 
 def describe_action(action_name: str) -> str:
@@ -81,9 +82,19 @@ def load_action(
             f"No connector found for action {action_config['name']} connector {action_config['connector']}"
         )
     config = ActionConfig(**action_config.get("config", {}))
+    startup_profile = StartupProfileProvider()
+    with startup_profile.measure(
+        "action_implementation",
+        f"{action_config['name']}.{action_config['implementation']}",
+    ):
+        implementation = implementation_class(config)
+    with startup_profile.measure(
+        "action_connector", f"{action_config['name']}.{action_config['connector']}"
+    ):
+        connector = connector_class(config)
     return AgentAction(
         name=action_config["name"],
         interface=interface,
-        implementation=implementation_class(config),
-        connector=connector_class(config),
+        implementation=implementation,
+        connector=connector,
     )
@@ -5,17 +5,46 @@ import typing as T
 
 from inputs.base import Sensor
 
+# Maps input plugin class names to the module in inputs/plugins that defines them.
+# Only the module of the requested plugin is imported, so a config that does not
+# use e.g. the COCO detector never pays for importing torch.
+INPUT_PLUGINS: T.Dict[str, str] = {
+    "ASRInput": "asr",
+    "DummyVLMLocal": "vlm_dummy_local",
+    "FaceEmotionCapture": "webcam_to_face_emotion",
+    "GovernanceEthereum": "ethereum_governance",
+    "TwitterInput": "twitter",
+    "UnitreeGo2CameraVLMCloud": "unitree_go2_camera_vlm_cloud",
+    "UnitreeGo2Lowstate": "unitree_go2_rt_lowstate",
+    "VLMGemini": "vlm_gemini",
+    "VLMOpenAI": "vlm_openai",
+    "VLMVila": "vlm_vila",
+    "VLM_COCO_Local": "vlm_coco_local",
+    "WalletCoinbase": "wallet_coinbase",
+    "WalletEthereum": "wallet_ethereum",
+    "WalletEthereumFleet": "wallet_ethereum_fleet",
+}
+
 
 def load_input(input_name: str) -> T.Type[Sensor]:
     """
     Load an input plugin from the plugins directory.
 
+    Plugins listed in INPUT_PLUGINS are imported directly. Any other name falls
+    back to importing every module in the plugins directory.
+
     Args:
         input_name: The name of the input plugin class to load.
 
     Returns:
         An instance of the input plugin.
     """
+    if input_name in INPUT_PLUGINS:
+        module = importlib.import_module(f"inputs.plugins.{INPUT_PLUGINS[input_name]}")
+        input_class = getattr(module, input_name, None)
+        if inspect.isclass(input_class) and issubclass(input_class, Sensor):
+            return input_class
+
     # Get all files in plugins directory
     plugins_dir = os.path.join(os.path.dirname(__file__), "plugins")
     plugin_files = [f[:-3] for f in os.listdir(plugins_dir) if f.endswith(".py")]
@@ -1,9 +1,28 @@
+import asyncio
+import logging
 import typing as T
 from dataclasses import dataclass
 
 R = T.TypeVar("R")
 
 
+@dataclass
+class Message:
+    """
+    Container for timestamped messages.
+
+    Parameters
+    ----------
+    timestamp : float
+        Unix timestamp of the message
+    message : str
+        Content of the message
+    """
+
+    timestamp: float
+    message: str
+
+
 @dataclass
 class SensorConfig:
     """
@@ -36,7 +55,9 @@ class Sensor(T.Generic[R]):
         Initialize an Sensor instance.
         """
         self.config = config
-        pass
+
+        # False until warm_up() has finished
+        self.ready = False
 
     async def _raw_to_text(self, raw_input: R) -> str:
         """
@@ -91,11 +112,42 @@ class Sensor(T.Generic[R]):
         """
         raise NotImplementedError
 
+    def warm_up(self) -> None:
+        """
+        Load models or other heavy resources before the sensor starts listening.
+
+        Runs once in a background worker thread when listening starts, so the
+        cortex keeps ticking while it runs. No input events are processed until
+        it has finished, so formatted_latest_buffer() returns None meanwhile.
+        Sensors without a warm-up phase keep this no-op default.
+        """
+        pass
+
+    async def _warm_up(self) -> bool:
+        """
+        Run warm_up() in a worker thread and mark the sensor as ready.
+
+        Returns
+        -------
+        bool
+            True if the sensor is ready, False if warm-up failed
+        """
+        if not self.ready:
+            try:
+                await asyncio.to_thread(self.warm_up)
+            except Exception as e:
+                logging.error(f"{self.__class__.__name__} warm-up failed: {e}")
+                return False
+            self.ready = True
+            logging.info(f"{self.__class__.__name__} is ready")
+        return True
+
     async def listen(self) -> T.AsyncIterator[R]:
         """
         Create an asynchronous iterator that yields raw input events.
 
-        The iterator continues until the input stream is closed or an error occurs.
+        Warms the sensor up first, then continues until the input stream is
+        closed or an error occurs. A sensor whose warm-up fails yields nothing.
 
         Yields
         ------
@@ -107,5 +159,8 @@ class Sensor(T.Generic[R]):
         This method relies on the _listen_loop() implementation which must be
         provided by subclasses.
         """
+        if not await self._warm_up():
+            return
+
         async for event in self._listen_loop():
             yield event
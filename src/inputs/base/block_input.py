@@ -0,0 +1,198 @@
+import asyncio
+import json
+import logging
+import typing as T
+
+import websockets
+
+from inputs.base import SensorConfig
+from inputs.base.buffered_input import BufferedInput
+
+R = T.TypeVar("R")
+
+
+class NewHeadsSubscription:
+    """
+    Websocket eth_subscribe("newHeads") client with automatic reconnect.
+
+    Runs as a task on the event loop and records the number of every new
+    block announced by the node. After a dropped connection it reconnects
+    with an exponentially growing delay.
+
+    Parameters
+    ----------
+    ws_url : str
+        Websocket JSON-RPC endpoint of the Ethereum node
+    reconnect_delay : float
+        Seconds before the first reconnect attempt
+    max_reconnect_delay : float
+        Upper bound for the reconnect delay
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ):
+        self.ws_url = ws_url
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        # True while a subscription is active
+        self.connected = False
+        self.block_number: T.Optional[int] = None
+
+        self._new_block = asyncio.Event()
+        self._task: T.Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """
+        Start the subscription task on the running event loop.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Cancel the subscription task and close the connection.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    async def wait_for_block(self, timeout: T.Optional[float] = None) -> bool:
+        """
+        Wait until a block arrives that has not been waited for yet.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum number of seconds to wait, forever if None
+
+        Returns
+        -------
+        bool
+            True if a new block arrived, False on timeout
+        """
+        try:
+            await asyncio.wait_for(self._new_block.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._new_block.clear()
+        return True
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(self.ws_url) as ws:
+                    await self._subscribe(ws)
+                    self.connected = True
+                    delay = self.reconnect_delay
+                    logging.info(f"Subscribed to new blocks at {self.ws_url}")
+                    async for raw_message in ws:
+                        self._handle_message(raw_message)
+                logging.warning("New block subscription closed by the node")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"New block subscription failed: {e}")
+            finally:
+                self.connected = False
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _subscribe(self, ws) -> None:
+        await ws.send(
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "eth_subscribe",
+                    "params": ["newHeads"],
+                }
+            )
+        )
+        while True:
+            reply = json.loads(await ws.recv())
+            if reply.get("id") != 1:
+                continue
+            if "error" in reply:
+                raise RuntimeError(f"eth_subscribe failed: {reply['error']}")
+            return
+
+    def _handle_message(self, raw_message: str) -> None:
+        try:
+            message = json.loads(raw_message)
+            if message.get("method") != "eth_subscription":
+                return
+            head = message["params"]["result"]
+            self.block_number = int(head["number"], 16)
+        except (ValueError, KeyError, TypeError) as e:
+            logging.debug(f"Ignoring malformed block notification: {e}")
+            return
+        self._new_block.set()
+
+
+class BlockInput(BufferedInput[R]):
+    """
+    Input that re-reads the chain when a new block arrives.
+
+    If the config sets a ws_url, polls are triggered by an eth_subscribe
+    ("newHeads") websocket subscription instead of a timer. While the
+    subscription is down, the input falls back to its adaptive polling
+    interval. Without a ws_url the input only polls. The subscription is
+    stopped when the listening loop is closed.
+    """
+
+    def __init__(self, config: SensorConfig = SensorConfig()):
+        """
+        Initialize BlockInput instance.
+        """
+        super().__init__(config)
+
+        ws_url = getattr(self.config, "ws_url", None)
+        self.block_subscription: T.Optional[NewHeadsSubscription] = (
+            NewHeadsSubscription(ws_url) if ws_url else None
+        )
+
+    async def _listen_loop(self) -> T.AsyncIterator[R]:
+        """
+        Polling loop that stops the block subscription when it is closed.
+
+        Yields
+        ------
+        R
+            Raw input events from polling
+        """
+        try:
+            async for reading in super()._listen_loop():
+                yield reading
+        finally:
+            if self.block_subscription is not None:
+                await self.block_subscription.stop()
+
+    async def _wait_for_next_poll(self) -> None:
+        """
+        Wait for a new block, or for the polling interval while unsubscribed.
+        """
+        if self.block_subscription is None:
+            await super()._wait_for_next_poll()
+            return
+
+        self.block_subscription.start()
+        if not self.block_subscription.connected:
+            await super()._wait_for_next_poll()
+            return
+
+        # poll anyway if the node stays silent, e.g. on a stalled connection
+        await self.block_subscription.wait_for_block(
+            self.max_poll_interval or self.poll_interval
+        )
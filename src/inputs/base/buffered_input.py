@@ -0,0 +1,183 @@
+import logging
+import time
+import typing as T
+from collections import Counter, deque
+
+from inputs.base import Message, SensorConfig
+from inputs.base.loop import FuserInput
+from providers.io_provider import IOProvider
+
+R = T.TypeVar("R")
+
+AGGREGATIONS = ("latest", "all", "count")
+
+
+class BufferedInput(FuserInput[R]):
+    """
+    Input that keeps its messages in a bounded ring buffer.
+
+    Messages produced by _raw_to_text are stored in a deque of fixed capacity,
+    so a stalled cortex cannot make the buffer grow without limit. Messages
+    older than the TTL are discarded instead of being presented as current.
+    Each fuse formats the buffered messages and clears the buffer.
+
+    The buffer is configured through the sensor config:
+
+    buffer_size : int
+        Maximum number of buffered messages; the oldest is dropped when full
+    message_ttl : float, optional
+        Maximum age of a message in seconds; None keeps messages until fused
+    aggregation : str
+        "latest" reports the newest message, "all" every message since the
+        last fuse and "count" every distinct message with its number of
+        occurrences
+    """
+
+    # Defaults, overridable by subclasses and per sensor in the config
+    buffer_size: int = 10
+    message_ttl: T.Optional[float] = None
+    aggregation: str = "latest"
+
+    def __init__(self, config: SensorConfig = SensorConfig()):
+        """
+        Initialize BufferedInput instance.
+        """
+        super().__init__(config)
+
+        # Track IO
+        self.io_provider = IOProvider()
+
+        # Simple description of sensor output to help LLM understand its importance and utility
+        self.descriptor_for_LLM = self.__class__.__name__
+
+        self.buffer_size = getattr(self.config, "buffer_size", self.buffer_size)
+        self.message_ttl = getattr(self.config, "message_ttl", self.message_ttl)
+        self.aggregation = getattr(self.config, "aggregation", self.aggregation)
+        if self.aggregation not in AGGREGATIONS:
+            raise ValueError(
+                f"Unknown aggregation {self.aggregation}, expected one of {AGGREGATIONS}"
+            )
+
+        # Messages buffer
+        self.messages: T.Deque[Message] = deque(maxlen=self.buffer_size)
+
+        # Number of messages that were overwritten or expired before a fuse
+        self.dropped_messages = 0
+
+    def add_message(self, message: Message) -> None:
+        """
+        Append a message to the buffer, dropping the oldest one if it is full.
+
+        Parameters
+        ----------
+        message : Message
+            The message to buffer
+        """
+        if len(self.messages) == self.buffer_size:
+            self.dropped_messages += 1
+            logging.debug(
+                f"{self.__class__.__name__}: buffer full, "
+                f"{self.dropped_messages} messages dropped"
+            )
+        self.messages.append(message)
+
+    def fresh_messages(self) -> T.List[Message]:
+        """
+        Get the buffered messages that have not expired.
+
+        Expired messages are removed from the buffer and counted as dropped.
+
+        Returns
+        -------
+        List[Message]
+            Unexpired messages, oldest first
+        """
+        if self.message_ttl is None:
+            return list(self.messages)
+
+        now = time.time()
+        fresh = [m for m in self.messages if now - m.timestamp <= self.message_ttl]
+        expired = len(self.messages) - len(fresh)
+        if expired > 0:
+            self.dropped_messages += expired
+            logging.debug(
+                f"{self.__class__.__name__}: {expired} stale messages discarded"
+            )
+            self.messages.clear()
+            self.messages.extend(fresh)
+        return fresh
+
+    def aggregate(self, messages: T.List[Message]) -> str:
+        """
+        Combine messages into the text reported to the LLM.
+
+        Parameters
+        ----------
+        messages : List[Message]
+            Non-empty list of messages, oldest first
+
+        Returns
+        -------
+        str
+            Aggregated text according to the configured aggregation
+        """
+        if self.aggregation == "all":
+            return "\n".join(m.message for m in messages)
+
+        if self.aggregation == "count":
+            counts = Counter(m.message for m in messages)
+            # most recently seen message last
+            ordered = list(dict.fromkeys(m.message for m in reversed(messages)))
+            return "\n".join(
+                text if counts[text] == 1 else f"{text} (seen {counts[text]} times)"
+                for text in reversed(ordered)
+            )
+
+        return messages[-1].message
+
+    async def raw_to_text(self, raw_input: R):
+        """
+        Convert raw input to text and update message buffer.
+
+        Parameters
+        ----------
+        raw_input : R
+            Raw input to be processed
+        """
+        pending_message = await self._raw_to_text(raw_input)
+
+        if pending_message is not None:
+            self.add_message(pending_message)
+
+    def formatted_latest_buffer(self) -> T.Optional[str]:
+        """
+        Format and clear the latest buffer contents.
+
+        Aggregates the unexpired messages, adds the result to the IO provider,
+        then clears the buffer.
+
+        Returns
+        -------
+        Optional[str]
+            Formatted string of buffer contents or None if no fresh message
+            is buffered
+        """
+        messages = self.fresh_messages()
+        if len(messages) == 0:
+            return None
+
+        content = self.aggregate(messages)
+
+        result = f"""
+{self.descriptor_for_LLM} INPUT
+// START
+{content}
+// END
+"""
+
+        self.io_provider.add_input(
+            self.__class__.__name__, content, messages[-1].timestamp
+        )
+        self.messages.clear()
+
+        return result
@@ -0,0 +1,216 @@
+import collections
+import logging
+import time
+import typing as T
+from dataclasses import dataclass
+
+import numpy as np
+
+from inputs.base.object_tracker import ObjectTracker
+
+# (x, y, w, h) in frame pixels, as returned by the face detector
+FaceBox = T.Tuple[int, int, int, int]
+
+_FaceDetection = collections.namedtuple("_FaceDetection", "label, bbox, score")
+
+
+@dataclass
+class TrackedFace:
+    """
+    A face followed across frames, with its smoothed emotion.
+
+    Parameters
+    ----------
+    track_id : int
+        Persistent ID of the face
+    bbox : FaceBox
+        Latest (x, y, w, h) of the face in frame pixels
+    probabilities : np.ndarray, optional
+        Exponential moving average of the emotion probabilities, None until
+        the face is classified
+    crop : np.ndarray, optional
+        The crop the face was last classified on
+    frames_since_classified : int
+        Number of frames the face was seen on since its last classification
+    """
+
+    track_id: int
+    bbox: FaceBox
+    probabilities: T.Optional[np.ndarray] = None
+    crop: T.Optional[np.ndarray] = None
+    frames_since_classified: int = 0
+
+
+class FaceTracker:
+    """
+    Keeps face identities across frames, so emotions are classified once
+    per face every few frames rather than for every face on every frame.
+
+    Faces are associated with the tracks of an ObjectTracker. A tracked face
+    is classified again after reclassify_every frames, or sooner when its
+    crop differs from the one it was last classified on by more than
+    crop_change_threshold (mean absolute difference relative to full
+    scale). New classifications are blended into an exponential moving
+    average of the class probabilities with weight smoothing, so a single
+    misread frame does not flip the reported emotion. Faces not seen for
+    more than max_misses analyzed frames, or not detected for more than
+    max_age seconds, expire. Callers that skip frames should analyze one
+    as soon as stale() reports a face that is due to be confirmed, so a
+    face that left does not linger while the scene stays unchanged.
+
+    Parameters
+    ----------
+    reclassify_every : int
+        Number of frames after which a face is classified again
+    crop_change_threshold : float
+        Crop difference from which a face is classified again immediately
+    smoothing : float
+        Weight of a new classification in the moving average, 1 disables
+        smoothing
+    max_misses : int
+        Number of consecutive analyzed frames a face may be missing from
+    iou_threshold : float
+        Minimum IoU of a face and a track to be matched by overlap
+    max_age : float
+        Seconds a face may go undetected before it expires
+    """
+
+    def __init__(
+        self,
+        reclassify_every: int = 5,
+        crop_change_threshold: float = 0.1,
+        smoothing: float = 0.4,
+        max_misses: int = 2,
+        iou_threshold: float = 0.3,
+        max_age: float = 2.0,
+    ):
+        self.reclassify_every = reclassify_every
+        self.crop_change_threshold = crop_change_threshold
+        self.smoothing = smoothing
+        self.max_age = max_age
+
+        self.tracker = ObjectTracker(iou_threshold=iou_threshold, max_misses=max_misses)
+        self.faces: T.Dict[int, TrackedFace] = {}
+
+    def update(
+        self,
+        boxes: T.Sequence[FaceBox],
+        crops: T.Sequence[np.ndarray],
+        now: T.Optional[float] = None,
+    ) -> T.List[int]:
+        """
+        Associate the faces of a frame with the tracks.
+
+        Parameters
+        ----------
+        boxes : Sequence[FaceBox]
+            (x, y, w, h) of the detected faces
+        crops : Sequence[np.ndarray]
+            Model input crop of every face
+        now : float, optional
+            Timestamp of the frame
+
+        Returns
+        -------
+        List[int]
+            Indices of the faces that have to be classified
+        """
+        now = now if now is not None else time.time()
+        detections = [
+            _FaceDetection("face", (x, y, x + w, y + h), 1.0) for x, y, w, h in boxes
+        ]
+        tracks = self.tracker.update(detections, now=now)
+        tracks = self.tracker.tracks = [
+            track for track in tracks if now - track.last_detected <= self.max_age
+        ]
+
+        pending = []
+        faces = {}
+        for track in tracks:
+            face = self.faces.get(track.track_id) or TrackedFace(
+                track.track_id, boxes[track.detection]
+            )
+            faces[track.track_id] = face
+            if track.detection is None:
+                continue
+
+            index = track.detection
+            face.bbox = tuple(boxes[index])
+            face.frames_since_classified += 1
+            if (
+                face.probabilities is None
+                or face.frames_since_classified >= self.reclassify_every
+                or self._crop_change(face.crop, crops[index])
+                >= self.crop_change_threshold
+            ):
+                face.crop = crops[index]
+                pending.append(index)
+
+        for track_id in self.faces.keys() - faces.keys():
+            logging.debug(f"Face {track_id} expired")
+        self.faces = faces
+        return sorted(pending)
+
+    def classified(self, indices: T.Sequence[int], probabilities: np.ndarray) -> None:
+        """
+        Blend the classifications of faces into their moving averages.
+
+        Parameters
+        ----------
+        indices : Sequence[int]
+            Indices of the classified faces, as returned by update()
+        probabilities : np.ndarray
+            Emotion probabilities of every classified face
+        """
+        by_detection = {
+            track.detection: self.faces[track.track_id]
+            for track in self.tracker.tracks
+            if track.detection is not None
+        }
+        for index, p in zip(indices, probabilities):
+            face = by_detection[index]
+            p = np.asarray(p, dtype=np.float64)
+            if face.probabilities is None:
+                face.probabilities = p
+            else:
+                face.probabilities = (
+                    self.smoothing * p + (1 - self.smoothing) * face.probabilities
+                )
+            face.frames_since_classified = 0
+
+    def stale(self, now: T.Optional[float] = None) -> bool:
+        """
+        Whether a face has gone undetected for more than max_age seconds.
+
+        Parameters
+        ----------
+        now : float, optional
+            Current time
+
+        Returns
+        -------
+        bool
+            True if the next frame should be analyzed to confirm or expire
+            the face
+        """
+        now = now if now is not None else time.time()
+        return any(
+            now - track.last_detected > self.max_age for track in self.tracker.tracks
+        )
+
+    def visible(self) -> T.List[TrackedFace]:
+        """
+        Classified faces that have not expired, oldest first.
+        """
+        return [
+            self.faces[track.track_id]
+            for track in self.tracker.tracks
+            if self.faces[track.track_id].probabilities is not None
+        ]
+
+    @staticmethod
+    def _crop_change(previous: T.Optional[np.ndarray], crop: np.ndarray) -> float:
+        if previous is None or previous.shape != crop.shape:
+            return float("inf")
+        difference = np.abs(previous.astype(np.float32) - crop.astype(np.float32))
+        return float(np.mean(difference)) / 255.0
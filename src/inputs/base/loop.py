@@ -1,3 +1,5 @@
+import asyncio
+import logging
 import typing as T
 
 from inputs.base import Sensor, SensorConfig
@@ -11,14 +13,97 @@ class FuserInput(Sensor[R]):
 
     Repeatedly polls for input events in an async loop, yielding results
     as they become available.
+
+    Sensors that set a poll_interval are paced by the loop. When the interval
+    may grow up to max_poll_interval, it is multiplied by poll_backoff after
+    every reading that equals the previous one and snaps back to poll_interval
+    as soon as a reading changes. Sensors without a poll_interval pace
+    themselves inside _poll.
+
+    The bounds can be overridden per sensor in the config with the
+    poll_interval, max_poll_interval and poll_backoff keys.
     """
 
+    # Seconds between polls, None leaves the pacing to _poll
+    poll_interval: T.Optional[float] = None
+
+    # Upper bound for the interval, None disables the backoff
+    max_poll_interval: T.Optional[float] = None
+
+    # Growth factor of the interval after an unchanged reading
+    poll_backoff: float = 2.0
+
     def __init__(self, config: SensorConfig = SensorConfig()):
         """
         Initialize FuserInput instance.
         """
         super().__init__(config)
 
+        self.poll_interval = getattr(self.config, "poll_interval", self.poll_interval)
+        self.max_poll_interval = getattr(
+            self.config, "max_poll_interval", self.max_poll_interval
+        )
+        self.poll_backoff = getattr(self.config, "poll_backoff", self.poll_backoff)
+
+        # Interval used before the next poll
+        self.current_poll_interval: T.Optional[float] = self.poll_interval
+
+        self._has_reading = False
+        self._last_reading: T.Optional[R] = None
+
+    def _reading_changed(self, previous: R, current: R) -> bool:
+        """
+        Decide whether a reading differs from the previous one.
+
+        Parameters
+        ----------
+        previous : R
+            The previous raw reading
+        current : R
+            The latest raw reading
+
+        Returns
+        -------
+        bool
+            True if the polling rate should snap back to poll_interval
+        """
+        return previous != current
+
+    def _update_poll_interval(self, reading: R) -> None:
+        """
+        Adapt the polling interval to the latest reading.
+
+        Parameters
+        ----------
+        reading : R
+            The latest raw reading
+        """
+        if self.poll_interval is None or self.max_poll_interval is None:
+            return
+
+        if self._has_reading and not self._reading_changed(self._last_reading, reading):
+            interval = min(
+                self.current_poll_interval * self.poll_backoff,
+                self.max_poll_interval,
+            )
+        else:
+            interval = self.poll_interval
+
+        if interval != self.current_poll_interval:
+            logging.debug(
+                f"{self.__class__.__name__}: poll interval {interval:.2f} seconds"
+            )
+        self.current_poll_interval = interval
+        self._last_reading = reading
+        self._has_reading = True
+
+    async def _wait_for_next_poll(self) -> None:
+        """
+        Wait until the next poll is due.
+        """
+        if self.current_poll_interval is not None:
+            await asyncio.sleep(self.current_poll_interval)
+
     async def _listen_loop(self) -> T.AsyncIterator[R]:
         """
         Main polling loop that continuously yields input events.
@@ -29,7 +114,10 @@ class FuserInput(Sensor[R]):
             Raw input events from polling
         """
         while True:
-            yield await self._poll()
+            await self._wait_for_next_poll()
+            reading = await self._poll()
+            self._update_poll_interval(reading)
+            yield reading
 
     async def _poll(self) -> R:
         """
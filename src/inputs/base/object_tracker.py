@@ -0,0 +1,318 @@
+import itertools
+import logging
+import time
+import typing as T
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+# (x1, y1, x2, y2) in frame pixels
+BBox = T.Tuple[float, float, float, float]
+
+
+@dataclass
+class Track:
+    """
+    An object followed across frames.
+
+    Parameters
+    ----------
+    track_id : int
+        Persistent ID of the object
+    label : str
+        Class label of the object
+    bbox : BBox
+        Latest bounding box in frame pixels
+    score : float
+        Score of the latest detection
+    first_seen : float
+        Timestamp of the first detection
+    last_detected : float
+        Timestamp of the latest detection
+    misses : int
+        Number of consecutive detector runs that did not find the object
+    detection : int, optional
+        Index of the object in the detections of the latest update(), None
+        if that run missed it
+    template : np.ndarray, optional
+        Grayscale thumbnail of the object at its latest detection
+    """
+
+    track_id: int
+    label: str
+    bbox: BBox
+    score: float
+    first_seen: float
+    last_detected: float
+    misses: int = 0
+    detection: T.Optional[int] = None
+    template: T.Optional[np.ndarray] = None
+
+    def age(self, now: T.Optional[float] = None) -> float:
+        """
+        Seconds since the object was first detected.
+        """
+        return (now if now is not None else time.time()) - self.first_seen
+
+
+def iou(a: BBox, b: BBox) -> float:
+    """
+    Intersection over union of two boxes.
+    """
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def _centroid_distance(a: BBox, b: BBox) -> float:
+    return float(
+        np.hypot((a[0] + a[2] - b[0] - b[2]) / 2, (a[1] + a[3] - b[1] - b[3]) / 2)
+    )
+
+
+class ObjectTracker:
+    """
+    IoU and centroid tracker with optical flow propagation.
+
+    update() associates the detections of a detector run with the existing
+    tracks: pairs with the same label are matched greedily by IoU, and the
+    remaining ones by centroid distance relative to the box size. Matched
+    tracks keep their ID, unmatched detections start new tracks, and tracks
+    missed by more than max_misses detector runs are dropped.
+
+    Between detector runs, propagate() moves every box by the median
+    Lucas-Kanade optical flow of feature points inside it, so a full
+    detection is only needed every few frames. It reports a track as lost
+    when fewer than min_points of its points can be followed forward and
+    back to where they started, or when the content of the moved box no
+    longer looks like the object did at its latest detection, e.g. because
+    the object left and the box now holds the static background.
+
+    Parameters
+    ----------
+    iou_threshold : float
+        Minimum IoU of a detection and a track to be matched by overlap
+    max_centroid_distance : float
+        Maximum centroid distance, relative to the track's box diagonal, of a
+        detection and a track to be matched by position
+    max_misses : int
+        Number of consecutive missed detector runs a track survives
+    min_points : int
+        Minimum number of followed feature points for a track to be kept
+    max_flow_error : float
+        Maximum forward-backward error in pixels of a followed point
+    min_similarity : float
+        Minimum normalized correlation of a moved box with the object's
+        thumbnail at its latest detection
+    """
+
+    # Size of the object thumbnails compared by propagate()
+    template_size: T.Tuple[int, int] = (24, 24)
+
+    def __init__(
+        self,
+        iou_threshold: float = 0.3,
+        max_centroid_distance: float = 0.5,
+        max_misses: int = 1,
+        min_points: int = 4,
+        max_flow_error: float = 1.0,
+        min_similarity: float = 0.5,
+    ):
+        self.iou_threshold = iou_threshold
+        self.max_centroid_distance = max_centroid_distance
+        self.max_misses = max_misses
+        self.min_points = min_points
+        self.max_flow_error = max_flow_error
+        self.min_similarity = min_similarity
+
+        self.tracks: T.List[Track] = []
+
+        self._ids = itertools.count(1)
+        self._previous_gray: T.Optional[np.ndarray] = None
+
+    def update(
+        self,
+        detections: T.Sequence[T.Any],
+        frame: T.Optional[np.ndarray] = None,
+        now: T.Optional[float] = None,
+    ) -> T.List[Track]:
+        """
+        Associate the results of a detector run with the tracks.
+
+        Parameters
+        ----------
+        detections : Sequence
+            Detections with label, bbox and score attributes
+        frame : np.ndarray, optional
+            The frame the detector ran on, used by the next propagate()
+        now : float, optional
+            Timestamp of the frame
+
+        Returns
+        -------
+        List[Track]
+            The current tracks
+        """
+        now = now if now is not None else time.time()
+        gray = None
+        if frame is not None:
+            gray = self._previous_gray = self._gray(frame)
+
+        unmatched_tracks = set(range(len(self.tracks)))
+        unmatched_detections = set(range(len(detections)))
+
+        for score_pair in (self._iou_pairs, self._centroid_pairs):
+            for _, t, d in score_pair(
+                detections, unmatched_tracks, unmatched_detections
+            ):
+                if t not in unmatched_tracks or d not in unmatched_detections:
+                    continue
+                track, detection = self.tracks[t], detections[d]
+                track.bbox = tuple(float(v) for v in detection.bbox)
+                track.score = float(detection.score)
+                track.last_detected = now
+                track.misses = 0
+                track.detection = d
+                track.template = self._template(gray, track.bbox)
+                unmatched_tracks.discard(t)
+                unmatched_detections.discard(d)
+
+        for t in unmatched_tracks:
+            self.tracks[t].misses += 1
+            self.tracks[t].detection = None
+
+        for d in sorted(unmatched_detections):
+            detection = detections[d]
+            track = Track(
+                track_id=next(self._ids),
+                label=detection.label,
+                bbox=tuple(float(v) for v in detection.bbox),
+                score=float(detection.score),
+                first_seen=now,
+                last_detected=now,
+                detection=d,
+            )
+            track.template = self._template(gray, track.bbox)
+            logging.debug(f"New track {track.track_id}: {track.label}")
+            self.tracks.append(track)
+
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+        return self.tracks
+
+    def propagate(self, frame: np.ndarray) -> bool:
+        """
+        Move the tracks along with the image content since the last frame.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            The new frame
+
+        Returns
+        -------
+        bool
+            False if a track was lost and the detector should run
+        """
+        gray = self._gray(frame)
+        previous, self._previous_gray = self._previous_gray, gray
+        if previous is None or previous.shape != gray.shape:
+            return not self.tracks
+
+        height, width = gray.shape
+        for track in self.tracks:
+            x1, y1, x2, y2 = (int(round(v)) for v in track.bbox)
+            x1, y1 = max(x1, 0), max(y1, 0)
+            x2, y2 = min(x2, width), min(y2, height)
+            if x2 - x1 < 4 or y2 - y1 < 4:
+                return False
+
+            mask = np.zeros_like(previous)
+            mask[y1:y2, x1:x2] = 255
+            points = cv2.goodFeaturesToTrack(
+                previous, maxCorners=20, qualityLevel=0.01, minDistance=3, mask=mask
+            )
+            if points is None or len(points) < self.min_points:
+                return False
+
+            moved, status, _ = cv2.calcOpticalFlowPyrLK(previous, gray, points, None)
+            back, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, previous, moved, None)
+            error = np.linalg.norm((back - points).reshape(-1, 2), axis=1)
+            followed = (
+                (status.reshape(-1) == 1)
+                & (back_status.reshape(-1) == 1)
+                & (error <= self.max_flow_error)
+            )
+            if np.count_nonzero(followed) < self.min_points:
+                return False
+
+            dx, dy = np.median((moved - points).reshape(-1, 2)[followed], axis=0)
+            bx1, by1, bx2, by2 = track.bbox
+            bbox = (bx1 + dx, by1 + dy, bx2 + dx, by2 + dy)
+            if track.template is not None:
+                current = self._template(gray, bbox)
+                if current is None or self._similarity(track.template, current) < (
+                    self.min_similarity
+                ):
+                    return False
+            track.bbox = bbox
+
+        return True
+
+    def _iou_pairs(self, detections, tracks, candidates):
+        pairs = []
+        for t in tracks:
+            for d in candidates:
+                if self.tracks[t].label != detections[d].label:
+                    continue
+                overlap = iou(self.tracks[t].bbox, detections[d].bbox)
+                if overlap >= self.iou_threshold:
+                    pairs.append((-overlap, t, d))
+        return sorted(pairs)
+
+    def _centroid_pairs(self, detections, tracks, candidates):
+        pairs = []
+        for t in tracks:
+            bbox = self.tracks[t].bbox
+            diagonal = max(float(np.hypot(bbox[2] - bbox[0], bbox[3] - bbox[1])), 1.0)
+            for d in candidates:
+                if self.tracks[t].label != detections[d].label:
+                    continue
+                distance = _centroid_distance(bbox, detections[d].bbox) / diagonal
+                if distance <= self.max_centroid_distance:
+                    pairs.append((distance, t, d))
+        return sorted(pairs)
+
+    def _template(
+        self, gray: T.Optional[np.ndarray], bbox: BBox
+    ) -> T.Optional[np.ndarray]:
+        if gray is None:
+            return None
+        height, width = gray.shape
+        x1, y1, x2, y2 = (int(round(v)) for v in bbox)
+        x1, y1 = max(x1, 0), max(y1, 0)
+        x2, y2 = min(x2, width), min(y2, height)
+        if x2 - x1 < 2 or y2 - y1 < 2:
+            return None
+        return cv2.resize(
+            gray[y1:y2, x1:x2], self.template_size, interpolation=cv2.INTER_AREA
+        ).astype(np.float32)
+
+    @staticmethod
+    def _similarity(a: np.ndarray, b: np.ndarray) -> float:
+        a = a - a.mean()
+        b = b - b.mean()
+        norm = float(np.sqrt((a * a).sum() * (b * b).sum()))
+        # two flat patches look alike
+        return float((a * b).sum()) / norm if norm > 0 else 1.0
+
+    @staticmethod
+    def _gray(frame: np.ndarray) -> np.ndarray:
+        frame = np.asarray(frame)
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame.astype(np.uint8), cv2.COLOR_BGR2GRAY)
+        return frame.astype(np.uint8)
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import typing as T
+
+from inputs.base import SensorConfig
+from inputs.base.buffered_input import BufferedInput
+
+R = T.TypeVar("R")
+
+
+class QueueInput(BufferedInput[R]):
+    """
+    Input fed by callbacks running on provider threads.
+
+    Provider callbacks hand messages over with put_message(), which is safe to
+    call from any thread. Messages are delivered to the event loop with
+    loop.call_soon_threadsafe and _poll() awaits the queue directly, so a
+    message is processed as soon as it arrives and an idle sensor never wakes
+    the event loop.
+    """
+
+    def __init__(self, config: SensorConfig = SensorConfig()):
+        """
+        Initialize QueueInput instance.
+        """
+        super().__init__(config)
+
+        # Buffer for storing messages
+        self.message_buffer: asyncio.Queue[R] = asyncio.Queue()
+
+        # Event loop consuming the buffer, bound on the first poll
+        self._loop: T.Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+    def put_message(self, message: R) -> None:
+        """
+        Add a message to the buffer. Safe to call from any thread.
+
+        Parameters
+        ----------
+        message : R
+            The message to deliver to the listen loop
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                # Nobody is waiting on the queue before the loop is bound
+                self.message_buffer.put_nowait(message)
+                return
+            loop = self._loop
+
+        try:
+            loop.call_soon_threadsafe(self.message_buffer.put_nowait, message)
+        except RuntimeError:
+            # The event loop has been closed during shutdown
+            pass
+
+    async def _next_message(self, timeout: T.Optional[float] = None) -> T.Optional[R]:
+        """
+        Wait for the next message from the buffer.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum number of seconds to wait, forever if None
+
+        Returns
+        -------
+        Optional[R]
+            The next message, or None if the timeout expired
+        """
+        if self._loop is None:
+            with self._loop_lock:
+                self._loop = asyncio.get_running_loop()
+
+        try:
+            return await asyncio.wait_for(self.message_buffer.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def _poll(self) -> T.Optional[R]:
+        """
+        Wait for the next message from the provider.
+
+        Returns
+        -------
+        Optional[R]
+            The next message from the buffer
+        """
+        return await self._next_message()
+
+    async def raw_to_text(self, raw_input: T.Optional[R]):
+        """
+        Convert raw input to text and update message buffer.
+
+        Parameters
+        ----------
+        raw_input : Optional[R]
+            Raw input to be processed, or None if no input is available
+        """
+        if raw_input is None:
+            return
+
+        await super().raw_to_text(raw_input)
@@ -0,0 +1,150 @@
+import logging
+import time
+import typing as T
+
+import cv2
+import numpy as np
+
+from inputs.base import SensorConfig
+
+
+class SceneChangeGate:
+    """
+    Cheap pre-filter that lets vision sensors skip frames of a static scene.
+
+    Every frame is shrunk to a small grayscale thumbnail and compared with
+    the thumbnail of the last frame that was analyzed. Frames whose mean
+    absolute difference stays below the threshold are skipped, and the
+    sensor reuses its previous result. Comparing against the last analyzed
+    frame rather than the previous one means that slow drift still adds up
+    to a change. A frame is analyzed at least every refresh_interval
+    seconds, so results stay current.
+
+    Parameters
+    ----------
+    name : str
+        Name of the sensor, used when reporting the skip ratio
+    threshold : float
+        Mean absolute thumbnail difference, relative to full scale, from
+        which a frame counts as changed; 0 analyzes every frame
+    refresh_interval : float
+        Maximum number of seconds between two analyzed frames
+    thumbnail_size : Tuple[int, int]
+        Width and height of the compared thumbnails
+    report_every : int
+        Number of frames between two skip ratio log lines
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: float = 0.02,
+        refresh_interval: float = 10.0,
+        thumbnail_size: T.Tuple[int, int] = (32, 24),
+        report_every: int = 100,
+    ):
+        self.name = name
+        self.threshold = threshold
+        self.refresh_interval = refresh_interval
+        self.thumbnail_size = thumbnail_size
+        self.report_every = report_every
+
+        self.frames = 0
+        self.skipped = 0
+
+        self._reference: T.Optional[np.ndarray] = None
+        self._reference_time = 0.0
+
+    @classmethod
+    def from_config(cls, name: str, config: SensorConfig) -> "SceneChangeGate":
+        """
+        Create a gate configured by the scene_change_threshold and
+        scene_refresh_interval keys of a sensor config.
+
+        Parameters
+        ----------
+        name : str
+            Name of the sensor
+        config : SensorConfig
+            The sensor configuration
+
+        Returns
+        -------
+        SceneChangeGate
+            The configured gate
+        """
+        return cls(
+            name,
+            threshold=getattr(config, "scene_change_threshold", 0.02),
+            refresh_interval=getattr(config, "scene_refresh_interval", 10.0),
+        )
+
+    @property
+    def skip_ratio(self) -> float:
+        """
+        Fraction of frames that were skipped.
+        """
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Shrink a frame to a grayscale thumbnail scaled to [0, 1].
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            Color (height, width, 3) or grayscale (height, width) frame
+
+        Returns
+        -------
+        np.ndarray
+            float32 thumbnail of thumbnail_size
+        """
+        frame = np.asarray(frame)
+        small = cv2.resize(
+            frame, self.thumbnail_size, interpolation=cv2.INTER_AREA
+        ).astype(np.float32)
+        if small.ndim == 3:
+            small = small.mean(axis=2)
+        # 8-bit frames, or float frames already scaled to [0, 1]
+        if np.issubdtype(frame.dtype, np.floating) and small.max() <= 1.0:
+            return small
+        return small / 255.0
+
+    def should_process(self, frame: np.ndarray) -> bool:
+        """
+        Decide whether a frame has to be analyzed.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            The captured frame
+
+        Returns
+        -------
+        bool
+            True if the frame must be analyzed, False if the previous result
+            can be reused
+        """
+        self.frames += 1
+        now = time.time()
+        thumbnail = self.thumbnail(frame)
+
+        process = (
+            self._reference is None
+            or self.threshold <= 0
+            or now - self._reference_time >= self.refresh_interval
+            or float(np.mean(np.abs(thumbnail - self._reference))) >= self.threshold
+        )
+        if process:
+            self._reference = thumbnail
+            self._reference_time = now
+        else:
+            self.skipped += 1
+
+        if self.frames % self.report_every == 0:
+            logging.info(
+                f"{self.name}: skipped {self.skipped} of {self.frames} frames "
+                f"({100 * self.skip_ratio:.0f}%) of an unchanged scene"
+            )
+        return process
@@ -1,49 +1,76 @@
-import asyncio
 import json
 import logging
-from queue import Empty, Queue
-from typing import Dict, List, Optional
+import time
+from typing import Dict, Optional
 
-from inputs.base import SensorConfig
-from inputs.base.loop import FuserInput
+from inputs.base import Message, SensorConfig
+from inputs.base.queue_input import QueueInput
 from providers.asr_provider import ASRProvider
 from providers.sleep_ticker_provider import SleepTickerProvider
 
+# Queued by the local voice activity detector when the speaker stops
+SPEECH_END = "<speech end>"
 
-class ASRInput(FuserInput[str]):
+
+class ASRInput(QueueInput[str]):
     """
     Automatic Speech Recognition (ASR) input handler.
 
     This class manages the input stream from an ASR service, buffering messages
     and providing text conversion capabilities.
+
+    Fragments of an utterance are held back from the cortex until the utterance
+    has ended, which is signalled by an ASR reply with "end_of_utterance" set,
+    or by 0.5 seconds without a new fragment. The cortex is then woken up
+    immediately. Partial hypotheses, replies with "is_final" set to false, are
+    not buffered.
+
+    The local voice activity detector usually hears the speaker stop before
+    the final reply for the last words has come back from the ASR service, so
+    its end of speech only starts a grace period of speech_end_grace seconds:
+    the utterance ends with the next final reply, or when the grace period
+    expires without one.
     """
 
+    # Seconds the final ASR reply may lag behind the local end of speech
+    speech_end_grace: float = 0.3
+
     def __init__(self, config: SensorConfig = SensorConfig()):
         """
         Initialize ASRInput instance.
         """
         super().__init__(config)
 
-        # Buffer for storing the final output
-        self.messages: List[str] = []
-
         self.descriptor_for_LLM = "Voice Input"
 
-        # Buffer for storing messages
-        self.message_buffer: Queue[str] = Queue()
-
         # Initialize ASR provider
         base_url = getattr(self.config, "base_url", "wss://api-asr.openmind.org")
         microphone_device_id = getattr(self.config, "microphone_device_id", None)
         microphone_name = getattr(self.config, "microphone_name", None)
+        vad = getattr(self.config, "vad", True)
+        audio_encoding = getattr(self.config, "audio_encoding", None)
+        audio_rate = getattr(self.config, "audio_rate", None)
 
         self.asr: ASRProvider = ASRProvider(
             ws_url=base_url,
             device_id=microphone_device_id,
             microphone_name=microphone_name,
+            vad=vad,
+            audio_encoding=audio_encoding,
+            audio_rate=audio_rate,
         )
         self.asr.start()
         self.asr.register_message_callback(self._handle_asr_message)
+        self.asr.register_speech_end_callback(self._handle_speech_end)
+
+        # True while the newest buffered message is an unfinished utterance
+        self.utterance_open = False
+
+        # Monotonic time the utterance ends at after a local end of speech
+        self.speech_end_grace = getattr(
+            self.config, "speech_end_grace", self.speech_end_grace
+        )
+        self.speech_end_deadline: Optional[float] = None
 
         # Initialize sleep ticker provider
         self.global_sleep_ticker_provider = SleepTickerProvider()
@@ -61,26 +88,41 @@ class ASRInput(FuserInput[str]):
             json_message: Dict = json.loads(raw_message)
             if "asr_reply" in json_message:
                 asr_reply = json_message["asr_reply"]
-                self.message_buffer.put(asr_reply)
-                logging.info("Detected ASR message: %s", asr_reply)
+                if json_message.get("is_final") is False:
+                    logging.debug("Partial ASR hypothesis: %s", asr_reply)
+                else:
+                    self.put_message(asr_reply)
+                    logging.info("Detected ASR message: %s", asr_reply)
+            if json_message.get("end_of_utterance"):
+                self.put_message(None)
         except json.JSONDecodeError:
             pass
 
+    def _handle_speech_end(self):
+        """
+        Start the grace period for the final reply when the local VAD detects
+        silence.
+        """
+        self.put_message(SPEECH_END)
+
     async def _poll(self) -> Optional[str]:
         """
-        Poll for new messages in the buffer.
+        Wait for the next message from the ASR service.
+
+        While an utterance is open, gives up after 0.5 seconds of silence, or
+        at the end of the grace period after a local end of speech, so that
+        raw_to_text can end it and wake up the cortex.
 
         Returns
         -------
         Optional[str]
-            Message from the buffer if available, None otherwise
+            Message from the buffer if available, None at the end of an
+            utterance
         """
-        await asyncio.sleep(0.5)
-        try:
-            message = self.message_buffer.get_nowait()
-            return message
-        except Empty:
-            return None
+        timeout = 0.5 if self.utterance_open else None
+        if self.speech_end_deadline is not None:
+            timeout = max(0.0, self.speech_end_deadline - time.monotonic())
+        return await self._next_message(timeout)
 
     async def _raw_to_text(self, raw_input: str) -> str:
         """
@@ -98,44 +140,59 @@ class ASRInput(FuserInput[str]):
         """
         return raw_input
 
-    async def raw_to_text(self, raw_input: str):
+    async def raw_to_text(self, raw_input: Optional[str]):
         """
         Convert raw input to processed text and manage buffer.
 
+        Consecutive fragments are joined into a single utterance in the
+        newest buffered message. None ends the utterance, SPEECH_END starts
+        the grace period after which it ends.
+
         Parameters
         ----------
         raw_input : Optional[str]
-            Raw input to be processed
+            Raw input to be processed, None at the end of an utterance
         """
+        if raw_input == SPEECH_END:
+            self.speech_end_deadline = time.monotonic() + self.speech_end_grace
+            return
+
         pending_message = await self._raw_to_text(raw_input)
         if pending_message is None:
-            if len(self.messages) != 0:
-                # Skip sleep if there's already a message in the messages buffer
-                self.global_sleep_ticker_provider.skip_sleep = True
+            self._end_utterance()
+            return
 
-        if pending_message is not None:
-            if len(self.messages) == 0:
-                self.messages.append(pending_message)
-            else:
-                self.messages[-1] = f"{self.messages[-1]} {pending_message}"
+        if len(self.messages) == 0:
+            self.add_message(Message(timestamp=time.time(), message=pending_message))
+        else:
+            self.messages[-1] = Message(
+                timestamp=time.time(),
+                message=f"{self.messages[-1].message} {pending_message}",
+            )
+        self.utterance_open = True
+
+        if self.speech_end_deadline is not None:
+            # The final reply to speech that has already ended locally
+            self._end_utterance()
+
+    def _end_utterance(self):
+        """
+        End the open utterance and wake up the cortex with it.
+        """
+        self.speech_end_deadline = None
+        if self.utterance_open:
+            self.utterance_open = False
+            self.global_sleep_ticker_provider.skip_sleep = True
 
     def formatted_latest_buffer(self) -> Optional[str]:
         """
-        Format and clear the latest buffer contents.
+        Format the finished utterances and clear the buffer.
 
         Returns
         -------
         Optional[str]
-            Formatted string of buffer contents or None if buffer is empty
+            Formatted input string, or None while an utterance is still open
         """
-        if len(self.messages) == 0:
+        if self.utterance_open:
             return None
-
-        result = f"""
-{self.descriptor_for_LLM} INPUT
-// START
-{self.messages[-1]}
-// END
-"""
-        self.messages = []
-        return result
+        return super().formatted_latest_buffer()
@@ -1,14 +1,15 @@
 import asyncio
+import json
 import logging
+import os
+import threading
 import time
-from dataclasses import dataclass
 from typing import Optional
 
 import requests
 
-from inputs.base import SensorConfig
-from inputs.base.loop import FuserInput
-from providers.io_provider import IOProvider
+from inputs.base import Message, SensorConfig
+from inputs.base.block_input import BlockInput
 
 """
 RULES are stored on the ETHEREUM HOLESKY testnet
@@ -21,29 +22,16 @@ Note: Etherscan.io does not handle bytes[]/json well. See below for ways to
 interact with HOLESKY and decode the data, generating an ASCII string.  
 """
 
+DEFAULT_RULES_CACHE_PATH = "~/.cache/om1/governance_rules.json"
 
-@dataclass
-class Message:
-    """
-    Container for timestamped messages.
-
-    Parameters
-    ----------
-    timestamp : float
-        Unix timestamp of the message
-    message : str
-        Content of the message
-    """
-
-    timestamp: float
-    message: str
 
-
-class GovernanceEthereum(FuserInput[float]):
+class GovernanceEthereum(BlockInput[Optional[str]]):
     """
     Ethereum ERC-7777 reader that tracks governance rules.
 
     Queries the Ethereum blockchain for relevant governance rules.
+    Set ws_url in the config to check for new rules on new block
+    notifications instead of a timer.
 
     Raises
     ------
@@ -51,9 +39,27 @@ class GovernanceEthereum(FuserInput[float]):
         If connection to Ethereum network fails
     """
 
-    def load_rules_from_blockchain(self):
-        logging.info("Loading rules from Ethereum blockchain")
+    # Seconds between rule checks, backing off while the rules are unchanged
+    poll_interval = 5.0
+    max_poll_interval = 300.0
+
+    # Seconds before a blockchain request is abandoned
+    rpc_timeout = 10.0
 
+    def _eth_call(self, data: str) -> Optional[str]:
+        """
+        Call the governance contract and return the raw hex result.
+
+        Parameters
+        ----------
+        data : str
+            Function selector followed by the ABI-encoded arguments
+
+        Returns
+        -------
+        Optional[str]
+            Hex encoded return value, or None if the call failed
+        """
         # Construct JSON-RPC request
         payload = {
             "jsonrpc": "2.0",
@@ -63,15 +69,18 @@ class GovernanceEthereum(FuserInput[float]):
                 {
                     "from": "0x0000000000000000000000000000000000000000",
                     "to": self.contract_address,
-                    "data": f"{self.function_selector}{self.function_argument}",
+                    "data": data,
                 },
                 "latest",
             ],
         }
 
         try:
-            response = requests.post(
-                self.rpc_url, json=payload, headers={"Content-Type": "application/json"}
+            response = self.session.post(
+                self.rpc_url,
+                json=payload,
+                headers={"Content-Type": "application/json"},
+                timeout=self.rpc_timeout,
             )
             logging.debug(f"Blockchain response status: {response.status_code}")
 
@@ -80,11 +89,7 @@ class GovernanceEthereum(FuserInput[float]):
                 if "result" in result and result["result"]:
                     hex_response = result["result"]
                     logging.debug(f"Raw blockchain response: {hex_response}")
-
-                    # Decode the response using Web3.py
-                    decoded_data = self.decode_eth_response(hex_response)
-                    logging.debug(f"Decoded blockchain data: {decoded_data}")
-                    return decoded_data
+                    return hex_response
                 else:
                     logging.error("Error: No valid result in blockchain response")
             else:
@@ -93,10 +98,128 @@ class GovernanceEthereum(FuserInput[float]):
                 )
 
         except Exception as e:
-            logging.error(f"Error loading rules from blockchain: {e}")
+            logging.error(f"Error calling governance contract: {e}")
 
         return None
 
+    def load_latest_version(self) -> Optional[int]:
+        """
+        Query the version of the latest rule set with getLatestRuleSetVersion().
+
+        Returns
+        -------
+        Optional[int]
+            Latest rule set version, or None if the call failed
+        """
+        hex_response = self._eth_call(self.version_selector)
+        if hex_response is None:
+            return None
+
+        try:
+            return int(hex_response, 16)
+        except ValueError as e:
+            logging.error(f"Decoding error: {e}")
+            return None
+
+    def load_rules_from_blockchain(self, version: Optional[int] = None):
+        """
+        Download and decode a rule set with getRuleSet(version).
+
+        Parameters
+        ----------
+        version : int, optional
+            Rule set version, defaults to the last known version
+
+        Returns
+        -------
+        Optional[str]
+            Decoded rules, or None if the call failed
+        """
+        if version is None:
+            version = self.rule_version
+
+        logging.info(f"Loading rule set {version} from Ethereum blockchain")
+
+        hex_response = self._eth_call(f"{self.function_selector}{version:064x}")
+        if hex_response is None:
+            return None
+
+        # Decode the response using Web3.py
+        decoded_data = self.decode_eth_response(hex_response)
+        logging.debug(f"Decoded blockchain data: {decoded_data}")
+        return decoded_data
+
+    def refresh_rules(self) -> Optional[str]:
+        """
+        Fetch the rules again if a newer rule set version was published.
+
+        Only the cheap version query is sent while the version is unchanged.
+        Newly fetched rules are written to the local cache. Blocks on the RPC
+        node, so it runs on a worker thread; concurrent refreshes run one
+        after the other.
+
+        Returns
+        -------
+        Optional[str]
+            The current rules, or None if none are known yet
+        """
+        with self._refresh_lock:
+            version = self.load_latest_version()
+            if version is None:
+                # keep using the cached rules while the node is unreachable
+                return self.universal_rule
+
+            if version == self.rule_version and self.universal_rule is not None:
+                return self.universal_rule
+
+            rules = self.load_rules_from_blockchain(version)
+            if rules is not None:
+                logging.info(f"7777 rule set {version}: {rules}")
+                self.rule_version = version
+                self.universal_rule = rules
+                self._save_cached_rules()
+
+            return self.universal_rule
+
+    def _load_cached_rules(self) -> bool:
+        """
+        Load the rules and their version from the local cache file.
+
+        Returns
+        -------
+        bool
+            True if cached rules were loaded
+        """
+        try:
+            with open(self.rules_cache_path) as f:
+                cached = json.load(f)
+            version = int(cached["version"])
+            rules = cached["rules"]
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logging.warning(f"Ignoring governance rule cache: {e}")
+            return False
+
+        self.rule_version = version
+        self.universal_rule = rules
+        return True
+
+    def _save_cached_rules(self) -> None:
+        """
+        Write the current rules and their version to the local cache file.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.rules_cache_path), exist_ok=True)
+            temp_path = f"{self.rules_cache_path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(
+                    {"version": self.rule_version, "rules": self.universal_rule}, f
+                )
+            os.replace(temp_path, self.rules_cache_path)
+        except Exception as e:
+            logging.warning(f"Could not write governance rule cache: {e}")
+
     def decode_eth_response(self, hex_response):
         """
         Decodes an Ethereum eth_call response.
@@ -134,9 +257,14 @@ class GovernanceEthereum(FuserInput[float]):
 
         self.descriptor_for_LLM = "Universal Laws"
 
-        self.io_provider = IOProvider()
-        self.POLL_INTERVAL = 5  # seconds
-        self.rpc_url = "https://holesky.gateway.tenderly.co"  # Ethereum RPC URL
+        # Ethereum RPC URL
+        self.rpc_url = getattr(
+            self.config, "rpc_url", "https://holesky.gateway.tenderly.co"
+        )
+        self.rpc_timeout = getattr(self.config, "rpc_timeout", self.rpc_timeout)
+
+        # Reuse the connection to the RPC node between polls
+        self.session = requests.Session()
 
         # The smart contract address of ther ERC-7777 Governance Smart Contract
         self.contract_address = "0xe706b7e30e378b89c7b2ee7bfd8ce2b91959d695"
@@ -144,38 +272,62 @@ class GovernanceEthereum(FuserInput[float]):
         # getRuleSet() Function selector (first 4 bytes of Keccak hash).
         self.function_selector = "0x1db3d5ff"
 
-        # The current rule rule set can be obtained from
-        # getLatestRuleSetVersion(0x254e2f1e)
-        # It's currently = 2
-        self.function_argument = "0000000000000000000000000000000000000000000000000000000000000002"  # Argument
+        # getLatestRuleSetVersion() Function selector
+        self.version_selector = "0x254e2f1e"
 
-        self.universal_rule = self.load_rules_from_blockchain()
-        self.messages: list[str] = []
+        # Version of universal_rule, until the chain reports a newer one
+        self.rule_version = 2
+        self.universal_rule: Optional[str] = None
 
-        logging.info(f"7777 rules: {self.universal_rule}")
+        # A refresh abandoned by _poll keeps running on its worker thread
+        self._refresh_lock = threading.Lock()
+
+        # Decoded rules are kept on disk so governance is available on boot
+        self.rules_cache_path = os.path.expanduser(
+            getattr(self.config, "rules_cache_path", DEFAULT_RULES_CACHE_PATH)
+        )
+        if self._load_cached_rules():
+            logging.info(f"7777 cached rules: {self.universal_rule}")
+            self.add_message(
+                Message(timestamp=time.time(), message=self.universal_rule)
+            )
+
+    def warm_up(self) -> None:
+        """
+        Check the chain for a newer rule set before the first poll.
+        """
+        self.refresh_rules()
 
     async def _poll(self) -> Optional[str]:
         """
         Poll for Ethereum Governance Law Changes
         """
-        await asyncio.sleep(self.POLL_INTERVAL)
+        if self._refresh_lock.locked():
+            logging.debug("7777 rules: previous refresh still running")
+            return self.universal_rule
 
         try:
-            rules = self.load_rules_from_blockchain()
+            # a version query, followed by a rule set download if it changed
+            rules = await asyncio.wait_for(
+                asyncio.to_thread(self.refresh_rules), 2 * self.rpc_timeout
+            )
             logging.debug(f"7777 rules: {rules}")
             return rules
         except Exception as e:
             logging.error(f"Error fetching blockchain data: {e}")
 
-    async def _raw_to_text(self, raw_input: str) -> Message:
+    async def _raw_to_text(self, raw_input: Optional[str]) -> Optional[Message]:
         """
         Convert self.universal_rule to a human-readable Message.
 
         Returns
         -------
-        Message
-            Timestamped status or transaction notification
+        Optional[Message]
+            Timestamped status or transaction notification, None if no rules
+            are known
         """
+        if raw_input is None:
+            return None
         return Message(timestamp=time.time(), message=raw_input)
 
     async def raw_to_text(self, raw_input: str):
@@ -187,10 +339,10 @@ class GovernanceEthereum(FuserInput[float]):
 
         if pending_message is not None:
             if len(self.messages) == 0:
-                self.messages.append(pending_message)
+                self.add_message(pending_message)
             # only update if there has been a change
             elif self.messages[-1].message != pending_message.message:
-                self.messages.append(pending_message)
+                self.add_message(pending_message)
 
     def formatted_latest_buffer(self) -> Optional[str]:
         """
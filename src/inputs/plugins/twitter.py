@@ -1,16 +1,38 @@
 import asyncio
 import logging
-from queue import Empty, Queue
-from typing import AsyncIterator, List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 
 import aiohttp
 
-from inputs.base import SensorConfig
-from inputs.base.loop import FuserInput
+from inputs.base import Message, SensorConfig
+from inputs.base.buffered_input import BufferedInput
 
 
-class TwitterInput(FuserInput[str]):
-    """Context query input handler for RAG."""
+class TwitterInput(BufferedInput[Optional[str]]):
+    """
+    Context query input handler for RAG.
+
+    Refreshes the context for every configured query on the adaptive polling
+    interval; the interval grows while the context stays the same. All queries
+    are sent concurrently over one shared session, and a result younger than
+    cache_ttl seconds is reused instead of querying the endpoint again, so
+    the endpoint is asked at most every cache_ttl seconds per query. A
+    refresh that returns the same context as before adds nothing to the
+    buffer. Context updates are buffered until the next fuse, while the
+    latest context is reported on every fuse.
+
+    Config keys: query or queries, cache_ttl and the polling keys
+    poll_interval and max_poll_interval.
+    """
+
+    # Refresh the context every minute, backing off to ten minutes
+    poll_interval: float = 60.0
+    max_poll_interval: float = 600.0
+
+    # Seconds a query result is reused before the endpoint is asked again;
+    # several poll intervals, so refreshes and new queries mostly hit it
+    cache_ttl: float = 300.0
 
     def __init__(
         self,
@@ -28,14 +50,18 @@ class TwitterInput(FuserInput[str]):
 
         super().__init__(config)
 
-        self.buffer: List[str] = []
-        self.message_buffer: Queue[str] = Queue()
         self.api_url = "https://api.openmind.org/api/core/query"
         self.session: Optional[aiohttp.ClientSession] = None
         self.context: Optional[str] = None
 
         # Use getattr instead of .get() since config is an object, not a dict
         self.query = getattr(config, "query", "What's new in AI and technology?")
+        self.queries: List[str] = list(getattr(config, "queries", [self.query]))
+        self.cache_ttl = getattr(config, "cache_ttl", self.cache_ttl)
+
+        # Query text -> (fetch time, context text)
+        self._cache: Dict[str, Tuple[float, str]] = {}
+        self._refreshed = False
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -53,8 +79,25 @@ class TwitterInput(FuserInput[str]):
             timeout = aiohttp.ClientTimeout(total=10)
             self.session = aiohttp.ClientSession(timeout=timeout)
 
-    async def _query_context(self, query: str):
-        """Perform context query to RAG endpoint."""
+    async def _query_context(self, query: str) -> Optional[str]:
+        """Perform context query to RAG endpoint.
+
+        Parameters
+        ----------
+        query : str
+            The query text
+
+        Returns
+        -------
+        Optional[str]
+            The context for the query, a cached one while it is younger than
+            cache_ttl. If the query fails, the last known context for it, or
+            None if there is none.
+        """
+        cached = self._cache.get(query)
+        if cached is not None and time.time() - cached[0] < self.cache_ttl:
+            return cached[1]
+
         await self._init_session()
 
         try:
@@ -74,8 +117,8 @@ class TwitterInput(FuserInput[str]):
                                 if r.get("content", {}).get("text", "")
                             ]
                         )
-                        self.context = context
-                        self.buffer = [context]  # Replace buffer with context
+                        self._cache[query] = (time.time(), context)
+                        return context
                 else:
                     error_text = await response.text()
                     logging.error(
@@ -85,71 +128,71 @@ class TwitterInput(FuserInput[str]):
         except Exception as e:
             logging.error(f"Error querying context: {str(e)}")
 
-    async def raw_to_text(self, raw_input: Optional[str] = None):
-        """Convert raw input to text format and add to buffer.
+        return cached[1] if cached is not None else None
 
-        Parameters
-        ----------
-        raw_input : Optional[str]
-            Raw input to process. If None, process from message buffer.
+    async def _poll(self) -> Optional[str]:
+        """Query the context for all configured queries concurrently.
 
         Returns
         -------
-        str
-            The processed text
+        Optional[str]
+            The combined context, or None if no query returned one
         """
-        if raw_input:
-            self.message_buffer.put_nowait(raw_input)
-
-        if self.message_buffer:
-            try:
-                message = self.message_buffer.get_nowait()
-                if message:
-                    self.buffer.append(message)
-                    logging.debug(f"Added to buffer: {message}")
-                    return message
-            except Empty:
-                pass
+        self._refreshed = True
+        results = await asyncio.gather(
+            *(self._query_context(query) for query in self.queries)
+        )
+        contexts = [context for context in results if context]
+        if not contexts:
+            return None
+        return "\n\n".join(contexts)
 
-        return ""
+    async def _wait_for_next_poll(self) -> None:
+        """
+        Fetch the first context right away, then wait for the interval.
+        """
+        if self._refreshed:
+            await super()._wait_for_next_poll()
 
-    async def start(self):
-        """Start the input handler with initial query."""
-        await self._query_context(self.query)
-        self.message_buffer.put_nowait(self.query)
+    async def raw_to_text(self, raw_input: Optional[str] = None):
+        """Store a refreshed context unless it is unchanged.
 
-    async def listen(self) -> AsyncIterator[str]:
-        """Listen for new messages."""
-        await self.start()
+        Parameters
+        ----------
+        raw_input : Optional[str]
+            The combined context from _poll
+        """
+        if not raw_input or raw_input == self.context:
+            return
 
-        while True:
-            message = await self._poll()
-            if message:
-                yield message
-            await asyncio.sleep(0.1)
+        self.context = raw_input
+        self.add_message(Message(timestamp=time.time(), message=raw_input))
+        logging.debug(f"TwitterInput context updated: {raw_input[:100]}")
 
-    async def _poll(self) -> Optional[str]:
-        """Poll for new messages."""
-        await asyncio.sleep(0.5)
-        try:
-            message = self.message_buffer.get_nowait()
-            return message
-        except Empty:
-            return None
+    async def start(self):
+        """Start the input handler with initial query."""
+        await self.raw_to_text(await self._poll())
 
     def formatted_latest_buffer(self) -> Optional[str]:
-        """Format and return the context."""
-        content = (
-            self.context if self.context else (self.buffer[-1] if self.buffer else None)
-        )
+        """Format and return the context.
 
-        if not content:
+        Context updates buffered since the last fuse are added to the IO
+        provider and cleared; the latest context is returned either way.
+        """
+        messages = self.fresh_messages()
+        if messages:
+            self.io_provider.add_input(
+                self.__class__.__name__, messages[-1].message, messages[-1].timestamp
+            )
+            self.messages.clear()
+
+        if not self.context:
             return None
 
         result = f"""
 TwitterInput CONTEXT
 // START
-{content}
+{self.context}
 // END
 """
         return result
@@ -157,5 +200,6 @@ TwitterInput CONTEXT
     async def initialize_with_query(self, query: str):
         """Initialize with a query"""
         logging.info(f"[TwitterInput] Initializing with query: {query}")
-        self.message_buffer.put_nowait(query)  # Add query to message buffer
-        await self._query_context(query)  # Immediately get context
+        if query not in self.queries:
+            self.queries.append(query)
+        await self.start()  # Immediately get context
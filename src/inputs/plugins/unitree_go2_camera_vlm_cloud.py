@@ -1,24 +1,14 @@
-import asyncio
 import json
 import logging
 import time
-from dataclasses import dataclass
-from queue import Empty, Queue
-from typing import Dict, List, Optional
+from typing import Dict
 
-from inputs.base import SensorConfig
-from inputs.base.loop import FuserInput
-from providers.io_provider import IOProvider
+from inputs.base import Message, SensorConfig
+from inputs.base.queue_input import QueueInput
 from providers.unitree_camera_vlm_provider import UnitreeCameraVLMProvider
 
 
-@dataclass
-class Message:
-    timestamp: float
-    message: str
-
-
-class UnitreeGo2CameraVLMCloud(FuserInput[str]):
+class UnitreeGo2CameraVLMCloud(QueueInput[str]):
     """
     Unitree Go2 Air Camera VLM bridge.
 
@@ -35,17 +25,8 @@ class UnitreeGo2CameraVLMCloud(FuserInput[str]):
         """
         super().__init__(config)
 
-        # Track IO
-        self.io_provider = IOProvider()
-
         self.descriptor_for_LLM = "Robot Camera Vision"
 
-        # Buffer for storing the final output
-        self.messages: List[Message] = []
-
-        # Buffer for storing messages
-        self.message_buffer: Queue[str] = Queue()
-
         # Initialize VLM provider
         base_url = (
             self.config.base_url
@@ -53,7 +34,13 @@ class UnitreeGo2CameraVLMCloud(FuserInput[str]):
             else "wss://api-vila.openmind.org"
         )
 
-        self.vlm: UnitreeCameraVLMProvider = UnitreeCameraVLMProvider(ws_url=base_url)
+        self.vlm: UnitreeCameraVLMProvider = UnitreeCameraVLMProvider(
+            ws_url=base_url,
+            dedupe_distance=getattr(self.config, "dedupe_distance", 6),
+            dedupe_interval=getattr(self.config, "dedupe_interval", 10.0),
+            min_jpeg_quality=getattr(self.config, "min_jpeg_quality", 40),
+            max_jpeg_quality=getattr(self.config, "max_jpeg_quality", 70),
+        )
         self.vlm.start()
         self.vlm.register_message_callback(self._handle_vlm_message)
 
@@ -73,30 +60,11 @@ class UnitreeGo2CameraVLMCloud(FuserInput[str]):
             json_message: Dict = json.loads(raw_message)
             if "vlm_reply" in json_message:
                 vlm_reply = json_message["vlm_reply"]
-                self.message_buffer.put(vlm_reply)
+                self.put_message(vlm_reply)
                 logging.info("Detected VLM message: %s", vlm_reply)
         except json.JSONDecodeError:
             pass
 
-    async def _poll(self) -> Optional[str]:
-        """
-        Poll for new messages from the VLM service.
-
-        Checks the message buffer for new messages with a brief delay
-        to prevent excessive CPU usage.
-
-        Returns
-        -------
-        Optional[str]
-            The next message from the buffer if available, None otherwise
-        """
-        await asyncio.sleep(0.5)
-        try:
-            message = self.message_buffer.get_nowait()
-            return message
-        except Empty:
-            return None
-
     async def _raw_to_text(self, raw_input: str) -> Message:
         """
         Process raw input to generate a timestamped message.
@@ -115,57 +83,3 @@ class UnitreeGo2CameraVLMCloud(FuserInput[str]):
             A timestamped message containing the processed input
         """
         return Message(timestamp=time.time(), message=raw_input)
-
-    async def raw_to_text(self, raw_input: Optional[str]):
-        """
-        Convert raw input to text and update message buffer.
-
-        Processes the raw input if present and adds the resulting
-        message to the internal message buffer.
-
-        Parameters
-        ----------
-        raw_input : Optional[str]
-            Raw input to be processed, or None if no input is available
-        """
-        if raw_input is None:
-            return
-
-        pending_message = await self._raw_to_text(raw_input)
-
-        if pending_message is not None:
-            self.messages.append(pending_message)
-
-    def formatted_latest_buffer(self) -> Optional[str]:
-        """
-        Format and clear the latest buffer contents.
-
-        Retrieves the most recent message from the buffer, formats it
-        with timestamp and class name, adds it to the IO provider,
-        and clears the buffer.
-
-        Returns
-        -------
-        Optional[str]
-            Formatted string containing the latest message and metadata,
-            or None if the buffer is empty
-
-        """
-        if len(self.messages) == 0:
-            return None
-
-        latest_message = self.messages[-1]
-
-        result = f"""
-{self.descriptor_for_LLM} INPUT
-// START
-{latest_message.message}
-// END
-"""
-
-        self.io_provider.add_input(
-            self.__class__.__name__, latest_message.message, latest_message.timestamp
-        )
-        self.messages = []
-
-        return result
@@ -1,12 +1,9 @@
-import asyncio
 import logging
 import time
-from dataclasses import dataclass
 from typing import List, Optional
 
-from inputs.base import SensorConfig
-from inputs.base.loop import FuserInput
-from providers.io_provider import IOProvider
+from inputs.base import Message, SensorConfig
+from inputs.base.buffered_input import BufferedInput
 
 try:
     from unitree.unitree_sdk2py.core.channel import ChannelSubscriber
@@ -19,13 +16,7 @@ except ImportError:
     ChannelSubscriber = None
 
 
-@dataclass
-class Message:
-    timestamp: float
-    message: str
-
-
-class UnitreeGo2Lowstate(FuserInput[str]):
+class UnitreeGo2Lowstate(BufferedInput[str]):
     """
     Unitree Go2 Air Lowstate bridge.
 
@@ -37,18 +28,15 @@ class UnitreeGo2Lowstate(FuserInput[str]):
     Maintains a buffer of processed messages.
     """
 
+    # Seconds between battery checks
+    poll_interval = 2.0
+
     def __init__(self, config: SensorConfig = SensorConfig()):
         """
         Initialize Unitree bridge with empty message buffer.
         """
         super().__init__(config)
 
-        # Track IO
-        self.io_provider = IOProvider()
-
-        # Messages buffer
-        self.messages: list[Message] = []
-
         # create subscriber
         self.low_state = None
         self.lowstate_subscriber = None
@@ -79,10 +67,6 @@ class UnitreeGo2Lowstate(FuserInput[str]):
             list of floats
         """
 
-        # Does the complexity of this seem confusing and kinda pointless to you?
-        # It's on our radar and your patience is appreciated
-        await asyncio.sleep(2.0)
-
         logging.info(f"Battery voltage: {self.latest_v} current: {self.latest_a}")
 
         return [self.latest_v, self.latest_a]
@@ -108,48 +92,3 @@ class UnitreeGo2Lowstate(FuserInput[str]):
         elif battery_voltage < 27.2:
             message = "WARNING: You are low on energy. Consider sitting down."
             return Message(timestamp=time.time(), message=message)
-
-    async def raw_to_text(self, raw_input: List[float]):
-        """
-        Convert raw lowstate to text and update message buffer.
-
-        Parameters
-        ----------
-        raw_input : List[float]
-            Raw lowstate data to be processed
-        """
-        pending_message = await self._raw_to_text(raw_input)
-
-        if pending_message is not None:
-            self.messages.append(pending_message)
-
-    def formatted_latest_buffer(self) -> Optional[str]:
-        """
-        Format and clear the latest buffer contents.
-
-        Formats the most recent message with timestamp and class name,
-        adds it to the IO provider, then clears the buffer.
-
-        Returns
-        -------
-        Optional[str]
-            Formatted string of buffer contents or None if buffer is empty
-        """
-        if len(self.messages) == 0:
-            return None
-
-        latest_message = self.messages[-1]
-
-        result = f"""
-{self.__class__.__name__} INPUT
-// START
-{latest_message.message}
-// END
-"""
-
-        self.io_provider.add_input(
-            self.__class__.__name__, latest_message.message, latest_message.timestamp
-        )
-        self.messages = []
-
-        return result
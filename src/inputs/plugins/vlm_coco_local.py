@@ -1,39 +1,19 @@
 import asyncio
-import collections
 import logging
 import time
-from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
 import cv2
 import numpy as np
-import torch
-from PIL import Image
-from torchvision.models import detection as detection_model
-
-from inputs.base import SensorConfig
-from inputs.base.loop import FuserInput
-from providers.io_provider import IOProvider
-
-Detection = collections.namedtuple("Detection", "label, bbox, score")
-
-
-@dataclass
-class Message:
-    """
-    Container for timestamped messages.
-
-    Parameters
-    ----------
-    timestamp : float
-        Unix timestamp of the message
-    message : str
-        Content of the message
-    """
-
-    timestamp: float
-    message: str
 
+from inputs.base import Message, SensorConfig
+from inputs.base.buffered_input import BufferedInput
+from inputs.base.object_tracker import ObjectTracker, Track
+from inputs.base.scene_change import SceneChangeGate
+from providers.coco_detection_provider import (
+    DEFAULT_MODEL_CACHE_DIR,
+    COCODetectionProvider,
+)
 
 # if working on Mac, please disable continuity camera on your iphone
 # Settings > General > AirPlay & Continuity, and tunr off Continuity
@@ -51,11 +31,87 @@ def check_webcam(index_to_check):
     return True
 
 
-class VLM_COCO_Local(FuserInput[Image.Image]):
+class COCOCamera:
+    """
+    A camera watched by VLM_COCO_Local, with its own scene change gate and
+    object tracker.
+
+    Parameters
+    ----------
+    index : int
+        OpenCV index of the camera
+    config : SensorConfig
+        Configuration of the sensor
+    """
+
+    def __init__(self, index: int, config: SensorConfig):
+        self.index = index
+
+        # Skip inference while the scene does not change
+        self.scene_gate = SceneChangeGate.from_config(
+            f"VLM_COCO_Local camera {index}", config
+        )
+
+        # Follow objects between detector runs
+        self.tracker = ObjectTracker(
+            iou_threshold=getattr(config, "track_iou_threshold", 0.3)
+        )
+        self.frames_since_detection = 0
+        self.last_detection = 0.0
+
+        self.have_cam = check_webcam(index)
+
+        # Start capturing video, if we have a webcam
+        self.cap = None
+        if self.have_cam:
+            self.cap = cv2.VideoCapture(index)
+            self.width = int(self.cap.get(3))  # float `width`
+            self.height = int(self.cap.get(4))  # float `height`
+            self.cam_third = int(self.width / 3)
+            logging.info(
+                f"Webcam {index} pixel dimensions for COCO: {self.width}, {self.height}"
+            )
+
+    def read(self) -> Optional[np.ndarray]:
+        """
+        Capture a frame. Blocks, call off the event loop.
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            Captured BGR frame, or None without a camera
+        """
+        if not self.have_cam:
+            return None
+        ret, frame = self.cap.read()
+        return frame if ret else None
+
+
+class VLM_COCO_Local(BufferedInput[List[Optional[np.ndarray]]]):
     """
     Detects COCO objects in image and publishes messages.
     Uses PyTorch and FasterRCNN_MobileNet model from torchvision.
     Bounding Boxes use image convention, ie center.y = 0 means top of image.
+
+    Frames are captured and analyzed off the event loop; inference runs on
+    the COCODetectionProvider worker with inference_threads torch threads,
+    using the detector_backend model ("eager", "torchscript" or "quantized").
+    Frames of an unchanged scene reuse the previous detections, see
+    SceneChangeGate.
+
+    Detected objects are tracked with persistent IDs, and their boxes follow
+    the optical flow on every frame. The detector runs on the first changed
+    frame once detect_every frames have been captured, on a changed frame
+    while nothing is tracked, and as soon as a track is lost. Whatever the
+    scene gate says, it also runs at least every detect_interval seconds,
+    and on the frame after a run that missed a tracked object, so an object
+    that left a scene that has become static is not reported for long. The
+    description reports for how long each object has been in view.
+
+    With a camera_indices list, one instance watches several cameras. The
+    latest frame of every camera is captured in parallel, the frames that
+    need a detection go through the model in one batched forward pass, and
+    the message describes every camera separately.
     """
 
     def __init__(self, config: SensorConfig = SensorConfig()):
@@ -64,188 +120,175 @@ class VLM_COCO_Local(FuserInput[Image.Image]):
         """
         super().__init__(config)
 
-        self.device = "cpu"
-        self.detection_threshold = 0.7
+        self.detection_threshold = getattr(self.config, "detection_threshold", 0.7)
 
         self.camera_index = 0  # default to default webcam unless specified otherwsie
         if self.config.camera_index:
             self.camera_index = self.config.camera_index
-
-        # Track IO
-        self.io_provider = IOProvider()
-
-        # Messages buffer
-        self.messages: list[Message] = []
+        camera_indices = getattr(self.config, "camera_indices", None) or [
+            self.camera_index
+        ]
 
         # Simple description of sensor output to help LLM understand its importance and utility
         self.descriptor_for_LLM = "Object Detector"
 
-        # Low resolution Faster R-CNN model with a MobileNetV3-Large backbone tuned for mobile use cases.
-        self.model = detection_model.fasterrcnn_mobilenet_v3_large_320_fpn(
-            weights="FasterRCNN_MobileNet_V3_Large_320_FPN_Weights.COCO_V1",
-            progress=True,
-            weights_backbone="MobileNet_V3_Large_Weights.IMAGENET1K_V1",
-        ).to(self.device)
-        self.class_labels = (
-            detection_model.FasterRCNN_MobileNet_V3_Large_320_FPN_Weights.DEFAULT.meta[
-                "categories"
-            ]
+        # The detector is loaded by warm_up() in a background worker and
+        # shared by all cameras
+        threads = getattr(self.config, "inference_threads", None)
+        backend = getattr(self.config, "detector_backend", "eager")
+        self.detector = COCODetectionProvider(
+            detection_threshold=self.detection_threshold,
+            threads=threads,
+            backend=backend,
+            model_cache_dir=getattr(
+                self.config, "model_cache_dir", DEFAULT_MODEL_CACHE_DIR
+            ),
         )
-        self.model.eval()
-        logging.info("COCO Object Detector Started")
+        self.detector.check_settings(self.detection_threshold, backend, threads)
 
-        self.have_cam = check_webcam(self.camera_index)
+        self.detect_every = getattr(self.config, "detect_every", 3)
+        self.detect_interval = getattr(self.config, "detect_interval", 5.0)
 
-        # Start capturing video, if we have a webcam
-        self.cap = None
-        if self.have_cam:
-            self.cap = cv2.VideoCapture(self.camera_index)
-            self.width = int(self.cap.get(3))  # float `width`
-            self.height = int(self.cap.get(4))  # float `height`
-            self.cam_third = int(self.width / 3)
-            logging.info(
-                f"Webcam pixel dimensions for COCO: {self.width}, {self.height}"
-            )
+        self.cameras = [COCOCamera(index, self.config) for index in camera_indices]
+        self.have_cam = any(camera.have_cam for camera in self.cameras)
 
-    async def _poll(self) -> Image.Image:
+    def warm_up(self) -> None:
         """
-        Poll for new image input.
+        Load the detector and run a dummy inference so the first real frame
+        does not pay for lazy initialization.
+        """
+        self.detector.load()
 
-        Currently generates random colored images for testing.
-        In production, this would interface with camera or sensor.
+    async def _poll(self) -> Optional[List[Optional[np.ndarray]]]:
+        """
+        Poll for new image input.
 
         Returns
         -------
-        Image.Image
-            Generated or captured image
+        Optional[List[Optional[np.ndarray]]]
+            Captured BGR frame of every camera, None for a camera whose
+            capture failed, or None without any camera
         """
         await asyncio.sleep(0.5)
 
         # Capture a frame every 500 ms
         if self.have_cam:
-            ret, frame = self.cap.read()
-            return frame
+            return list(
+                await asyncio.gather(
+                    *(asyncio.to_thread(camera.read) for camera in self.cameras)
+                )
+            )
 
-    async def _raw_to_text(self, raw_input: Optional[Image.Image]) -> Optional[Message]:
+    async def _raw_to_text(
+        self, raw_input: Optional[List[Optional[np.ndarray]]]
+    ) -> Optional[Message]:
         """
         Process raw image input to generate text description.
 
         Parameters
         ----------
-        raw_input : Image.Image
-            Input image to process
+        raw_input : Optional[List[Optional[np.ndarray]]]
+            Input frame of every camera to process
 
         Returns
         -------
         Message
             Timestamped message containing description
         """
-
-        filtered_detections = None
-
-        if raw_input is not None:
-            image = raw_input.copy().transpose((2, 0, 1))
-            batch_image = np.expand_dims(image, axis=0)
-            tensor_image = torch.tensor(
-                batch_image / 255.0, dtype=torch.float, device=self.device
+        frames = raw_input or [None] * len(self.cameras)
+
+        # cameras whose frame needs a full detection
+        now = time.time()
+        pending = []
+        for camera, frame in zip(self.cameras, frames):
+            if frame is None:
+                continue
+            camera.frames_since_detection += 1
+            if now - camera.last_detection >= self.detect_interval or any(
+                track.misses for track in camera.tracker.tracks
+            ):
+                # overdue, or confirming that a missed object is gone; the
+                # gate is not asked, so it keeps its reference frame
+                pending.append((camera, frame))
+                continue
+
+            changed = camera.scene_gate.should_process(frame)
+            if camera.tracker.tracks:
+                # the gate misses small changes such as an object leaving,
+                # so tracked objects are followed on every frame
+                if not await asyncio.to_thread(camera.tracker.propagate, frame) or (
+                    changed and camera.frames_since_detection >= self.detect_every
+                ):
+                    pending.append((camera, frame))
+            elif changed:
+                pending.append((camera, frame))
+
+        if pending:
+            detections = await self.detector.detect_many(
+                [frame for _, frame in pending]
             )
-            mobilenet_detections = self.model(tensor_image)[
-                0
-            ]  # pylint: disable=E1102 disable not callable warning
-            filtered_detections = [
-                Detection(label_id, box, score)
-                for label_id, box, score in zip(
-                    mobilenet_detections["labels"],
-                    mobilenet_detections["boxes"],
-                    mobilenet_detections["scores"],
+            for (camera, frame), filtered_detections in zip(pending, detections):
+                logging.debug(
+                    f"COCO camera {camera.index} filtered_detections "
+                    f"{filtered_detections}"
                 )
-                if score >= self.detection_threshold
-            ]
-            logging.debug(f"COCO filtered_detections {filtered_detections}")
-
-        sentence = None
-
-        if filtered_detections and len(filtered_detections) > 0:
-
-            pred_boxes = torch.stack(
-                [detection.bbox for detection in filtered_detections]
-            )
-            pred_scores = torch.stack(
-                [detection.score for detection in filtered_detections]
-            )
-            pred_labels = [
-                self.class_labels[detection.label] for detection in filtered_detections
-            ]
-            logging.debug(f"COCO labels {pred_labels} scores {pred_scores}")
-
-            # we have a least one detection, and that will have the highest score
-            thing = pred_labels[0]
-            x1 = pred_boxes[0, 0]
-            x2 = pred_boxes[0, 2]
-            center_x = (x1 + x2) / 2  # center of the bbox
-
-            direction = "in front of you"
-            # so if the width is 1920, then the left third runs between 0 and 639
-            # middle is 640 - 1279
-            # right is > 1280
-            if center_x < self.cam_third:
-                direction = "on your left"
-            elif center_x > 2 * self.cam_third:
-                direction = "on your right"
-
-            sentence = f"You see a {thing} {direction}."
-
-            # add at most one more object
-            if len(pred_labels) > 1:
-                other_thing = pred_labels[1]
-                sentence = sentence + f" You also see a {other_thing}."
-
-        if sentence is not None:
-            return Message(timestamp=time.time(), message=sentence)
-
-    async def raw_to_text(self, raw_input: Image.Image):
+                camera.tracker.update(filtered_detections, frame, now)
+                camera.frames_since_detection = 0
+                camera.last_detection = now
+
+        sentences = []
+        for camera in self.cameras:
+            sentence = self._describe(camera, camera.tracker.tracks)
+            if sentence is not None and len(self.cameras) > 1:
+                sentence = f"Camera {camera.index}: {sentence}"
+            if sentence is not None:
+                sentences.append(sentence)
+
+        if sentences:
+            return Message(timestamp=time.time(), message=" ".join(sentences))
+
+    def _describe(self, camera: COCOCamera, tracks: List[Track]) -> Optional[str]:
         """
-        Convert raw image to text and update message buffer.
+        Describe the two highest scoring objects tracked by a camera.
 
         Parameters
         ----------
-        raw_input : Image.Image
-            Raw image to be processed
-        """
-        pending_message = await self._raw_to_text(raw_input)
-
-        if pending_message is not None:
-            self.messages.append(pending_message)
-
-    def formatted_latest_buffer(self) -> Optional[str]:
-        """
-        Format and clear the latest buffer contents.
-
-        Formats the most recent message with timestamp and class name,
-        adds it to the IO provider, then clears the buffer.
+        camera : COCOCamera
+            The camera the objects were seen by
+        tracks : List[Track]
+            The current tracks
 
         Returns
         -------
         Optional[str]
-            Formatted string of buffer contents or None if buffer is empty
+            The description, or None if nothing is tracked
         """
-        if len(self.messages) == 0:
+        if not tracks:
             return None
 
-        latest_message = self.messages[-1]
-
-        logging.info(f"VLM_COCO_Local: {latest_message.message}")
-
-        result = f"""
-{self.descriptor_for_LLM} INPUT
-// START
-{latest_message.message}
-// END
-"""
+        now = time.time()
+        facts = []
+        for track in sorted(tracks, key=lambda t: t.score, reverse=True)[:2]:
+            x1, _, x2, _ = track.bbox
+            center_x = (x1 + x2) / 2  # center of the bbox
 
-        self.io_provider.add_input(
-            self.__class__.__name__, latest_message.message, latest_message.timestamp
-        )
-        self.messages = []
+            direction = "in front of you"
+            # so if the width is 1920, then the left third runs between 0 and 639
+            # middle is 640 - 1279
+            # right is > 1280
+            if center_x < camera.cam_third:
+                direction = "on your left"
+            elif center_x > 2 * camera.cam_third:
+                direction = "on your right"
 
-        return result
+            fact = f"a {track.label} {direction}"
+            age = int(track.age(now))
+            if age >= 1:
+                fact += f" for {age} s"
+            facts.append(fact)
+
+        sentence = f"You see {facts[0]}."
+        # add at most one more object
+        if len(facts) > 1:
+            sentence = sentence + f" You also see {facts[1]}."
+        return sentence
@@ -1,34 +1,14 @@
 import asyncio
 import random
 import time
-from dataclasses import dataclass
-from typing import Optional
 
 from PIL import Image
 
-from inputs.base import SensorConfig
-from inputs.base.loop import FuserInput
-from providers.io_provider import IOProvider
+from inputs.base import Message, SensorConfig
+from inputs.base.buffered_input import BufferedInput
 
 
-@dataclass
-class Message:
-    """
-    Container for timestamped messages.
-
-    Parameters
-    ----------
-    timestamp : float
-        Unix timestamp of the message
-    message : str
-        Content of the message
-    """
-
-    timestamp: float
-    message: str
-
-
-class DummyVLMLocal(FuserInput[Image.Image]):
+class DummyVLMLocal(BufferedInput[Image.Image]):
     """
     Vision Language Model input handler.
 
@@ -42,12 +22,6 @@ class DummyVLMLocal(FuserInput[Image.Image]):
         """
         super().__init__(config)
 
-        # Track IO
-        self.io_provider = IOProvider()
-
-        # Messages buffer
-        self.messages: list[Message] = []
-
         self.descriptor_for_LLM = "Vision Language Model"
 
     async def _poll(self) -> Image.Image:
@@ -92,48 +66,3 @@ class DummyVLMLocal(FuserInput[Image.Image]):
         message = f"DUMMY VLM - FAKE DATA - I see {num} people. Also, I see a rocket."
 
         return Message(timestamp=time.time(), message=message)
-
-    async def raw_to_text(self, raw_input: Image.Image):
-        """
-        Convert raw image to text and update message buffer.
-
-        Parameters
-        ----------
-        raw_input : Image.Image
-            Raw image to be processed
-        """
-        pending_message = await self._raw_to_text(raw_input)
-
-        if pending_message is not None:
-            self.messages.append(pending_message)
-
-    def formatted_latest_buffer(self) -> Optional[str]:
-        """
-        Format and clear the latest buffer contents.
-
-        Formats the most recent message with timestamp and class name,
-        adds it to the IO provider, then clears the buffer.
-
-        Returns
-        -------
-        Optional[str]
-            Formatted string of buffer contents or None if buffer is empty
-        """
-        if len(self.messages) == 0:
-            return None
-
-        latest_message = self.messages[-1]
-
-        result = f"""
-{self.descriptor_for_LLM} INPUT
-// START
-{latest_message.message}
-// END
-"""
-
-        self.io_provider.add_input(
-            self.__class__.__name__, latest_message.message, latest_message.timestamp
-        )
-        self.messages = []
-
-        return result
@@ -2,36 +2,35 @@ import asyncio
 import logging
 import os
 import time
-from dataclasses import dataclass
 from typing import List, Optional
 
 from cdp import Cdp, Wallet
 
-from inputs.base import SensorConfig
-from inputs.base.loop import FuserInput
-from providers.io_provider import IOProvider
-
-
-@dataclass
-class Message:
-    timestamp: float
-    message: str
+from inputs.base import Message, SensorConfig
+from inputs.base.buffered_input import BufferedInput
 
 
 # TODO(Kyle): Support Cryptos other than ETH
-class WalletCoinbase(FuserInput[float]):
+class WalletCoinbase(BufferedInput[float]):
     """
     Queries current ETH balance and reports a balance increase
     """
 
+    # Every buffered message is a transaction that is summed on the next fuse
+    buffer_size = 100
+
+    # Seconds between wallet updates, backing off while the balance is unchanged
+    poll_interval = 0.5
+    max_poll_interval = 30.0
+
+    # Seconds before a wallet request is abandoned
+    rpc_timeout = 10.0
+
     def __init__(self, config: SensorConfig = SensorConfig()):
         super().__init__(config)
 
-        # Track IO
-        self.io_provider = IOProvider()
-        self.messages: list[str] = []
+        self.rpc_timeout = getattr(self.config, "rpc_timeout", self.rpc_timeout)
 
-        self.POLL_INTERVAL = 0.5  # seconds between blockchain data updates
         self.COINBASE_WALLET_ID = os.environ.get("COINBASE_WALLET_ID")
         logging.info(f"Using {self.COINBASE_WALLET_ID} as the coinbase wallet id")
 
@@ -54,6 +53,20 @@ class WalletCoinbase(FuserInput[float]):
 
         logging.info("Testing: WalletCoinbase: Initialized")
 
+    def _fetch_balance(self) -> float:
+        """
+        Refresh the wallet and read its ETH balance.
+
+        Blocks on the Coinbase API, so it runs on a worker thread.
+
+        Returns
+        -------
+        float
+            Current ETH balance
+        """
+        self.wallet = Wallet.fetch(self.COINBASE_WALLET_ID)
+        return float(self.wallet.balance("eth"))
+
     async def _poll(self) -> List[float]:
         """
         Poll for Coinbase Wallet balance updates.
@@ -63,19 +76,25 @@ class WalletCoinbase(FuserInput[float]):
         List[float]
             [current_balance, balance_change]
         """
-        await asyncio.sleep(self.POLL_INTERVAL)
-
         # randomly simulate ETH inbound transfers for debugging purposes
         # if random.randint(0, 10) > 7:
         #     faucet_transaction = self.wallet.faucet(asset_id='eth')
         #     faucet_transaction.wait()
         #     logging.info(f"WalletCoinbase: Faucet transaction: {faucet_transaction}")
 
-        self.wallet = Wallet.fetch(self.COINBASE_WALLET_ID)
+        try:
+            balance = await asyncio.wait_for(
+                asyncio.to_thread(self._fetch_balance), self.rpc_timeout
+            )
+        except Exception as e:
+            logging.error(f"Error fetching Coinbase Wallet data: {e}")
+            # keep the old balance if the refresh fails
+            balance = self.ETH_balance
+
         logging.info(
-            f"WalletCoinbase: Wallet refreshed: {self.wallet.balance('eth')}, the current balance is {self.ETH_balance}"
+            f"WalletCoinbase: Wallet refreshed: {balance}, the current balance is {self.ETH_balance}"
         )
-        self.ETH_balance = float(self.wallet.balance("eth"))
+        self.ETH_balance = balance
         balance_change = self.ETH_balance - self.ETH_balance_previous
         self.ETH_balance_previous = self.ETH_balance
 
@@ -108,20 +127,6 @@ class WalletCoinbase(FuserInput[float]):
         logging.debug(f"WalletCoinbase: {message}")
         return Message(timestamp=time.time(), message=message)
 
-    async def raw_to_text(self, raw_input: float):
-        """
-        Process balance update and manage message buffer.
-
-        Parameters
-        ----------
-        raw_input : float
-            Raw balance data
-        """
-        pending_message = await self._raw_to_text(raw_input)
-
-        if pending_message is not None:
-            self.messages.append(pending_message)
-
     def formatted_latest_buffer(self) -> Optional[str]:
         """
         Format and clear the buffer contents. If there are multiple ETH transactions,
@@ -132,16 +137,17 @@ class WalletCoinbase(FuserInput[float]):
         Optional[str]
             Formatted string of buffer contents or None if buffer is empty
         """
-        if len(self.messages) == 0:
+        messages = self.fresh_messages()
+        if len(messages) == 0:
             return None
 
         transaction_sum = 0
 
         # all the messages, by definition, are non-zero
-        for message in self.messages:
+        for message in messages:
             transaction_sum += float(message.message)
 
-        last_message = self.messages[-1]
+        last_message = messages[-1]
         result_message = Message(
             timestamp=last_message.timestamp,
             message=f"You just received {transaction_sum:.5f} ETH.",
@@ -157,5 +163,5 @@ class WalletCoinbase(FuserInput[float]):
         self.io_provider.add_input(
             self.__class__.__name__, result_message.message, result_message.timestamp
         )
-        self.messages = []
+        self.messages.clear()
         return result
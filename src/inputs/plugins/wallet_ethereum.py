@@ -3,39 +3,22 @@ import logging
 import os
 import random
 import time
-from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from web3 import Web3
 
-from inputs.base import SensorConfig
-from inputs.base.loop import FuserInput
-from providers.io_provider import IOProvider
+from inputs.base import Message, SensorConfig
+from inputs.base.block_input import BlockInput
 
 
-@dataclass
-class Message:
-    """
-    Container for timestamped messages.
-
-    Parameters
-    ----------
-    timestamp : float
-        Unix timestamp of the message
-    message : str
-        Content of the message
-    """
-
-    timestamp: float
-    message: str
-
-
-class WalletEthereum(FuserInput[float]):
+class WalletEthereum(BlockInput[float]):
     """
     Ethereum wallet monitor that tracks ETH balance changes.
 
     Queries the Ethereum blockchain for account balance updates and reports
     incoming transactions.
+    Set ws_url in the config to re-read the balance on new block
+    notifications instead of a timer.
 
     Raises
     ------
@@ -43,36 +26,59 @@ class WalletEthereum(FuserInput[float]):
         If connection to Ethereum network fails
     """
 
+    # Seconds between blockchain data updates, backing off while the balance
+    # is unchanged
+    poll_interval = 4.0
+    max_poll_interval = 60.0
+
+    # Seconds before a blockchain request is abandoned
+    rpc_timeout = 10.0
+
     def __init__(self, config: SensorConfig = SensorConfig()):
         """
         Initialize WalletEthereum instance.
         """
         super().__init__(config)
 
-        # Track IO
-        self.io_provider = IOProvider()
-
         self.ETH_balance = 0
         self.ETH_balance_previous = 0
         self.balance_eth = 0
         self.balance_change = 0
 
-        self.messages: list[str] = []
         self.eth_info = ""
 
-        self.PROVIDER_URL = "https://eth.llamarpc.com"
-        self.POLL_INTERVAL = 4  # seconds between blockchain data updates
+        self.PROVIDER_URL = getattr(self.config, "rpc_url", "https://eth.llamarpc.com")
+        self.rpc_timeout = getattr(self.config, "rpc_timeout", self.rpc_timeout)
         self.ACCOUNT_ADDRESS = os.environ.get(
             "ETH_ADDRESS", "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
         )
         logging.debug(f"Using {self.ACCOUNT_ADDRESS} as the wallet address")
         logging.info("Testing: WalletEthereum: Initialized")
 
-        # Initialize Web3
-        self.web3 = Web3(Web3.HTTPProvider(self.PROVIDER_URL))
+        # Initialize Web3, the provider keeps its HTTP session between requests
+        self.web3 = Web3(
+            Web3.HTTPProvider(
+                self.PROVIDER_URL, request_kwargs={"timeout": self.rpc_timeout}
+            )
+        )
         if not self.web3.is_connected():
             raise Exception("Failed to connect to Ethereum")
 
+    def _fetch_balance(self) -> Tuple[int, int]:
+        """
+        Query the latest block number and the account balance.
+
+        Blocks on the RPC node, so it runs on a worker thread.
+
+        Returns
+        -------
+        Tuple[int, int]
+            (block_number, balance in wei)
+        """
+        block_number = self.web3.eth.block_number
+        balance_wei = self.web3.eth.get_balance(self.ACCOUNT_ADDRESS)
+        return block_number, balance_wei
+
     async def _poll(self) -> List[float]:
         """
         Poll for Ethereum balance updates.
@@ -82,14 +88,11 @@ class WalletEthereum(FuserInput[float]):
         List[float]
             [current_balance, balance_change]
         """
-        await asyncio.sleep(self.POLL_INTERVAL)
-
         try:
-            # Get latest block data
-            block_number = self.web3.eth.block_number
-
-            # Get account data
-            balance_wei = self.web3.eth.get_balance(self.ACCOUNT_ADDRESS)
+            # Get latest block and account data without blocking the event loop
+            block_number, balance_wei = await asyncio.wait_for(
+                asyncio.to_thread(self._fetch_balance), self.rpc_timeout
+            )
             self.balance_eth = float(self.web3.from_wei(balance_wei, "ether"))
 
             self.eth_info = {
@@ -121,7 +124,7 @@ class WalletEthereum(FuserInput[float]):
         # use the old values if the try fails, otherwise use the new/updated values
         return [self.ETH_balance, self.balance_change]
 
-    async def _raw_to_text(self, raw_input: List[float]) -> Optional[str]:
+    async def _raw_to_text(self, raw_input: List[float]) -> Optional[Message]:
         """
         Convert balance data to human-readable message.
 
@@ -142,44 +145,3 @@ class WalletEthereum(FuserInput[float]):
             message = f"You just received {balance_change:.3f} ETH."
             logging.debug(f"WalletEthereum: {message}")
             return Message(timestamp=time.time(), message=message)
-
-    async def raw_to_text(self, raw_input: float):
-        """
-        Process balance update and manage message buffer.
-
-        Parameters
-        ----------
-        raw_input : float
-            Raw balance data
-        """
-        pending_message = await self._raw_to_text(raw_input)
-
-        if pending_message is not None:
-            self.messages.append(pending_message)
-
-    def formatted_latest_buffer(self) -> Optional[str]:
-        """
-        Format and clear the latest buffer contents.
-
-        Returns
-        -------
-        Optional[str]
-            Formatted string of buffer contents or None if buffer is empty
-        """
-        if len(self.messages) == 0:
-            return None
-
-        latest_message = self.messages[-1]
-
-        result = f"""
-{self.__class__.__name__} INPUT
-// START
-{latest_message.message}
-// END
-"""
-
-        self.io_provider.add_input(
-            self.__class__.__name__, latest_message.message, latest_message.timestamp
-        )
-        self.messages = []
-        return result
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from inputs.base import Message, SensorConfig
+from inputs.base.block_input import BlockInput
+
+WEI_PER_ETH = 10**18
+
+
+class WalletEthereumFleet(BlockInput[List[Tuple[str, float]]]):
+    """
+    Ethereum wallet monitor for many addresses.
+
+    Queries the latest block number on every poll and, when a new block has
+    arrived, reads the balances of all watched addresses with JSON-RPC batch
+    requests of up to batch_size calls each. Reports a message for every
+    address whose balance changed.
+
+    The addresses are read from the addresses list in the config, or from the
+    comma separated ETH_ADDRESSES environment variable. Set ws_url in the
+    config to poll on new block notifications instead of a timer.
+    """
+
+    # Seconds between block number checks, backing off while balances are
+    # unchanged
+    poll_interval = 4.0
+    max_poll_interval = 60.0
+
+    # Seconds before a blockchain request is abandoned
+    rpc_timeout = 10.0
+
+    # Report the balance changes of every address since the last fuse
+    buffer_size = 100
+    aggregation = "all"
+
+    def __init__(self, config: SensorConfig = SensorConfig()):
+        """
+        Initialize WalletEthereumFleet instance.
+        """
+        super().__init__(config)
+
+        self.descriptor_for_LLM = "Wallet Fleet"
+
+        self.rpc_url = getattr(self.config, "rpc_url", "https://eth.llamarpc.com")
+        self.rpc_timeout = getattr(self.config, "rpc_timeout", self.rpc_timeout)
+        self.batch_size = getattr(self.config, "batch_size", 100)
+
+        addresses = getattr(self.config, "addresses", None)
+        if addresses is None:
+            addresses = [
+                address.strip()
+                for address in os.environ.get("ETH_ADDRESSES", "").split(",")
+                if address.strip()
+            ]
+        if not addresses:
+            raise ValueError("config file missing addresses")
+        self.addresses: List[str] = list(addresses)
+
+        # Reuse the connection to the RPC node between polls
+        self.session = requests.Session()
+
+        # Last block whose balances were read, and the balances in wei
+        self.block_number: Optional[int] = None
+        self.balances: Dict[str, int] = {}
+
+        # Number of JSON-RPC HTTP requests sent, for monitoring
+        self.request_count = 0
+
+        logging.info(f"WalletEthereumFleet: watching {len(self.addresses)} addresses")
+
+    def _rpc(self, calls: List[Tuple[str, list]]) -> List[Optional[str]]:
+        """
+        Send calls as one JSON-RPC batch request.
+
+        Parameters
+        ----------
+        calls : List[Tuple[str, list]]
+            (method, params) of every call
+
+        Returns
+        -------
+        List[Optional[str]]
+            Result of every call in order, None for calls that failed
+        """
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        response = self.session.post(
+            self.rpc_url, json=payload, timeout=self.rpc_timeout
+        )
+        self.request_count += 1
+        response.raise_for_status()
+
+        replies = response.json()
+        if isinstance(replies, dict):
+            # some nodes answer a failed batch with a single error object
+            raise RuntimeError(f"Batch request failed: {replies.get('error')}")
+
+        results: List[Optional[str]] = [None] * len(calls)
+        for reply in replies:
+            if "error" in reply:
+                logging.warning(f"WalletEthereumFleet: RPC error {reply['error']}")
+            elif isinstance(reply.get("id"), int) and reply["id"] < len(calls):
+                results[reply["id"]] = reply.get("result")
+        return results
+
+    def _fetch_changes(self) -> List[Tuple[str, float]]:
+        """
+        Read all balances if a new block arrived and compare them to the last
+        known balances.
+
+        Blocks on the RPC node, so it runs on a worker thread.
+
+        Returns
+        -------
+        List[Tuple[str, float]]
+            (address, balance change in ETH) of every changed address
+        """
+        (block_hex,) = self._rpc([("eth_blockNumber", [])])
+        if block_hex is None:
+            return []
+        block_number = int(block_hex, 16)
+        if self.block_number is not None and block_number <= self.block_number:
+            return []
+
+        # the balances are only kept once every batch succeeded, so a failed
+        # batch does not hide the changes of the earlier ones from the retry
+        balances = dict(self.balances)
+        changes = []
+        for start in range(0, len(self.addresses), self.batch_size):
+            addresses = self.addresses[start : start + self.batch_size]
+            results = self._rpc(
+                [("eth_getBalance", [address, block_hex]) for address in addresses]
+            )
+            for address, result in zip(addresses, results):
+                if result is None:
+                    continue
+                balance = int(result, 16)
+                previous = balances.get(address)
+                balances[address] = balance
+                if previous is not None and balance != previous:
+                    changes.append((address, (balance - previous) / WEI_PER_ETH))
+
+        self.balances = balances
+        self.block_number = block_number
+        return changes
+
+    async def _poll(self) -> List[Tuple[str, float]]:
+        """
+        Poll for balance changes of the watched addresses.
+
+        Returns
+        -------
+        List[Tuple[str, float]]
+            (address, balance change in ETH) of every changed address
+        """
+        try:
+            # one block number request plus one request per batch
+            batches = math.ceil(len(self.addresses) / self.batch_size)
+            return await asyncio.wait_for(
+                asyncio.to_thread(self._fetch_changes),
+                self.rpc_timeout * (1 + batches),
+            )
+        except Exception as e:
+            logging.error(f"Error fetching blockchain data: {e}")
+            return []
+
+    async def _raw_to_text(self, raw_input: Tuple[str, float]) -> Message:
+        """
+        Convert a balance change to a human-readable message.
+
+        Parameters
+        ----------
+        raw_input : Tuple[str, float]
+            (address, balance change in ETH)
+
+        Returns
+        -------
+        Message
+            Timestamped transaction notification
+        """
+        address, change = raw_input
+        if change > 0:
+            message = f"Wallet {address} received {change:.3f} ETH."
+        else:
+            message = f"Wallet {address} sent {-change:.3f} ETH."
+        return Message(timestamp=time.time(), message=message)
+
+    async def raw_to_text(self, raw_input: List[Tuple[str, float]]):
+        """
+        Buffer a message for every changed address.
+
+        Parameters
+        ----------
+        raw_input : List[Tuple[str, float]]
+            (address, balance change in ETH) of every changed address
+        """
+        for change in raw_input:
+            self.add_message(await self._raw_to_text(change))
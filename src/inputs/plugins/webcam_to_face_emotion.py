@@ -2,33 +2,15 @@ import asyncio
 import logging
 import random
 import time
-from dataclasses import dataclass
 from typing import Optional
 
 import cv2
-from deepface import DeepFace
-
-from inputs.base import SensorConfig
-from inputs.base.loop import FuserInput
-from providers.io_provider import IOProvider
-
-
-@dataclass
-class Message:
-    """
-    Container for timestamped messages.
-
-    Parameters
-    ----------
-    timestamp : float
-        Unix timestamp of the message
-    message : str
-        Content of the message
-    """
-
-    timestamp: float
-    message: str
 
+from inputs.base import Message, SensorConfig
+from inputs.base.buffered_input import BufferedInput
+from inputs.base.face_tracker import FaceTracker
+from inputs.base.scene_change import SceneChangeGate
+from providers.face_emotion_provider import FaceEmotionProvider, dominant_emotion
 
 """
 Code example is from:
@@ -49,12 +31,25 @@ def check_webcam():
     return True
 
 
-class FaceEmotionCapture(FuserInput[cv2.typing.MatLike]):
+class FaceEmotionCapture(BufferedInput[cv2.typing.MatLike]):
     """
     Real-time facial emotion recognition using webcam input.
 
     Uses OpenCV for face detection and DeepFace for emotion analysis.
-    Processes video frames to detect faces and classify emotions.
+    Processes video frames to detect faces and classify emotions. Frames of
+    an unchanged scene reuse the previous result, see SceneChangeGate.
+
+    The analysis runs off the event loop on the FaceEmotionProvider worker,
+    which detects faces on a frame shrunk to face_detection_width and
+    classifies all faces of a frame in one batched forward pass.
+
+    Faces keep their identity across frames, see FaceTracker. A face is
+    classified again every emotion_reclassify_every frames or when its crop
+    changes, its emotion is a moving average of the classifications, and it
+    is forgotten once it has been missing for face_max_misses frames or
+    undetected for face_max_age seconds. A frame is analyzed despite an
+    unchanged scene once a face is due to be confirmed, so a person who
+    left is not reported while the camera looks at a static background.
     """
 
     def __init__(self, config: SensorConfig = SensorConfig()):
@@ -63,12 +58,9 @@ class FaceEmotionCapture(FuserInput[cv2.typing.MatLike]):
         """
         super().__init__(config)
 
-        # Track IO
-        self.io_provider = IOProvider()
-
-        # Load face cascade classifier
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+        # Face detector and emotion model, loaded by warm_up()
+        self.analyzer = FaceEmotionProvider(
+            detection_width=getattr(self.config, "face_detection_width", 320)
         )
 
         self.have_cam = check_webcam()
@@ -78,11 +70,27 @@ class FaceEmotionCapture(FuserInput[cv2.typing.MatLike]):
         if self.have_cam:
             self.cap = cv2.VideoCapture(0)
 
-        # Initialize emotion label
+        # Follow faces across frames and smooth their emotions
+        self.face_tracker = FaceTracker(
+            reclassify_every=getattr(self.config, "emotion_reclassify_every", 5),
+            smoothing=getattr(self.config, "emotion_smoothing", 0.4),
+            max_misses=getattr(self.config, "face_max_misses", 2),
+            max_age=getattr(self.config, "face_max_age", 2.0),
+        )
+
+        # Dominant emotion of the longest tracked face, "" without a face
         self.emotion = ""
 
-        # Messages buffer
-        self.messages: list[Message] = []
+        # Skip analysis while the scene does not change
+        self.scene_gate = SceneChangeGate.from_config("FaceEmotionCapture", self.config)
+        self.last_message: Optional[str] = None
+
+    def warm_up(self) -> None:
+        """
+        Build the DeepFace emotion model by running a dummy analysis, so the
+        first real frame does not pay for loading it.
+        """
+        self.analyzer.load()
 
     async def _poll(self) -> Optional[cv2.typing.MatLike]:
         """
@@ -123,76 +131,28 @@ class FaceEmotionCapture(FuserInput[cv2.typing.MatLike]):
 
         frame = raw_input
 
-        # Convert frame to grayscale
-        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-        # Convert grayscale frame to RGB format
-        rgb_frame = cv2.cvtColor(gray_frame, cv2.COLOR_GRAY2RGB)
-
-        # Detect faces in the frame
-        faces = self.face_cascade.detectMultiScale(
-            gray_frame, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
-        )
-
-        for x, y, w, h in faces:
-            # Extract the face ROI (Region of Interest)
-            face_roi = rgb_frame[y : y + h, x : x + w]
-
-            # Perform emotion analysis on the face ROI
-            result = DeepFace.analyze(
-                face_roi, actions=["emotion"], enforce_detection=False
-            )
+        if (
+            not self.scene_gate.should_process(frame)
+            and self.last_message
+            and not self.face_tracker.stale()
+        ):
+            return Message(timestamp=time.time(), message=self.last_message)
 
-            # Determine the dominant emotion
-            self.emotion = result[0]["dominant_emotion"]
+        faces = await self.analyzer.analyze(frame, self.face_tracker)
+        emotions = [dominant_emotion(face.probabilities) for face in faces]
+        self.emotion = emotions[0] if emotions else ""
 
-        if self.emotion == "":
+        if not emotions:
             message = "I do not see anyone, so I can't estimate their emotion."
-        else:
+        elif len(emotions) == 1:
             message = f"I see a person. Their emotion is {self.emotion}."
+        else:
+            message = (
+                f"I see {len(emotions)} people. Their emotions are "
+                f"{', '.join(emotions[:-1])} and {emotions[-1]}."
+            )
 
         logging.info(f"EmotionCapture: {message}")
+        self.last_message = message
 
         return Message(timestamp=time.time(), message=message)
-
-    async def raw_to_text(self, raw_input: cv2.typing.MatLike):
-        """
-        Convert raw input to processed text and manage buffer.
-
-        Parameters
-        ----------
-        raw_input : Optional[str]
-            Raw input to be processed
-        """
-        pending_message = await self._raw_to_text(raw_input)
-
-        if pending_message is not None:
-            self.messages.append(pending_message)
-
-    def formatted_latest_buffer(self) -> Optional[str]:
-        """
-        Format and clear the latest buffer contents.
-
-        Returns
-        -------
-        Optional[str]
-            Formatted string of buffer contents or None if buffer is empty
-        """
-        if len(self.messages) == 0:
-            return None
-
-        latest_message = self.messages[-1]
-
-        result = f"""
-{self.__class__.__name__} INPUT
-// START
-{latest_message.message}
-// END
-"""
-
-        self.io_provider.add_input(
-            self.__class__.__name__, latest_message.message, latest_message.timestamp
-        )
-        self.messages = []
-
-        return result
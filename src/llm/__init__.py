@@ -9,6 +9,14 @@ from providers.io_provider import IOProvider
 
 R = T.TypeVar("R")
 
+# Maps LLM plugin class names to the module in llm/plugins that defines them,
+# so only the requested LLM client is imported.
+LLM_PLUGINS: T.Dict[str, str] = {
+    "DeepSeekLLM": "deepseek_llm",
+    "GeminiLLM": "gemini_llm",
+    "OpenAILLM": "openai_llm",
+}
+
 
 class LLMConfig(BaseModel):
     """
@@ -80,6 +88,9 @@ def load_llm(llm_name: str) -> T.Type[LLM]:
     """
     Dynamically load an LLM implementation from the plugins directory.
 
+    LLMs listed in LLM_PLUGINS are imported directly. Any other name falls back
+    to importing every module in the plugins directory.
+
     Parameters
     ----------
     llm_name : str
@@ -95,6 +106,12 @@ def load_llm(llm_name: str) -> T.Type[LLM]:
     ValueError
         If requested LLM implementation is not found
     """
+    if llm_name in LLM_PLUGINS:
+        module = importlib.import_module(f"llm.plugins.{LLM_PLUGINS[llm_name]}")
+        llm_class = getattr(module, llm_name, None)
+        if inspect.isclass(llm_class) and issubclass(llm_class, LLM):
+            return llm_class
+
     # Get all files in plugins directory
     plugins_dir = os.path.join(os.path.dirname(__file__), "plugins")
     plugin_files = [f[:-3] for f in os.listdir(plugins_dir) if f.endswith(".py")]
@@ -6,7 +6,9 @@ from typing import Callable, Optional
 from om1_speech import AudioInputStream
 from om1_utils import ws
 
+from .audio_encoder import AudioEncoder
 from .singleton import singleton
+from .voice_activity_detector import VoiceActivityDetector
 
 
 @singleton
@@ -26,13 +28,29 @@ class ASRProvider:
         The device ID of the chosen microphone; used the system default if None
     microphone_name : str
         The name of the microphone to use for audio input
+    vad : bool
+        Send only speech to the ASR service, detected locally; True by default
+    audio_encoding : str, optional
+        Encoding offered to the ASR service for the uplink, e.g. "mulaw";
+        None, the default, sends raw PCM without negotiating
+    audio_rate : int, optional
+        Sample rate offered to the ASR service for the uplink; None keeps the
+        microphone rate
     """
 
+    # Seconds between encoding offers, and the number of unanswered offers
+    # after which the uplink stays raw
+    offer_interval: float = 5.0
+    max_offers: int = 3
+
     def __init__(
         self,
         ws_url: str,
         device_id: Optional[int] = None,
         microphone_name: Optional[str] = None,
+        vad: bool = True,
+        audio_encoding: Optional[str] = None,
+        audio_rate: Optional[int] = None,
     ):
         """
         Initialize the ASR Provider.
@@ -45,13 +63,47 @@ class ASRProvider:
             The device ID of the chosen microphone; used the system default if None
         microphone_name : str
             The name of the microphone to use for audio input
+        vad : bool
+            Send only speech to the ASR service, detected locally; True by default
+        audio_encoding : str, optional
+            Encoding offered to the ASR service for the uplink, e.g. "mulaw";
+            None, the default, sends raw PCM without negotiating
+        audio_rate : int, optional
+            Sample rate offered to the ASR service for the uplink; None keeps
+            the microphone rate
         """
         self.running: bool = False
         self.ws_client: ws.Client = ws.Client(url=ws_url)
+        self.ws_client.register_message_callback(self._handle_message)
+        self._message_callback: Optional[Callable] = None
+
+        # Compact the uplink once the server has accepted an encoding
+        self.encoder: Optional[AudioEncoder] = (
+            AudioEncoder(
+                self.ws_client.send_message,
+                encoding=audio_encoding,
+                target_rate=audio_rate,
+            )
+            if audio_encoding
+            else None
+        )
+        self._offers_sent = 0
+        self._last_offer = 0.0
+        self._connected = False
+        send = self.encoder or self.ws_client.send_message
+
+        # Keep silence off the uplink; the encoder reuses the samples the
+        # VAD has decoded
+        self.vad: Optional[VoiceActivityDetector] = (
+            VoiceActivityDetector(send, pass_decoded=self.encoder is not None)
+            if vad
+            else None
+        )
+
         self.audio_stream: AudioInputStream = AudioInputStream(
             device=device_id,
             device_name=microphone_name,
-            audio_data_callback=self.ws_client.send_message,
+            audio_data_callback=self.vad or send,
         )
         self._thread: Optional[threading.Thread] = None
 
@@ -64,7 +116,79 @@ class ASRProvider:
         callback : callable
             The callback function to process ASR results.
         """
-        self.ws_client.register_message_callback(message_callback)
+        self._message_callback = message_callback
+
+    def register_speech_end_callback(self, speech_end_callback: Optional[Callable]):
+        """
+        Register a callback for the end of speech detected by the local VAD.
+
+        The callback runs on the audio thread. Without a VAD it is never called.
+
+        Parameters
+        ----------
+        speech_end_callback : callable
+            The callback function to call when speech has ended.
+        """
+        if self.vad is not None:
+            self.vad.on_speech_end = speech_end_callback
+
+    def _handle_message(self, raw_message: str):
+        """
+        Route a message from the ASR service.
+
+        Answers to the encoding offer are consumed here, everything else is
+        passed on to the registered message callback.
+
+        Parameters
+        ----------
+        raw_message : str
+            Raw message received from the ASR service
+        """
+        if self.encoder is not None and self.encoder.handle_reply(raw_message):
+            return
+        if self._message_callback is not None:
+            self._message_callback(raw_message)
+
+    def _handle_connect(self):
+        """
+        Offer the uplink encoding on a new websocket connection.
+
+        The server forgets the negotiated encoding with the connection, so
+        the stream is raw again until the new offer is accepted.
+        """
+        if self.encoder is None:
+            return
+        self.encoder.reset()
+        self._offers_sent = 0
+        self._last_offer = 0.0
+        self._offer_encoding()
+
+    def _offer_encoding(self, limit: bool = True):
+        """
+        Offer the uplink encoding until the server answers or gives no answer.
+
+        Parameters
+        ----------
+        limit : bool
+            Give up after max_offers unanswered offers; without a known
+            connection state, offers sent before the websocket connected
+            are lost, so they are repeated until the server answers
+        """
+        if (
+            self.encoder is None
+            or self.encoder.accepted is not None
+            or (limit and self._offers_sent > self.max_offers)
+            or time.time() - self._last_offer < self.offer_interval
+        ):
+            return
+
+        self._offers_sent += 1
+        self._last_offer = time.time()
+        if limit and self._offers_sent > self.max_offers:
+            # chunks stay raw while no encoding has been accepted
+            logging.info("ASR service did not answer, keeping raw audio uplink")
+            return
+        self.ws_client.send_message(self.encoder.offer())
 
     def start(self):
         """
@@ -89,8 +213,26 @@ class ASRProvider:
         This method runs in a separate thread and handles the continuous processing
         of audio data and websocket messages.
         """
+        is_connected = getattr(self.ws_client, "is_connected", None)
+        if self.encoder is not None and not callable(is_connected):
+            logging.info(
+                "ASR websocket client does not report its connection, "
+                "offering the audio encoding until the service answers"
+            )
+
         while self.running:
             try:
+                if callable(is_connected):
+                    # messages sent while disconnected are lost, so the
+                    # encoding is offered once the websocket has connected
+                    connected = is_connected()
+                    if connected and not self._connected:
+                        self._handle_connect()
+                    elif connected:
+                        self._offer_encoding()
+                    self._connected = connected
+                else:
+                    self._offer_encoding(limit=False)
                 time.sleep(0.1)
             except Exception as e:
                 logging.error(f"ASRProvider error: {e}")
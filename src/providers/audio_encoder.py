@@ -0,0 +1,316 @@
+import base64
+import json
+import logging
+import time
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+
+# Encodings the uplink can offer; pcm16 is the raw stream
+ENCODINGS = ("pcm16", "mulaw")
+
+_MULAW_BIAS = 0x84
+
+
+def decode_audio_chunk(
+    chunk: Any, default_rate: int
+) -> Optional[Tuple[np.ndarray, int, Optional[dict]]]:
+    """
+    Extract the 16-bit PCM samples from an audio chunk.
+
+    Parameters
+    ----------
+    chunk : Any
+        Raw PCM bytes, or a JSON message (string or dict) with base64 encoded
+        PCM in an "audio" field and an optional "rate" field
+    default_rate : int
+        Sample rate of chunks that do not carry a "rate" field
+
+    Returns
+    -------
+    Optional[Tuple[np.ndarray, int, Optional[dict]]]
+        The samples, their rate and the parsed message, if any; None if the
+        chunk holds no audio
+    """
+    rate = default_rate
+    message = None
+    payload = chunk
+    if isinstance(payload, str):
+        try:
+            payload = json.loads(payload)
+        except ValueError:
+            return None
+    if isinstance(payload, dict):
+        message = payload
+        audio = message.get("audio")
+        if not isinstance(audio, str) or message.get("encoding", "pcm16") != "pcm16":
+            return None
+        try:
+            rate = int(message.get("rate", rate))
+            payload = base64.b64decode(audio)
+        except (TypeError, ValueError):
+            return None
+    if not isinstance(payload, (bytes, bytearray)):
+        return None
+    samples = np.frombuffer(payload, dtype=np.int16, count=len(payload) // 2)
+    return samples, rate, message
+
+
+def mulaw_encode(samples: np.ndarray) -> bytes:
+    """
+    Encode 16-bit PCM samples with G.711 mu-law.
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        16-bit PCM samples
+
+    Returns
+    -------
+    bytes
+        One byte per sample, compatible with audioop.lin2ulaw and ffmpeg's
+        pcm_mulaw
+    """
+    # 14-bit magnitude with the G.711 bias, as in the reference implementation
+    x = samples.astype(np.int32) >> 2
+    negative = x < 0
+    magnitude = np.minimum(np.abs(x), 8159) + 0x21
+    segment = np.floor(np.log2(magnitude)).astype(np.int32) - 5
+    code = np.where(
+        segment >= 8,
+        0x7F,
+        (np.minimum(segment, 7) << 4)
+        | ((magnitude >> (np.minimum(segment, 7) + 1)) & 0x0F),
+    )
+    encoded = code ^ np.where(negative, 0x7F, 0xFF)
+    return encoded.astype(np.uint8).tobytes()
+
+
+def mulaw_decode(data: bytes) -> np.ndarray:
+    """
+    Decode G.711 mu-law bytes to 16-bit PCM samples.
+
+    Parameters
+    ----------
+    data : bytes
+        mu-law encoded samples
+
+    Returns
+    -------
+    np.ndarray
+        16-bit PCM samples
+    """
+    u = ~np.frombuffer(data, dtype=np.uint8).astype(np.int32) & 0xFF
+    exponent = (u >> 4) & 0x07
+    mantissa = u & 0x0F
+    magnitude = (((mantissa << 3) + _MULAW_BIAS) << exponent) - _MULAW_BIAS
+    return np.where(u & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+class _Decimator:
+    """
+    Streaming low-pass filter and integer factor decimation.
+    """
+
+    def __init__(self, factor: int, taps: int = 31):
+        self.factor = factor
+        n = np.arange(taps) - (taps - 1) / 2
+        cutoff = 0.9 / factor
+        kernel = cutoff * np.sinc(cutoff * n) * np.hamming(taps)
+        self.kernel = (kernel / kernel.sum()).astype(np.float32)
+        self.history = np.zeros(taps - 1, dtype=np.float32)
+        # index of the next output sample in the incoming chunk
+        self.phase = 0
+
+    def __call__(self, samples: np.ndarray) -> np.ndarray:
+        x = np.concatenate([self.history, samples.astype(np.float32)])
+        filtered = np.convolve(x, self.kernel, mode="valid")
+        self.history = x[len(x) - len(self.history) :]
+        out = filtered[self.phase :: self.factor]
+        self.phase = (self.phase - len(filtered)) % self.factor
+        return np.clip(np.round(out), -32768, 32767).astype(np.int16)
+
+
+class AudioEncoder:
+    """
+    Compacts microphone audio before it is sent to the ASR service.
+
+    The encoder only changes the stream after the server has accepted an
+    encoding: offer() builds the offer message, handle_reply() consumes the
+    answer. Until then, and with servers that do not answer, chunks are sent
+    unchanged. Once accepted, every audio chunk is optionally decimated to
+    the target sample rate, encoded and sent as a self-describing JSON
+    message with "audio", "rate" and "encoding" fields.
+
+    Supported encodings are "pcm16" (downsampling only) and "mulaw" (G.711,
+    8 bits per sample), both of which every Linux audio stack can decode
+    without network access.
+
+    Parameters
+    ----------
+    send : Callable[[Any], None]
+        Callback that receives every outgoing message
+    encoding : str
+        The encoding to offer to the server
+    target_rate : int, optional
+        Sample rate to downsample to; must divide the input rate, None keeps it
+    sample_rate : int
+        Sample rate of chunks that do not carry a "rate" field
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Any], None],
+        encoding: str,
+        target_rate: Optional[int] = None,
+        sample_rate: int = 16000,
+    ):
+        if encoding not in ENCODINGS:
+            raise ValueError(
+                f"Unknown audio encoding {encoding}, expected one of {ENCODINGS}"
+            )
+        self.send = send
+        self.encoding = encoding
+        self.target_rate = target_rate
+        self.sample_rate = sample_rate
+        self._offered_rate = target_rate
+
+        # Encoding accepted by the server, None until it has answered
+        self.accepted: Optional[str] = None
+
+        # Uplink metrics
+        self.frames = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.encode_seconds = 0.0
+
+        self._decimator: Optional[_Decimator] = None
+        self._decimator_rate: Optional[int] = None
+
+    def offer(self) -> str:
+        """
+        Build the message offering the encoding to the server.
+
+        Returns
+        -------
+        str
+            The JSON offer message
+        """
+        return json.dumps(
+            {
+                "audio_encoding": {
+                    "offer": [self.encoding],
+                    "rate": self.target_rate,
+                }
+            }
+        )
+
+    def reset(self) -> None:
+        """
+        Forget the server's answer, e.g. after a reconnection, and send
+        chunks unchanged until the encoding is accepted again.
+        """
+        self.accepted = None
+        self.target_rate = self._offered_rate
+        self._decimator = None
+        self._decimator_rate = None
+
+    def handle_reply(self, raw_message: str) -> bool:
+        """
+        Consume the server's answer to the offer.
+
+        Parameters
+        ----------
+        raw_message : str
+            A message received from the ASR service
+
+        Returns
+        -------
+        bool
+            True if the message was the answer to the offer
+        """
+        try:
+            message = json.loads(raw_message)
+        except (TypeError, ValueError):
+            return False
+        if not isinstance(message, dict) or "audio_encoding" not in message:
+            return False
+
+        answer = message["audio_encoding"]
+        if not isinstance(answer, dict) or answer.get("accept") not in ENCODINGS:
+            # the server did not take the offer, leave the stream raw
+            self.accepted = "pcm16"
+            self.target_rate = None
+        else:
+            self.accepted = answer["accept"]
+            self.target_rate = answer.get("rate", self.target_rate)
+        logging.info(f"ASR uplink audio encoding: {self.accepted}")
+        return True
+
+    def __call__(
+        self,
+        chunk: Any,
+        decoded: Optional[Tuple[np.ndarray, int, Optional[dict]]] = None,
+    ) -> None:
+        """
+        Encode one audio chunk and send it.
+
+        Parameters
+        ----------
+        chunk : Any
+            Raw PCM bytes or a JSON message with base64 encoded audio
+        decoded : Tuple[np.ndarray, int, Optional[dict]], optional
+            decode_audio_chunk() of chunk, if the caller has already decoded
+            it; the chunk is decoded here otherwise
+        """
+        if self.accepted is None or (
+            self.accepted == "pcm16" and self.target_rate is None
+        ):
+            self.send(chunk)
+            return
+
+        if decoded is None:
+            decoded = decode_audio_chunk(chunk, self.sample_rate)
+        if decoded is None:
+            self.send(chunk)
+            return
+
+        start = time.perf_counter()
+        samples, rate, message = decoded
+        bytes_in = samples.nbytes
+        samples, rate = self._resample(samples, rate)
+        if self.accepted == "mulaw":
+            data = mulaw_encode(samples)
+        else:
+            data = samples.astype("<i2").tobytes()
+
+        encoded = dict(message or {})
+        encoded.update(
+            {
+                "audio": base64.b64encode(data).decode("utf-8"),
+                "rate": rate,
+                "encoding": self.accepted,
+            }
+        )
+        outgoing = json.dumps(encoded)
+        self.encode_seconds += time.perf_counter() - start
+
+        self.frames += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += len(outgoing)
+        self.send(outgoing)
+
+    def _resample(self, samples: np.ndarray, rate: int) -> Tuple[np.ndarray, int]:
+        if self.target_rate is None or self.target_rate >= rate:
+            return samples, rate
+        if rate % self.target_rate:
+            logging.warning(
+                f"Cannot downsample {rate} Hz audio to {self.target_rate} Hz"
+            )
+            self.target_rate = None
+            return samples, rate
+
+        if self._decimator is None or self._decimator_rate != rate:
+            self._decimator = _Decimator(rate // self.target_rate)
+            self._decimator_rate = rate
+        return self._decimator(samples), self.target_rate
@@ -0,0 +1,270 @@
+import collections
+import json
+import logging
+import os
+import time
+from typing import Any, Optional
+
+import cv2
+import numpy as np
+
+from .frame_dedupe import perceptual_hash
+
+# Bins per color channel of the signature histogram
+HISTOGRAM_BINS = 4
+
+# phash: 64 bit perceptual hash, histogram: normalized coarse BGR histogram
+FrameSignature = collections.namedtuple("FrameSignature", "phash, histogram")
+
+
+def frame_signature(image: np.ndarray) -> FrameSignature:
+    """
+    Compact signature of a BGR frame.
+
+    The perceptual hash captures the structure of the scene and the coarse
+    color histogram tells apart scenes of similar structure but different
+    colors, e.g. two identical corridors painted differently.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        BGR uint8 image, ideally already shrunk
+
+    Returns
+    -------
+    FrameSignature
+        The signature
+    """
+    histogram = cv2.calcHist(
+        [image], [0, 1, 2], None, [HISTOGRAM_BINS] * 3, [0, 256] * 3
+    ).flatten()
+    histogram /= max(float(histogram.sum()), 1.0)
+    return FrameSignature(perceptual_hash(image), histogram.astype(np.float32))
+
+
+class CaptionCache:
+    """
+    Bounded cache of VLM replies keyed by frame signatures.
+
+    A lookup returns the reply of the most similar cached frame whose
+    perceptual hash is within max_distance bits and whose color histogram
+    is within max_histogram_distance (half the L1 distance, between 0 and
+    1) of the looked up frame, unless the entry is older than max_age
+    seconds. The hashes and histograms are kept in preallocated arrays, so
+    a lookup compares against all entries with a few vectorized operations.
+    Once max_entries replies are cached, the least recently used one is
+    evicted.
+
+    With a path, the cache is loaded from and saved to a JSON file, so it
+    survives restarts; the replies must then be JSON serializable. The file
+    is written every save_every stored replies and by save().
+
+    Parameters
+    ----------
+    name : str
+        Name of the VLM provider, used when reporting the hit rate
+    max_entries : int
+        Maximum number of cached replies
+    max_age : float
+        Maximum age in seconds of a served reply
+    max_distance : int
+        Maximum perceptual hash distance of a match
+    max_histogram_distance : float
+        Maximum color histogram distance of a match
+    path : str, optional
+        JSON file the cache is persisted to
+    save_every : int
+        Number of stored replies between two saves
+    report_every : int
+        Number of lookups between two hit rate log lines
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1000,
+        max_age: float = 600.0,
+        max_distance: int = 4,
+        max_histogram_distance: float = 0.2,
+        path: Optional[str] = None,
+        save_every: int = 20,
+        report_every: int = 100,
+    ):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.max_age = max_age
+        self.max_distance = max_distance
+        self.max_histogram_distance = max_histogram_distance
+        self.path = os.path.expanduser(path) if path else None
+        self.save_every = save_every
+        self.report_every = report_every
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+        self._hashes = np.zeros(self.max_entries, dtype=np.uint64)
+        self._histograms = np.zeros(
+            (self.max_entries, HISTOGRAM_BINS**3), dtype=np.float32
+        )
+        self._times = np.full(self.max_entries, -np.inf)
+        self._replies: list = [None] * self.max_entries
+        # used slots, least recently used first
+        self._slots: "collections.OrderedDict[int, None]" = collections.OrderedDict()
+        self._free = list(range(self.max_entries - 1, -1, -1))
+        self._unsaved = 0
+
+        if self.path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of lookups served from the cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def lookup(
+        self, signature: FrameSignature, now: Optional[float] = None
+    ) -> Optional[Any]:
+        """
+        Find the reply of a similar frame.
+
+        Parameters
+        ----------
+        signature : FrameSignature
+            Signature of the frame
+        now : float, optional
+            Current timestamp
+
+        Returns
+        -------
+        Any, optional
+            The cached reply, or None if no similar frame is cached
+        """
+        now = now if now is not None else time.time()
+        slot = self._match(signature, now)
+        if slot is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._slots.move_to_end(slot)
+
+        if (self.hits + self.misses) % self.report_every == 0:
+            logging.info(
+                f"{self.name}: served {self.hits} of {self.hits + self.misses} "
+                f"frames ({100 * self.hit_rate:.0f}%) from {len(self)} cached replies"
+            )
+        return None if slot is None else self._replies[slot]
+
+    def store(
+        self, signature: FrameSignature, reply: Any, now: Optional[float] = None
+    ) -> None:
+        """
+        Cache the reply to a frame.
+
+        Parameters
+        ----------
+        signature : FrameSignature
+            Signature of the frame
+        reply : Any
+            The VLM reply
+        now : float, optional
+            Current timestamp
+        """
+        self._put(signature, reply, now if now is not None else time.time())
+        self._unsaved += 1
+        if self.path and self._unsaved >= self.save_every:
+            self.save()
+
+    def save(self) -> None:
+        """
+        Write the cache to its file, if it has one.
+        """
+        if not self.path:
+            return
+        entries = [
+            {
+                "phash": int(self._hashes[slot]),
+                "histogram": self._histograms[slot].tolist(),
+                "time": float(self._times[slot]),
+                "reply": self._replies[slot],
+            }
+            for slot in self._slots
+        ]
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.path)
+            self._unsaved = 0
+        except Exception as e:
+            logging.warning(f"{self.name}: could not save the caption cache: {e}")
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+            for entry in entries[-self.max_entries :]:
+                signature = FrameSignature(
+                    entry["phash"], np.asarray(entry["histogram"], dtype=np.float32)
+                )
+                self._put(signature, entry["reply"], entry["time"])
+            logging.info(f"{self.name}: loaded {len(self)} cached replies")
+        except Exception as e:
+            logging.warning(f"{self.name}: could not load the caption cache: {e}")
+
+    def _put(self, signature: FrameSignature, reply: Any, now: float) -> None:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot, _ = self._slots.popitem(last=False)
+            self.evictions += 1
+        self._hashes[slot] = signature.phash
+        self._histograms[slot] = signature.histogram
+        self._times[slot] = now
+        self._replies[slot] = reply
+        self._slots[slot] = None
+
+    def _match(self, signature: FrameSignature, now: float) -> Optional[int]:
+        if not self._slots:
+            return None
+
+        distances = np.bitwise_count(self._hashes ^ np.uint64(signature.phash))
+        candidates = np.flatnonzero(distances <= self.max_distance)
+        candidates = [slot for slot in candidates.tolist() if slot in self._slots]
+        if not candidates:
+            return None
+
+        fresh = []
+        for slot in candidates:
+            if now - self._times[slot] > self.max_age:
+                self._drop(slot)
+            else:
+                fresh.append(slot)
+        if not fresh:
+            return None
+
+        histogram_distances = 0.5 * np.abs(
+            self._histograms[fresh] - signature.histogram
+        ).sum(axis=1)
+        best = int(np.argmin(histogram_distances))
+        if histogram_distances[best] > self.max_histogram_distance:
+            return None
+        return fresh[best]
+
+    def _drop(self, slot: int) -> None:
+        del self._slots[slot]
+        self._replies[slot] = None
+        self._times[slot] = -np.inf
+        self._free.append(slot)
+        self.expired += 1
@@ -0,0 +1,346 @@
+import asyncio
+import collections
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+import torch
+from torchvision.models import detection as detection_model
+
+from .singleton import singleton
+
+# label: COCO category name, bbox: (x1, y1, x2, y2) in frame pixels
+Detection = collections.namedtuple("Detection", "label, bbox, score")
+
+# "eager" runs the torchvision model as is, "torchscript" a compiled version
+# and "quantized" a compiled version with int8 dynamically quantized linear
+# layers
+BACKENDS = ("eager", "torchscript", "quantized")
+
+DEFAULT_MODEL_CACHE_DIR = "~/.cache/om1"
+
+
+@singleton
+class COCODetectionProvider:
+    """
+    COCO object detector running on a dedicated inference worker.
+
+    The FasterRCNN MobileNetV3 320 model is owned by a single worker thread,
+    so inference never blocks the event loop and the model is never used by
+    two threads at once. Frames are shrunk to the model's 320 pixel input
+    before they are converted, the uint8 to float32 conversion and scaling
+    happen in place on the small tensor, and inference runs in
+    torch.inference_mode with a fixed number of intra-op threads.
+
+    The provider is a singleton, so the settings of the first instance are
+    the ones in effect; check_settings() warns about a later instance that
+    asks for different ones.
+
+    Parameters
+    ----------
+    device : str
+        Torch device to run the model on
+    detection_threshold : float
+        Minimum score of a reported detection
+    threads : int, optional
+        Number of intra-op threads used by torch; defaults to at most four
+    backend : str
+        "eager", "torchscript" or "quantized". The compiled backends are
+        cached in model_cache_dir, so later startups load them directly.
+    model_cache_dir : str
+        Directory of the compiled models
+    """
+
+    # Short side of the frames fed to the model, matching its min_size
+    input_size: int = 320
+
+    def __init__(
+        self,
+        device: str = "cpu",
+        detection_threshold: float = 0.7,
+        threads: Optional[int] = None,
+        backend: str = "eager",
+        model_cache_dir: str = DEFAULT_MODEL_CACHE_DIR,
+    ):
+        """
+        Initialize the provider. The model is loaded by load().
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend}, expected one of {BACKENDS}")
+
+        self.device = device
+        self.detection_threshold = detection_threshold
+        self.threads = threads or min(4, os.cpu_count() or 1)
+        self.backend = backend
+        self.model_cache_dir = os.path.expanduser(model_cache_dir)
+
+        self.model = None
+        self.class_labels = (
+            detection_model.FasterRCNN_MobileNet_V3_Large_320_FPN_Weights.DEFAULT.meta[
+                "categories"
+            ]
+        )
+
+        # Inference metrics
+        self.frames = 0
+        self.inference_seconds = 0.0
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="coco-inference",
+            initializer=self._init_worker,
+        )
+
+    def _init_worker(self) -> None:
+        # set_num_threads is process wide; torch is only used by this
+        # provider, and the OpenCV thread pool shared with the other vision
+        # pipelines is left alone
+        torch.set_num_threads(self.threads)
+
+    def check_settings(
+        self,
+        detection_threshold: float,
+        backend: str,
+        threads: Optional[int] = None,
+    ) -> bool:
+        """
+        Warn if the shared detector runs with other settings than a user of
+        the singleton asked for.
+
+        Parameters
+        ----------
+        detection_threshold : float
+            Requested minimum score of a reported detection
+        backend : str
+            Requested backend
+        threads : int, optional
+            Requested number of intra-op threads, None for the default
+
+        Returns
+        -------
+        bool
+            True if the settings match
+        """
+        requested = {"detection_threshold": detection_threshold, "backend": backend}
+        if threads is not None:
+            requested["threads"] = threads
+        mismatches = [
+            f"{name}={getattr(self, name)!r} instead of {value!r}"
+            for name, value in requested.items()
+            if getattr(self, name) != value
+        ]
+        if mismatches:
+            logging.warning(
+                "COCODetectionProvider is shared and already runs with "
+                + ", ".join(mismatches)
+            )
+        return not mismatches
+
+    def load(self) -> None:
+        """
+        Load the detector on the worker and run a dummy inference, so the
+        first real frame does not pay for lazy initialization. Blocks until
+        the model is ready.
+        """
+        self._executor.submit(self._load).result()
+
+    def _load(self) -> None:
+        if self.model is not None:
+            return
+
+        model = None
+        if self.backend != "eager":
+            model = self._load_compiled()
+        if model is None:
+            model = self._build_model()
+            if self.backend != "eager":
+                model = self._compile(model)
+
+        with torch.inference_mode():
+            self._forward(model, [torch.zeros((3, self.input_size, self.input_size))])
+
+        self.model = model
+        logging.info(
+            f"COCO Object Detector Started with the {self.backend} backend "
+            f"and {self.threads} threads"
+        )
+
+    def _build_model(self) -> torch.nn.Module:
+        # Low resolution Faster R-CNN model with a MobileNetV3-Large backbone tuned for mobile use cases.
+        model = detection_model.fasterrcnn_mobilenet_v3_large_320_fpn(
+            weights="FasterRCNN_MobileNet_V3_Large_320_FPN_Weights.COCO_V1",
+            progress=True,
+            weights_backbone="MobileNet_V3_Large_Weights.IMAGENET1K_V1",
+        ).to(self.device)
+        model.eval()
+        return model
+
+    @property
+    def compiled_model_path(self) -> str:
+        """
+        Path of the cached compiled model for the backend and torch version.
+        """
+        version = torch.__version__.replace("+", "_")
+        return os.path.join(
+            self.model_cache_dir,
+            f"fasterrcnn_mobilenet_v3_large_320_fpn_{self.backend}_torch{version}.pt",
+        )
+
+    def _load_compiled(self) -> Optional[torch.nn.Module]:
+        """
+        Load the cached compiled model, if there is one.
+        """
+        path = self.compiled_model_path
+        if not os.path.exists(path):
+            return None
+        try:
+            model = torch.jit.load(path, map_location=self.device)
+            model.eval()
+            logging.info(f"Loaded compiled COCO detector from {path}")
+            return model
+        except Exception as e:
+            logging.warning(f"Could not load compiled COCO detector {path}: {e}")
+            return None
+
+    def _compile(self, model: torch.nn.Module) -> torch.nn.Module:
+        """
+        Compile the model for the backend and cache it on disk.
+        """
+        if self.backend == "quantized":
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+        try:
+            compiled = torch.jit.script(model)
+        except Exception as e:
+            logging.warning(f"Could not compile the COCO detector, running eager: {e}")
+            return model
+
+        path = self.compiled_model_path
+        try:
+            os.makedirs(self.model_cache_dir, exist_ok=True)
+            temp_path = f"{path}.tmp"
+            torch.jit.save(compiled, temp_path)
+            os.replace(temp_path, path)
+            logging.info(f"Cached compiled COCO detector at {path}")
+        except Exception as e:
+            logging.warning(f"Could not cache the compiled COCO detector: {e}")
+        return compiled
+
+    @staticmethod
+    def _forward(model: torch.nn.Module, inputs: List[torch.Tensor]) -> List[dict]:
+        outputs = model(inputs)
+        # scripted detection models return a (losses, detections) tuple
+        if isinstance(outputs, tuple):
+            outputs = outputs[1]
+        return outputs
+
+    def preprocess(self, frame: np.ndarray) -> Tuple[torch.Tensor, float]:
+        """
+        Convert a BGR camera frame into a model input tensor.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            BGR uint8 frame of shape (height, width, 3)
+
+        Returns
+        -------
+        Tuple[torch.Tensor, float]
+            The float32 RGB tensor of shape (3, h, w) scaled to [0, 1], and
+            the factor the frame was scaled by
+        """
+        height, width = frame.shape[:2]
+        scale = self.input_size / min(height, width)
+        if scale < 1.0:
+            frame = cv2.resize(
+                frame,
+                (round(width * scale), round(height * scale)),
+                interpolation=cv2.INTER_AREA,
+            )
+        else:
+            scale = 1.0
+
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        tensor = torch.from_numpy(rgb).permute(2, 0, 1)
+        tensor = tensor.to(self.device, dtype=torch.float32)
+        tensor.div_(255.0)
+        return tensor, scale
+
+    def detect_batch(self, frames: List[np.ndarray]) -> List[List[Detection]]:
+        """
+        Run the detector on frames in one forward pass. Call on the worker.
+
+        Parameters
+        ----------
+        frames : List[np.ndarray]
+            BGR uint8 frames
+
+        Returns
+        -------
+        List[List[Detection]]
+            The detections above the threshold for every frame, by
+            descending score, with boxes in frame pixels
+        """
+        start = time.perf_counter()
+        with torch.inference_mode():
+            inputs = [self.preprocess(frame) for frame in frames]
+            outputs = self._forward(self.model, [tensor for tensor, _ in inputs])
+
+        results = []
+        for output, (_, scale) in zip(outputs, inputs):
+            keep = output["scores"] >= self.detection_threshold
+            boxes = (output["boxes"][keep] / scale).tolist()
+            labels = output["labels"][keep].tolist()
+            scores = output["scores"][keep].tolist()
+            results.append(
+                [
+                    Detection(self.class_labels[label], tuple(box), score)
+                    for label, box, score in zip(labels, boxes, scores)
+                ]
+            )
+
+        self.frames += len(frames)
+        self.inference_seconds += time.perf_counter() - start
+        return results
+
+    async def detect(self, frame: np.ndarray) -> List[Detection]:
+        """
+        Detect objects in a frame on the inference worker.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            BGR uint8 frame
+
+        Returns
+        -------
+        List[Detection]
+            The detections above the threshold, by descending score
+        """
+        results = await self.detect_many([frame])
+        return results[0]
+
+    async def detect_many(self, frames: List[np.ndarray]) -> List[List[Detection]]:
+        """
+        Detect objects in several frames, e.g. of several cameras, in one
+        batched forward pass on the inference worker.
+
+        Parameters
+        ----------
+        frames : List[np.ndarray]
+            BGR uint8 frames
+
+        Returns
+        -------
+        List[List[Detection]]
+            The detections above the threshold for every frame, by
+            descending score
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.detect_batch, frames)
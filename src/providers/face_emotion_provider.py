@@ -0,0 +1,282 @@
+import asyncio
+import collections
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from deepface import DeepFace
+
+from .singleton import singleton
+
+# Classes of the DeepFace emotion model, in the order of its outputs
+EMOTION_LABELS = ("angry", "disgust", "fear", "happy", "sad", "surprise", "neutral")
+
+# bbox: (x, y, w, h) in frame pixels, probabilities: one per EMOTION_LABELS,
+# track_id: persistent ID of the face when analyzed with a tracker
+Face = collections.namedtuple("Face", "bbox, probabilities, track_id", defaults=(None,))
+
+# Stages of FaceEmotionProvider.analyze_frame
+STAGES = ("detect", "preprocess", "classify")
+
+
+def dominant_emotion(probabilities: np.ndarray) -> str:
+    """
+    Label of the most probable emotion.
+    """
+    return EMOTION_LABELS[int(np.argmax(probabilities))]
+
+
+@singleton
+class FaceEmotionProvider:
+    """
+    Face detector and DeepFace emotion classifier running on a dedicated
+    worker.
+
+    The emotion model is built once and called directly, instead of going
+    through DeepFace.analyze for every face, which runs a second face
+    detection and converts every crop on its own. Faces are detected with a
+    Haar cascade on a grayscale copy of the frame shrunk to detection_width,
+    their crops are cut from the full resolution grayscale frame, and all
+    crops of a frame are classified in one batched forward pass. With a
+    FaceTracker, only the faces the tracker asks for are classified, and the
+    smoothed emotions of the tracked faces are reported.
+
+    The time spent in every stage is accumulated in stage_seconds and the
+    per frame averages are logged every report_every frames.
+
+    Parameters
+    ----------
+    detection_width : int
+        Width of the frame the faces are detected on
+    min_face_size : int
+        Minimum face size in frame pixels
+    report_every : int
+        Number of frames between two timing log lines
+    """
+
+    # Input size of the emotion model
+    input_size: int = 48
+
+    def __init__(
+        self,
+        detection_width: int = 320,
+        min_face_size: int = 30,
+        report_every: int = 100,
+    ):
+        """
+        Initialize the provider. The emotion model is loaded by load().
+        """
+        self.detection_width = detection_width
+        self.min_face_size = min_face_size
+        self.report_every = report_every
+
+        self.face_cascade = cv2.CascadeClassifier(
+            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+        )
+        self.model = None
+
+        # Stage metrics
+        self.frames = 0
+        self.faces = 0
+        self.classified_faces = 0
+        self.stage_seconds: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="face-emotion"
+        )
+
+    def load(self) -> None:
+        """
+        Build the emotion model on the worker and run a dummy inference, so
+        the first real frame does not pay for loading it. Blocks until the
+        model is ready.
+        """
+        self._executor.submit(self._load).result()
+
+    def _load(self) -> None:
+        if self.model is not None:
+            return
+        self.model = DeepFace.build_model(
+            task="facial_attribute", model_name="Emotion"
+        ).model
+        self.classify_batch(
+            [np.zeros((self.input_size, self.input_size), dtype=np.uint8)]
+        )
+        logging.info("FaceEmotionProvider: emotion model loaded")
+
+    def detect_faces(self, gray: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """
+        Detect faces on a shrunk copy of a grayscale frame.
+
+        Parameters
+        ----------
+        gray : np.ndarray
+            Grayscale uint8 frame
+
+        Returns
+        -------
+        List[Tuple[int, int, int, int]]
+            (x, y, w, h) of every face in frame pixels
+        """
+        height, width = gray.shape[:2]
+        scale = min(1.0, self.detection_width / width)
+        small = gray
+        if scale < 1.0:
+            small = cv2.resize(
+                gray,
+                (round(width * scale), round(height * scale)),
+                interpolation=cv2.INTER_AREA,
+            )
+
+        min_size = max(1, round(self.min_face_size * scale))
+        faces = self.face_cascade.detectMultiScale(
+            small, scaleFactor=1.1, minNeighbors=5, minSize=(min_size, min_size)
+        )
+        return [tuple(int(round(v / scale)) for v in face) for face in faces]
+
+    def preprocess(
+        self, gray: np.ndarray, bbox: Tuple[int, int, int, int]
+    ) -> np.ndarray:
+        """
+        Cut a face from a grayscale frame and shrink it to the model input.
+
+        Parameters
+        ----------
+        gray : np.ndarray
+            Grayscale uint8 frame
+        bbox : Tuple[int, int, int, int]
+            (x, y, w, h) of the face in frame pixels
+
+        Returns
+        -------
+        np.ndarray
+            uint8 crop of input_size x input_size
+        """
+        x, y, w, h = bbox
+        crop = gray[max(y, 0) : y + h, max(x, 0) : x + w]
+        return cv2.resize(
+            crop, (self.input_size, self.input_size), interpolation=cv2.INTER_AREA
+        )
+
+    def classify_batch(self, crops: List[np.ndarray]) -> np.ndarray:
+        """
+        Classify the emotions of face crops in one forward pass.
+
+        Parameters
+        ----------
+        crops : List[np.ndarray]
+            uint8 crops of input_size x input_size
+
+        Returns
+        -------
+        np.ndarray
+            Emotion probabilities of shape (len(crops), len(EMOTION_LABELS))
+        """
+        batch = np.stack(crops).astype(np.float32)[..., np.newaxis] / 255.0
+        # calling the model directly avoids the overhead of model.predict
+        probabilities = np.asarray(self.model(batch, training=False))
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    def analyze_frame(
+        self, frame: np.ndarray, tracker: Optional[Any] = None
+    ) -> List[Face]:
+        """
+        Detect the faces of a frame and classify their emotions. Call on the
+        worker.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            BGR uint8 frame
+        tracker : FaceTracker, optional
+            Tracker deciding which faces are classified
+
+        Returns
+        -------
+        List[Face]
+            The faces with their emotion probabilities, or the tracked faces
+            with their smoothed probabilities
+        """
+        start = time.perf_counter()
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        boxes = self.detect_faces(gray)
+        detected = time.perf_counter()
+
+        crops = [self.preprocess(gray, bbox) for bbox in boxes]
+        pending = list(range(len(crops)))
+        if tracker is not None:
+            pending = tracker.update(boxes, crops)
+        preprocessed = time.perf_counter()
+
+        probabilities = []
+        if pending:
+            probabilities = self.classify_batch([crops[i] for i in pending])
+        if tracker is not None:
+            tracker.classified(pending, probabilities)
+            faces = [
+                Face(face.bbox, face.probabilities, face.track_id)
+                for face in tracker.visible()
+            ]
+        else:
+            faces = [Face(boxes[i], p) for i, p in zip(pending, probabilities)]
+        classified = time.perf_counter()
+
+        self.stage_seconds["detect"] += detected - start
+        self.stage_seconds["preprocess"] += preprocessed - detected
+        self.stage_seconds["classify"] += classified - preprocessed
+        self.frames += 1
+        self.faces += len(boxes)
+        self.classified_faces += len(pending)
+        if self.frames % self.report_every == 0:
+            logging.info(f"FaceEmotionProvider: {self.timings_summary()}")
+        return faces
+
+    def stage_milliseconds(self) -> Dict[str, float]:
+        """
+        Average milliseconds per frame spent in every stage.
+        """
+        frames = max(self.frames, 1)
+        return {
+            stage: 1000 * seconds / frames
+            for stage, seconds in self.stage_seconds.items()
+        }
+
+    def timings_summary(self) -> str:
+        """
+        One line summary of the stage timings.
+        """
+        stages = ", ".join(
+            f"{stage} {ms:.1f} ms" for stage, ms in self.stage_milliseconds().items()
+        )
+        frames = max(self.frames, 1)
+        return (
+            f"{stages} per frame, {self.faces / frames:.1f} faces and "
+            f"{self.classified_faces / frames:.1f} classifications per frame"
+        )
+
+    async def analyze(
+        self, frame: np.ndarray, tracker: Optional[Any] = None
+    ) -> List[Face]:
+        """
+        Detect the faces of a frame and classify their emotions on the worker.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            BGR uint8 frame
+        tracker : FaceTracker, optional
+            Tracker deciding which faces are classified
+
+        Returns
+        -------
+        List[Face]
+            The faces with their emotion probabilities, or the tracked faces
+            with their smoothed probabilities
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.analyze_frame, frame, tracker
+        )
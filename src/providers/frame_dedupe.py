@@ -0,0 +1,182 @@
+import base64
+import binascii
+import logging
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+def decode_frame(frame: str, color: bool = False) -> Optional[np.ndarray]:
+    """
+    Decode a base64 encoded JPEG video frame into a small image.
+
+    The JPEG is decoded at an eighth of its resolution, which is plenty for
+    a 32 x 32 hash and skips most of the decoding work.
+
+    Parameters
+    ----------
+    frame : str
+        The base64 encoded JPEG frame, as passed to VideoStream callbacks
+    color : bool
+        Decode a BGR instead of a grayscale image
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        The uint8 image, or None if the frame is not a JPEG
+    """
+    try:
+        data = np.frombuffer(base64.b64decode(frame, validate=True), dtype=np.uint8)
+    except (binascii.Error, ValueError, TypeError):
+        return None
+    if data.size == 0:
+        return None
+    flags = cv2.IMREAD_REDUCED_COLOR_8 if color else cv2.IMREAD_REDUCED_GRAYSCALE_8
+    return cv2.imdecode(data, flags)
+
+
+def perceptual_hash(image: np.ndarray, hash_size: int = 8) -> int:
+    """
+    DCT based perceptual hash of an image.
+
+    The image is shrunk to a 32 x 32 grayscale thumbnail, and every bit of
+    the hash tells whether one of the lowest hash_size x hash_size DCT
+    coefficients is above their median. Small changes such as sensor noise,
+    compression artifacts or slight lighting changes flip few bits.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        Grayscale or BGR image
+    hash_size : int
+        Width of the block of coefficients; the hash has hash_size**2 bits
+
+    Returns
+    -------
+    int
+        The hash
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    size = 4 * hash_size
+    thumbnail = cv2.resize(image, (size, size), interpolation=cv2.INTER_AREA)
+    coefficients = cv2.dct(thumbnail.astype(np.float32))[:hash_size, :hash_size]
+    # the DC coefficient is the mean brightness, not structure
+    bits = (coefficients > np.median(coefficients.flatten()[1:])).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    Number of differing bits of two hashes.
+    """
+    return bin(a ^ b).count("1")
+
+
+class FrameDeduplicator:
+    """
+    Drops video frames that look like the last frame sent to a VLM.
+
+    Every frame is reduced to a 64 bit perceptual hash. A frame is sent
+    when its hash differs from the hash of the last sent frame in more than
+    max_distance bits, or when nothing was sent for refresh_interval
+    seconds, so a static scene is still described now and then. Frames that
+    cannot be decoded are sent. last_reason tells why the last frame was
+    sent, so callers can tell a refresh of a static scene, which has to
+    reach the VLM, from a frame that changed. The number of sent and
+    dropped frames is logged every report_every frames.
+
+    Parameters
+    ----------
+    name : str
+        Name of the VLM provider, used when reporting the savings
+    max_distance : int
+        Maximum Hamming distance of a dropped frame to the last sent one; a
+        negative value sends every frame
+    refresh_interval : float
+        Maximum number of seconds between two sent frames
+    report_every : int
+        Number of frames between two savings log lines
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_distance: int = 6,
+        refresh_interval: float = 10.0,
+        report_every: int = 100,
+    ):
+        self.name = name
+        self.max_distance = max_distance
+        self.refresh_interval = refresh_interval
+        self.report_every = report_every
+
+        self.frames = 0
+        self.sent = 0
+        self.dropped = 0
+
+        # Why the last frame was sent: "first", "changed", "refresh",
+        # "undecodable" or "unfiltered"; None if it was dropped
+        self.last_reason: Optional[str] = None
+
+        self._last_hash: Optional[int] = None
+        self._last_sent = 0.0
+
+    @property
+    def savings(self) -> float:
+        """
+        Fraction of frames that were dropped.
+        """
+        return self.dropped / self.frames if self.frames else 0.0
+
+    def should_send(self, frame: str) -> bool:
+        """
+        Decide whether a frame has to be sent to the VLM.
+
+        Parameters
+        ----------
+        frame : str
+            The base64 encoded JPEG frame
+
+        Returns
+        -------
+        bool
+            True if the frame must be sent, False if it can be dropped
+        """
+        self.frames += 1
+        now = time.time()
+
+        reason: Optional[str] = "unfiltered"
+        if self.max_distance >= 0:
+            image = decode_frame(frame)
+            if image is None:
+                reason = "undecodable"
+            else:
+                frame_hash = perceptual_hash(image)
+                if self._last_hash is None:
+                    reason = "first"
+                elif hamming_distance(frame_hash, self._last_hash) > self.max_distance:
+                    reason = "changed"
+                elif now - self._last_sent >= self.refresh_interval:
+                    reason = "refresh"
+                else:
+                    reason = None
+                if reason is not None:
+                    self._last_hash = frame_hash
+
+        self.last_reason = reason
+        send = reason is not None
+        if send:
+            self._last_sent = now
+            self.sent += 1
+        else:
+            self.dropped += 1
+
+        if self.frames % self.report_every == 0:
+            logging.info(
+                f"{self.name}: sent {self.sent} of {self.frames} frames, "
+                f"dropped {100 * self.savings:.0f}% as duplicates"
+            )
+        return send
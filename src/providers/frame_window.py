@@ -0,0 +1,136 @@
+import itertools
+import logging
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+
+class LatestFrameWindow:
+    """
+    Bounded in-flight window for VLM frame requests with latest-frame-wins
+    semantics.
+
+    At most max_in_flight requests run at once. A frame that arrives while
+    the window is full is parked, replacing any frame parked before it, and
+    the request that finishes next continues with it. Every frame carries a
+    sequence number, and a response to a frame older than the last
+    delivered one is discarded, so a slow reply never overwrites a newer
+    scene. A failed request is logged and the parked frame is still sent;
+    if the request is cancelled instead, the parked frame is dropped so it
+    does not linger in the window.
+
+    submit() runs the request in the caller's coroutine, so callers that
+    await it see the response delivered when it returns.
+
+    Parameters
+    ----------
+    name : str
+        Name of the VLM provider, used when reporting the metrics
+    request : Callable[[str], Awaitable[Any]]
+        Sends a frame and returns the response, or None if there is nothing
+        to deliver
+    deliver : Callable[[Any], None]
+        Receives the responses in frame order
+    max_in_flight : int
+        Maximum number of concurrent requests
+    report_every : int
+        Number of frames between two metrics log lines
+    """
+
+    def __init__(
+        self,
+        name: str,
+        request: Callable[[str], Awaitable[Any]],
+        deliver: Callable[[Any], None],
+        max_in_flight: int = 1,
+        report_every: int = 100,
+    ):
+        self.name = name
+        self.request = request
+        self.deliver = deliver
+        self.max_in_flight = max(1, max_in_flight)
+        self.report_every = report_every
+
+        # Metrics
+        self.frames = 0
+        self.requests = 0
+        self.dropped = 0
+        self.stale = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+
+        self._sequence = itertools.count(1)
+        self._pending: Optional[Tuple[int, str]] = None
+        self._last_delivered = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of frames in flight or parked.
+        """
+        return self.in_flight + (self._pending is not None)
+
+    async def submit(self, frame: str) -> None:
+        """
+        Request a frame, or park it while the window is full.
+
+        Parameters
+        ----------
+        frame : str
+            The base64 encoded video frame
+        """
+        self.frames += 1
+        sequence = next(self._sequence)
+        if self.frames % self.report_every == 0:
+            self._report()
+
+        if self.in_flight >= self.max_in_flight:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = (sequence, frame)
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            return
+
+        await self._drain(sequence, frame)
+
+    async def _drain(self, sequence: int, frame: str) -> None:
+        try:
+            while True:
+                self.in_flight += 1
+                self.requests += 1
+                self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+                try:
+                    response = await self.request(frame)
+                except Exception as e:
+                    logging.error(
+                        f"{self.name}: request for frame {sequence} failed: {e}"
+                    )
+                    response = None
+                finally:
+                    self.in_flight -= 1
+                self._deliver(sequence, response)
+
+                if self._pending is None:
+                    return
+                (sequence, frame), self._pending = self._pending, None
+        finally:
+            # Cancelled while a frame was parked: nobody is left to send it
+            if self._pending is not None and self.in_flight == 0:
+                self._pending = None
+                self.dropped += 1
+
+    def _deliver(self, sequence: int, response: Any) -> None:
+        if response is None:
+            return
+        if sequence < self._last_delivered:
+            self.stale += 1
+            logging.debug(f"{self.name}: discarded the stale reply to {sequence}")
+            return
+        self._last_delivered = sequence
+        self.deliver(response)
+
+    def _report(self) -> None:
+        logging.info(
+            f"{self.name}: {self.requests} requests for {self.frames} frames, "
+            f"{self.dropped} frames replaced by newer ones, "
+            f"{self.stale} stale replies discarded, "
+            f"queue depth {self.queue_depth} (max {self.max_queue_depth})"
+        )
@@ -0,0 +1,96 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, List
+
+from .singleton import singleton
+
+
+@dataclass
+class ComponentTiming:
+    """
+    Construction time of a single runtime component.
+
+    Parameters
+    ----------
+    kind : str
+        Component category, e.g. "input", "llm" or "action_connector".
+    name : str
+        Name of the component as written in the config.
+    seconds : float
+        Wall time spent constructing the component.
+    """
+
+    kind: str
+    name: str
+    seconds: float
+
+
+@singleton
+class StartupProfileProvider:
+    """
+    A thread-safe singleton that records how long each runtime component takes
+    to construct while a configuration is loaded.
+    """
+
+    def __init__(self):
+        """
+        Initialize the StartupProfileProvider with empty timings.
+        """
+        self._lock: threading.Lock = threading.Lock()
+        self._timings: List[ComponentTiming] = []
+
+    @contextmanager
+    def measure(self, kind: str, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block and record it as a component construction.
+
+        Parameters
+        ----------
+        kind : str
+            Component category.
+        name : str
+            Component name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, time.perf_counter() - start)
+
+    def record(self, kind: str, name: str, seconds: float) -> None:
+        """
+        Record the construction time of a component.
+
+        Parameters
+        ----------
+        kind : str
+            Component category.
+        name : str
+            Component name.
+        seconds : float
+            Construction time in seconds.
+        """
+        with self._lock:
+            self._timings.append(ComponentTiming(kind, name, seconds))
+
+    @property
+    def timings(self) -> List[ComponentTiming]:
+        """
+        Get all recorded component timings.
+
+        Returns
+        -------
+        List[ComponentTiming]
+            Recorded timings in construction order.
+        """
+        with self._lock:
+            return list(self._timings)
+
+    def reset(self) -> None:
+        """
+        Clear all recorded timings.
+        """
+        with self._lock:
+            self._timings = []
@@ -1,14 +1,17 @@
 import base64
 import logging
+import struct
 import threading
 import time
-from typing import Callable, Optional
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
 
 import cv2
 import numpy as np
 from om1_utils import ws
 from om1_vlm import VideoStream
 
+from .frame_dedupe import FrameDeduplicator
 from .singleton import singleton
 
 try:
@@ -24,6 +27,286 @@ except ImportError:
 TARGET_WIDTH = 640
 TARGET_HEIGHT = 480
 
+# Stages of UnitreeCameraVideoStream.on_video
+STAGES = ("capture", "decode", "resize", "encode")
+
+# Reduced resolution decode flags, largest reduction first
+REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# JPEG start of frame markers; C4, C8 and CC share the range but are not
+# frame headers
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read the dimensions of a JPEG from its frame header, without decoding it.
+
+    Parameters
+    ----------
+    data : bytes
+        The JPEG file
+
+    Returns
+    -------
+    Optional[Tuple[int, int]]
+        (width, height), or None if data is not a JPEG
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            # fill byte
+            offset += 1
+            continue
+        if marker in _SOF_MARKERS:
+            if offset + 9 > len(data):
+                return None
+            height, width = struct.unpack(">HH", data[offset + 5 : offset + 9])
+            return width, height
+        offset += 2 + struct.unpack(">H", data[offset + 2 : offset + 4])[0]
+    return None
+
+
+def target_size(width: int, height: int) -> Tuple[int, int]:
+    """
+    Size a frame is sent at, keeping its aspect ratio. Frames that already
+    fit in TARGET_WIDTH x TARGET_HEIGHT keep their size.
+
+    Parameters
+    ----------
+    width : int
+        Width of the camera frame
+    height : int
+        Height of the camera frame
+
+    Returns
+    -------
+    Tuple[int, int]
+        (width, height) of the sent frame
+    """
+    if width <= TARGET_WIDTH and height <= TARGET_HEIGHT:
+        return width, height
+    ratio = width / height
+    if width > height:
+        return TARGET_WIDTH, int(TARGET_WIDTH / ratio)
+    return int(TARGET_HEIGHT * ratio), TARGET_HEIGHT
+
+
+def decode_flag(width: int, height: int, target: Tuple[int, int]) -> int:
+    """
+    Fastest imdecode flag that still decodes a JPEG at least at the target
+    size. libjpeg decodes at 1/2, 1/4 and 1/8 of the resolution by skipping
+    most of the inverse DCT work.
+
+    Parameters
+    ----------
+    width : int
+        Width of the JPEG
+    height : int
+        Height of the JPEG
+    target : Tuple[int, int]
+        (width, height) the frame is resized to
+
+    Returns
+    -------
+    int
+        The imdecode flag
+    """
+    for factor, flag in REDUCED_DECODE_FLAGS:
+        if -(-width // factor) >= target[0] and -(-height // factor) >= target[1]:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+class AdaptiveJpegQuality:
+    """
+    JPEG quality chosen from the measured uplink throughput.
+
+    The throughput is a moving average of the bytes per second the network
+    took while frames were waiting to be sent, see UplinkMeter. A sample
+    taken while the uplink kept up only bounds the throughput from below,
+    so it raises the estimate by smoothing instead, probing for more. When
+    an encoded frame is larger than the share of the throughput one frame
+    may use at the target fps, the quality is lowered by step; when it uses
+    less than half of it, the quality is raised by step. Until a throughput
+    is measured, the quality stays at its initial value.
+
+    Parameters
+    ----------
+    fps : float
+        Target frames per second of the uplink
+    quality : int
+        Initial JPEG quality
+    min_quality : int
+        Lowest JPEG quality
+    max_quality : int
+        Highest JPEG quality
+    step : int
+        Quality change per frame
+    headroom : float
+        Fraction of the throughput the frames may use
+    smoothing : float
+        Weight of a new throughput sample in the moving average
+    """
+
+    def __init__(
+        self,
+        fps: float,
+        quality: int = 70,
+        min_quality: int = 40,
+        max_quality: int = 70,
+        step: int = 5,
+        headroom: float = 0.8,
+        smoothing: float = 0.2,
+    ):
+        self.fps = fps
+        self.min_quality = min_quality
+        self.max_quality = max(min_quality, max_quality)
+        self.quality = min(max(quality, self.min_quality), self.max_quality)
+        self.step = step
+        self.headroom = headroom
+        self.smoothing = smoothing
+
+        self.throughput: Optional[float] = None
+
+    @property
+    def frame_budget(self) -> Optional[float]:
+        """
+        Bytes one frame may use, or None while the throughput is unknown.
+        """
+        if self.throughput is None:
+            return None
+        return self.headroom * self.throughput / self.fps
+
+    def fits(self, frame_bytes: int) -> bool:
+        """
+        Whether a frame of frame_bytes fits in the frame budget.
+        """
+        budget = self.frame_budget
+        return budget is None or frame_bytes <= budget
+
+    def record_upload(
+        self, frame_bytes: int, seconds: float, saturated: bool = True
+    ) -> None:
+        """
+        Add a throughput sample.
+
+        Parameters
+        ----------
+        frame_bytes : int
+            Number of bytes the network took
+        seconds : float
+            Time it took to send them
+        saturated : bool
+            Whether frames were waiting to be sent all along; if not, the
+            sample is only a lower bound of the throughput
+        """
+        sample = frame_bytes / max(seconds, 1e-6)
+        if saturated:
+            if self.throughput is None:
+                self.throughput = sample
+            else:
+                self.throughput += self.smoothing * (sample - self.throughput)
+        elif self.throughput is not None:
+            self.throughput = max(sample, self.throughput * (1 + self.smoothing))
+
+    def update(self, frame_bytes: int) -> int:
+        """
+        Adapt the quality to the size of the last encoded frame.
+
+        Parameters
+        ----------
+        frame_bytes : int
+            Size of the frame encoded at the current quality
+
+        Returns
+        -------
+        int
+            The quality of the next frame
+        """
+        budget = self.frame_budget
+        if budget is not None:
+            if frame_bytes > budget:
+                self.quality = max(self.min_quality, self.quality - self.step)
+            elif frame_bytes < budget / 2:
+                self.quality = min(self.max_quality, self.quality + self.step)
+        return self.quality
+
+
+class UplinkMeter:
+    """
+    Uplink throughput measured from the send queue of a websocket client.
+
+    Handing a frame to the websocket client only queues it, so the time
+    that takes says nothing about the network. Instead, the number of
+    frames still queued is read whenever a frame is sent: the frames that
+    left the queue since were taken by the network. Their bytes are summed
+    over windows of window seconds. A window is saturated when frames were
+    waiting at every send, so the network was the bottleneck all along.
+
+    Parameters
+    ----------
+    window : float
+        Number of seconds over which the drained bytes are summed
+    """
+
+    def __init__(self, window: float = 1.0):
+        self.window = window
+
+        self._queued: Deque[int] = deque()
+        self._drained = 0
+        self._saturated = True
+        self._window_start: Optional[float] = None
+
+    def record(
+        self, frame_bytes: int, pending: int, now: Optional[float] = None
+    ) -> Optional[Tuple[int, float, bool]]:
+        """
+        Account for a frame about to be queued.
+
+        Parameters
+        ----------
+        frame_bytes : int
+            Size of the frame
+        pending : int
+            Number of frames still queued before this one is added
+        now : float, optional
+            Current time
+
+        Returns
+        -------
+        Optional[Tuple[int, float, bool]]
+            Drained bytes, duration and saturation of the window that ended,
+            or None while it lasts
+        """
+        now = now if now is not None else time.perf_counter()
+        while len(self._queued) > pending:
+            self._drained += self._queued.popleft()
+        self._queued.append(frame_bytes)
+
+        if self._window_start is None:
+            self._window_start = now
+            return None
+        self._saturated = self._saturated and pending > 0
+        elapsed = now - self._window_start
+        if elapsed < self.window:
+            return None
+
+        sample = (self._drained, elapsed, self._saturated)
+        self._drained = 0
+        self._saturated = True
+        self._window_start = now
+        return sample
+
 
 class UnitreeCameraVideoStream(VideoStream):
     """
@@ -31,14 +314,143 @@ class UnitreeCameraVideoStream(VideoStream):
 
     This class extends the VideoStream class to handle Unitree camera-specific
     video streaming and processing.
+
+    Frames larger than the target size are decoded at the smallest reduced
+    resolution that still covers it, so little is left for the resize.
+    Frames that already fit are passed through without being decoded and
+    encoded again, as long as they fit in the frame budget of the uplink.
+    The JPEG quality follows the uplink throughput reported through
+    record_upload(). The time spent in every stage is accumulated in
+    stage_seconds and the per frame averages are logged every report_every
+    frames.
+
+    Parameters
+    ----------
+    frame_callback : Callable[[str], None], optional
+        Receives the base64 encoded JPEG frames
+    fps : int
+        Frames per second
+    min_jpeg_quality : int
+        Lowest JPEG quality on a slow uplink
+    max_jpeg_quality : int
+        Highest JPEG quality on a fast uplink
+    report_every : int
+        Number of frames between two timing log lines
     """
 
-    def __init__(self, frame_callback=None, fps=30):
+    def __init__(
+        self,
+        frame_callback=None,
+        fps=30,
+        min_jpeg_quality: int = 40,
+        max_jpeg_quality: int = 70,
+        report_every: int = 300,
+    ):
         super().__init__(frame_callback, fps)
 
+        self.quality = AdaptiveJpegQuality(
+            fps, min_quality=min_jpeg_quality, max_quality=max_jpeg_quality
+        )
+        self.report_every = report_every
+
+        # Stage metrics
+        self.frames = 0
+        self.passed_through = 0
+        self.stage_seconds: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+
         self.video_client = VideoClient()
         self.video_client.Init()
 
+    def record_upload(
+        self, frame_bytes: int, seconds: float, saturated: bool = True
+    ) -> None:
+        """
+        Report the measured uplink throughput to adapt the JPEG quality.
+
+        Parameters
+        ----------
+        frame_bytes : int
+            Number of bytes the network took
+        seconds : float
+            Time it took to send them
+        saturated : bool
+            Whether frames were waiting to be sent all along
+        """
+        self.quality.record_upload(frame_bytes, seconds, saturated)
+
+    def process_frame(self, data: bytes) -> Optional[str]:
+        """
+        Shrink a camera JPEG to the target size and encode it to base64.
+
+        Parameters
+        ----------
+        data : bytes
+            The JPEG from the camera
+
+        Returns
+        -------
+        Optional[str]
+            The base64 encoded JPEG, or None if data cannot be decoded
+        """
+        start = time.perf_counter()
+        self.frames += 1
+        size = jpeg_size(data)
+        if size is not None:
+            target = target_size(*size)
+            if target == size and self.quality.fits(len(data)):
+                frame_data = base64.b64encode(data).decode("utf-8")
+                self.stage_seconds["encode"] += time.perf_counter() - start
+                self.passed_through += 1
+                return frame_data
+            flags = decode_flag(*size, target)
+        else:
+            flags = cv2.IMREAD_COLOR
+
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags)
+        decoded = time.perf_counter()
+        self.stage_seconds["decode"] += decoded - start
+        if image is None:
+            return None
+
+        height, width = image.shape[:2]
+        if size is None:
+            target = target_size(width, height)
+        if (width, height) != target:
+            image = cv2.resize(image, target, interpolation=cv2.INTER_AREA)
+        resized = time.perf_counter()
+
+        _, buffer = cv2.imencode(
+            ".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.quality.quality]
+        )
+        self.quality.update(len(buffer))
+        frame_data = base64.b64encode(buffer).decode("utf-8")
+
+        self.stage_seconds["resize"] += resized - decoded
+        self.stage_seconds["encode"] += time.perf_counter() - resized
+        return frame_data
+
+    def stage_milliseconds(self) -> Dict[str, float]:
+        """
+        Average milliseconds per frame spent in every stage.
+        """
+        frames = max(self.frames, 1)
+        return {
+            stage: 1000 * seconds / frames
+            for stage, seconds in self.stage_seconds.items()
+        }
+
+    def timings_summary(self) -> str:
+        """
+        One line summary of the stage timings.
+        """
+        stages = ", ".join(
+            f"{stage} {ms:.1f} ms" for stage, ms in self.stage_milliseconds().items()
+        )
+        return (
+            f"{stages} per frame, {self.passed_through} of {self.frames} frames "
+            f"passed through, JPEG quality {self.quality.quality}"
+        )
+
     def on_video(self):
         """
         Main video capture and processing loop for Unitree cameras.
@@ -49,38 +461,21 @@ class UnitreeCameraVideoStream(VideoStream):
         logging.info("Starting Unitree Camera Video Stream")
         while self.running:
             try:
+                start = time.perf_counter()
                 code, data = self.video_client.GetImageSample()
+                self.stage_seconds["capture"] += time.perf_counter() - start
 
                 if code == 0:
-                    # Convert to numpy image
-                    image_data = np.frombuffer(bytes(data), dtype=np.uint8)
-                    image = cv2.imdecode(image_data, cv2.IMREAD_COLOR)
-
-                    if image is not None:
-                        # Calculate new dimensions maintaining aspect ratio
-                        height, width = image.shape[:2]
-                        ratio = width / height
-
-                        if width > height:
-                            new_width = TARGET_WIDTH
-                            new_height = int(TARGET_WIDTH / ratio)
-                        else:
-                            new_height = TARGET_HEIGHT
-                            new_width = int(TARGET_HEIGHT * ratio)
-
-                        # Resize image
-                        resized_image = cv2.resize(
-                            image, (new_width, new_height), interpolation=cv2.INTER_AREA
+                    frame_data = self.process_frame(bytes(data))
+                    if self.frames % self.report_every == 0:
+                        logging.info(
+                            f"Unitree Camera Video Stream: {self.timings_summary()}"
                         )
-                        _, buffer = cv2.imencode(
-                            ".jpg", resized_image, [cv2.IMWRITE_JPEG_QUALITY, 70]
-                        )
-                        frame_data = base64.b64encode(buffer).decode("utf-8")
 
-                        if self.frame_callback:
-                            self.frame_callback(frame_data)
-                    else:
+                    if frame_data is None:
                         logging.warning("Failed to decode image")
+                    elif self.frame_callback:
+                        self.frame_callback(frame_data)
                 else:
                     logging.error(f"Failed to get image sample, code: {code}")
 
@@ -109,9 +504,30 @@ class UnitreeCameraVLMProvider:
          The websocket URL for the VLM service connection.
      fps : int
          Frames per second for the video stream.
+     dedupe_distance : int
+         Maximum perceptual hash distance of a frame to the last sent one
+         for it to be dropped as a duplicate; negative sends every frame.
+     dedupe_interval : float
+         Maximum number of seconds between two frames sent to the service.
+     min_jpeg_quality : int
+         Lowest JPEG quality of the frames on a slow uplink.
+     max_jpeg_quality : int
+         Highest JPEG quality of the frames on a fast uplink.
+     uplink_window : float
+         Number of seconds over which the uplink throughput is measured,
+         see UplinkMeter.
     """
 
-    def __init__(self, ws_url: str, fps: int = 30):
+    def __init__(
+        self,
+        ws_url: str,
+        fps: int = 30,
+        dedupe_distance: int = 6,
+        dedupe_interval: float = 10.0,
+        min_jpeg_quality: int = 40,
+        max_jpeg_quality: int = 70,
+        uplink_window: float = 1.0,
+    ):
         """
         Initialize the VLM Provider.
 
@@ -122,11 +538,55 @@ class UnitreeCameraVLMProvider:
         """
         self.running: bool = False
         self.ws_client: ws.Client = ws.Client(url=ws_url)
+        self.frame_filter = FrameDeduplicator(
+            "Unitree Camera VLM",
+            max_distance=dedupe_distance,
+            refresh_interval=dedupe_interval,
+        )
         self.video_stream: VideoStream = UnitreeCameraVideoStream(
-            self.ws_client.send_message, fps=fps
+            self._send_frame,
+            fps=fps,
+            min_jpeg_quality=min_jpeg_quality,
+            max_jpeg_quality=max_jpeg_quality,
         )
+        self.uplink = UplinkMeter(window=uplink_window)
         self._thread: Optional[threading.Thread] = None
 
+    def _send_frame(self, frame: str):
+        """
+        Send a video frame to the VLM service, unless it duplicates the
+        last sent frame. The throughput measured from the send queue of the
+        websocket client is reported back to the video stream, which adapts
+        the JPEG quality to the uplink. A client that does not expose its
+        queue leaves the quality at its initial value.
+
+        Parameters
+        ----------
+        frame : str
+            The base64 encoded video frame.
+        """
+        if self.frame_filter.should_send(frame):
+            pending = self._pending_frames()
+            if pending is not None:
+                sample = self.uplink.record(len(frame), pending)
+                if sample is not None:
+                    self.video_stream.record_upload(*sample)
+            self.ws_client.send_message(frame)
+
+    def _pending_frames(self) -> Optional[int]:
+        """
+        Number of messages waiting in the send queue of the websocket
+        client, or None if the client does not expose it.
+        """
+        queue = getattr(self.ws_client, "message_queue", None)
+        qsize = getattr(queue, "qsize", None)
+        if not callable(qsize):
+            return None
+        try:
+            return int(qsize())
+        except (TypeError, ValueError):
+            return None
+
     def register_message_callback(self, message_callback: Optional[Callable]):
         """
         Register a callback for processing VLM results.
@@ -150,6 +610,11 @@ class UnitreeCameraVLMProvider:
 
         self.running = True
         self.ws_client.start()
+        if self._pending_frames() is None:
+            logging.warning(
+                "Unitree Camera VLM: the websocket client does not expose its "
+                "send queue, the JPEG quality will not adapt to the uplink"
+            )
         self.video_stream.start()
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
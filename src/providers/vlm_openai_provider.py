@@ -5,7 +5,11 @@ from typing import Callable, Optional
 
 from om1_vlm import VideoStream
 from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
 
+from .caption_cache import CaptionCache, frame_signature
+from .frame_dedupe import FrameDeduplicator, decode_frame
+from .frame_window import LatestFrameWindow
 from .singleton import singleton
 
 
@@ -24,9 +28,36 @@ class VLMOpenAIProvider:
          Configuration for the LLM service.
      fps : int
          Frames per second for the video stream.
+     dedupe_distance : int
+         Maximum perceptual hash distance of a frame to the last sent one
+         for it to be dropped as a duplicate; negative sends every frame.
+     dedupe_interval : float
+         Maximum number of seconds between two frames sent to the API.
+     max_in_flight : int
+         Maximum number of concurrent API requests. While the requests are
+         in flight, only the newest frame is kept, see LatestFrameWindow.
+     caption_cache_size : int
+         Number of replies kept to answer similar frames without an API
+         call, see CaptionCache; 0 disables the cache.
+     caption_cache_max_age : float
+         Maximum age in seconds of a reply served from the cache. Frames
+         sent to refresh a static scene are never answered from the cache.
+     caption_cache_path : str, optional
+         JSON file the cached replies are persisted to.
     """
 
-    def __init__(self, base_url: str, api_key: str, fps: int = 10):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        fps: int = 10,
+        dedupe_distance: int = 6,
+        dedupe_interval: float = 10.0,
+        max_in_flight: int = 1,
+        caption_cache_size: int = 1000,
+        caption_cache_max_age: float = 600.0,
+        caption_cache_path: Optional[str] = None,
+    ):
         """
         Initialize the VLM Provider.
 
@@ -40,6 +71,25 @@ class VLMOpenAIProvider:
         self.video_stream: VideoStream = VideoStream(
             frame_callback=self._process_frame, fps=fps
         )
+        self.frame_filter = FrameDeduplicator(
+            "VLM OpenAI",
+            max_distance=dedupe_distance,
+            refresh_interval=dedupe_interval,
+        )
+        self.frame_window = LatestFrameWindow(
+            "VLM OpenAI",
+            self._request,
+            self._deliver,
+            max_in_flight=max_in_flight,
+        )
+        self.caption_cache: Optional[CaptionCache] = None
+        if caption_cache_size > 0:
+            self.caption_cache = CaptionCache(
+                "VLM OpenAI",
+                max_entries=caption_cache_size,
+                max_age=caption_cache_max_age,
+                path=caption_cache_path,
+            )
         self._thread: Optional[threading.Thread] = None
         self.message_callback: Optional[Callable] = None
         logging.info("VLM OpenAI Provider initialized")
@@ -53,6 +103,38 @@ class VLMOpenAIProvider:
         frame : str
             The base64 encoded video frame to process.
         """
+        await self.frame_window.submit(frame)
+
+    async def _request(self, frame: str):
+        """
+        Send a video frame to the API, unless it duplicates the last sent
+        frame or the reply to a similar frame is cached.
+
+        Parameters
+        ----------
+        frame : str
+            The base64 encoded video frame to process.
+
+        Returns
+        -------
+        ChatCompletion or None
+            The response, or None if the frame was not sent or failed.
+        """
+        if not self.frame_filter.should_send(frame):
+            return None
+
+        signature = None
+        if self.caption_cache is not None:
+            image = decode_frame(frame, color=True)
+            if image is not None:
+                signature = frame_signature(image)
+                # a refresh of a static scene must reach the API
+                cached = None
+                if self.frame_filter.last_reason != "refresh":
+                    cached = self.caption_cache.lookup(signature)
+                if cached is not None:
+                    return ChatCompletion.model_validate(cached)
+
         processing_start = time.perf_counter()
         try:
             response = await self.api_client.chat.completions.create(
@@ -76,11 +158,25 @@ class VLMOpenAIProvider:
             )
             processing_latency = time.perf_counter() - processing_start
             logging.debug(f"Processing latency: {processing_latency:.3f} seconds")
+            if signature is not None:
+                self.caption_cache.store(signature, response.model_dump(mode="json"))
             logging.debug(f"OpenAI LLM VLM Response: {response}")
-            if self.message_callback:
-                self.message_callback(response)
+            return response
         except Exception as e:
             logging.error(f"Error processing frame: {e}")
+            return None
+
+    def _deliver(self, response):
+        """
+        Pass a response to the registered callback.
+
+        Parameters
+        ----------
+        response : ChatCompletion
+            The response to the newest answered frame.
+        """
+        if self.message_callback:
+            self.message_callback(response)
 
     def register_message_callback(self, message_callback: Optional[Callable]):
         """
@@ -132,3 +228,5 @@ class VLMOpenAIProvider:
         if self._thread:
             self.video_stream.stop()
             self._thread.join(timeout=5)
+        if self.caption_cache is not None:
+            self.caption_cache.save()
@@ -6,6 +6,7 @@ from typing import Callable, Optional
 from om1_utils import ws
 from om1_vlm import VideoStream
 
+from .frame_dedupe import FrameDeduplicator
 from .singleton import singleton
 
 
@@ -24,9 +25,20 @@ class VLMVilaProvider:
          The websocket URL for the ASR service connection.
      fps : int
          Frames per second for the video stream.
+     dedupe_distance : int
+         Maximum perceptual hash distance of a frame to the last sent one
+         for it to be dropped as a duplicate; negative sends every frame.
+     dedupe_interval : float
+         Maximum number of seconds between two frames sent to the service.
     """
 
-    def __init__(self, ws_url: str, fps: int = 30):
+    def __init__(
+        self,
+        ws_url: str,
+        fps: int = 30,
+        dedupe_distance: int = 6,
+        dedupe_interval: float = 10.0,
+    ):
         """
         Initialize the VLM Provider.
 
@@ -37,11 +49,27 @@ class VLMVilaProvider:
         """
         self.running: bool = False
         self.ws_client: ws.Client = ws.Client(url=ws_url)
-        self.video_stream: VideoStream = VideoStream(
-            self.ws_client.send_message, fps=fps
+        self.frame_filter = FrameDeduplicator(
+            "VLM Vila",
+            max_distance=dedupe_distance,
+            refresh_interval=dedupe_interval,
         )
+        self.video_stream: VideoStream = VideoStream(self._send_frame, fps=fps)
         self._thread: Optional[threading.Thread] = None
 
+    def _send_frame(self, frame: str):
+        """
+        Send a video frame to the VLM service, unless it duplicates the
+        last sent frame.
+
+        Parameters
+        ----------
+        frame : str
+            The base64 encoded video frame.
+        """
+        if self.frame_filter.should_send(frame):
+            self.ws_client.send_message(frame)
+
     def register_message_callback(self, message_callback: Optional[Callable]):
         """
         Register a callback for processing VLM results.
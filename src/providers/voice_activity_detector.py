@@ -0,0 +1,208 @@
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Optional, Tuple
+
+import numpy as np
+
+from .audio_encoder import decode_audio_chunk
+
+
+class VoiceActivityDetector:
+    """
+    Lightweight energy and zero-crossing voice activity detector.
+
+    Sits between the microphone stream and the ASR websocket and forwards only
+    audio chunks that belong to speech. A chunk counts as speech when its RMS
+    energy is well above the tracked noise floor and its zero-crossing rate is
+    below that of broadband noise such as fans or hiss. The chunks just before
+    the onset of speech are kept in a pre-roll buffer and sent along with it,
+    and sending continues for a hangover period after the last speech chunk so
+    that word onsets and trailing syllables are not clipped.
+
+    The noise floor follows the background only outside of speech, so a
+    step up in loud, tonal background noise such as a motor would be taken
+    for endless speech. When speech has lasted max_speech seconds, the noise
+    floor is therefore re-estimated from the quietest chunk of the segment,
+    which is the background level between words of real speech.
+
+    Audio chunks may be raw 16-bit PCM bytes or, as produced by the audio
+    input stream, JSON messages with base64 encoded PCM in an "audio" field
+    and an optional "rate" field. Messages without audio are forwarded
+    unchanged.
+
+    Parameters
+    ----------
+    send : Callable[..., None]
+        Callback that receives every forwarded chunk, unchanged
+    sample_rate : int
+        Sample rate of chunks that do not carry a "rate" field
+    energy_threshold : float
+        Minimum RMS energy of speech, relative to full scale
+    energy_ratio : float
+        Minimum ratio between the RMS energy of speech and the noise floor
+    max_zero_crossing_rate : float
+        Maximum fraction of sign changes between samples in speech
+    hangover : float
+        Seconds of audio forwarded after the last speech chunk
+    pre_roll : float
+        Seconds of audio before the speech onset that are forwarded with it
+    max_speech : float
+        Seconds of continuous speech after which the noise floor is
+        re-estimated
+    on_speech_end : Callable[[], None], optional
+        Called when the hangover after the last speech chunk has expired
+    pass_decoded : bool
+        Also pass the decoded samples of every chunk to send, as returned by
+        decode_audio_chunk, so an encoder does not decode the chunk again
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Any], None],
+        sample_rate: int = 16000,
+        energy_threshold: float = 0.01,
+        energy_ratio: float = 3.0,
+        max_zero_crossing_rate: float = 0.35,
+        hangover: float = 0.5,
+        pre_roll: float = 0.3,
+        max_speech: float = 10.0,
+        on_speech_end: Optional[Callable[[], None]] = None,
+        pass_decoded: bool = False,
+    ):
+        self.send = send
+        self.sample_rate = sample_rate
+        self.energy_threshold = energy_threshold
+        self.energy_ratio = energy_ratio
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.hangover = hangover
+        self.pre_roll = pre_roll
+        self.max_speech = max_speech
+        self.on_speech_end = on_speech_end
+        self.pass_decoded = pass_decoded
+
+        # True while speech chunks are being forwarded
+        self.in_speech = False
+
+        # Chunk counters, to measure how much audio stays off the uplink
+        self.forwarded_chunks = 0
+        self.dropped_chunks = 0
+
+        self._noise_floor = energy_threshold / energy_ratio
+        self._hangover_left = 0.0
+        self._speech_duration = 0.0
+        self._speech_min_energy = float("inf")
+        self._pre_roll_buffer: Deque[Tuple[Any, Any, float]] = deque()
+        self._pre_roll_duration = 0.0
+
+    def __call__(self, chunk: Any) -> None:
+        """
+        Process one audio chunk, forwarding it if it belongs to speech.
+
+        Parameters
+        ----------
+        chunk : Any
+            Raw PCM bytes or a JSON message with base64 encoded audio
+        """
+        decoded = decode_audio_chunk(chunk, self.sample_rate)
+        if decoded is None:
+            self._forward(chunk, None)
+            return
+
+        samples, rate, _ = decoded
+        if len(samples) == 0:
+            return
+        duration = len(samples) / rate
+
+        speech = self.is_speech(samples)
+        if self.in_speech:
+            self._speech_duration += duration
+            if self._speech_duration >= self.max_speech:
+                self._reestimate_noise_floor()
+
+        if speech:
+            if not self.in_speech:
+                logging.debug("VAD: speech started")
+                self._flush_pre_roll()
+                self._speech_duration = 0.0
+                self._speech_min_energy = float("inf")
+            self.in_speech = True
+            self._hangover_left = self.hangover
+            self._forward(chunk, decoded)
+            return
+
+        if self.in_speech:
+            self._hangover_left -= duration
+            if self._hangover_left > 0:
+                self._forward(chunk, decoded)
+                return
+            logging.debug("VAD: speech ended")
+            self.in_speech = False
+            if self.on_speech_end is not None:
+                self.on_speech_end()
+
+        self._buffer_pre_roll(chunk, decoded, duration)
+
+    def is_speech(self, samples: np.ndarray) -> bool:
+        """
+        Classify a chunk of samples and update the noise floor.
+
+        Parameters
+        ----------
+        samples : np.ndarray
+            16-bit PCM samples of one chunk
+
+        Returns
+        -------
+        bool
+            True if the chunk contains speech
+        """
+        audio = samples.astype(np.float32) / 32768.0
+        energy = float(np.sqrt(np.mean(audio * audio)))
+        signs = np.signbit(audio)
+        zero_crossing_rate = float(np.count_nonzero(signs[1:] != signs[:-1])) / max(
+            len(audio) - 1, 1
+        )
+
+        threshold = max(self.energy_threshold, self._noise_floor * self.energy_ratio)
+        speech = (
+            energy > threshold and zero_crossing_rate <= self.max_zero_crossing_rate
+        )
+
+        if self.in_speech:
+            self._speech_min_energy = min(self._speech_min_energy, energy)
+        elif not speech:
+            # slowly follow the background level while nobody is talking
+            self._noise_floor = 0.95 * self._noise_floor + 0.05 * energy
+
+        return speech
+
+    def _reestimate_noise_floor(self) -> None:
+        if self._speech_min_energy > self._noise_floor:
+            logging.info(
+                f"VAD: speech lasted {self._speech_duration:.1f} s, raising the "
+                f"noise floor to {self._speech_min_energy:.4f}"
+            )
+            self._noise_floor = self._speech_min_energy
+        self._speech_duration = 0.0
+        self._speech_min_energy = float("inf")
+
+    def _forward(self, chunk: Any, decoded: Any) -> None:
+        self.forwarded_chunks += 1
+        if self.pass_decoded:
+            self.send(chunk, decoded)
+        else:
+            self.send(chunk)
+
+    def _buffer_pre_roll(self, chunk: Any, decoded: Any, duration: float) -> None:
+        self._pre_roll_buffer.append((chunk, decoded, duration))
+        self._pre_roll_duration += duration
+        while self._pre_roll_duration > self.pre_roll and self._pre_roll_buffer:
+            _, _, dropped_duration = self._pre_roll_buffer.popleft()
+            self._pre_roll_duration -= dropped_duration
+            self.dropped_chunks += 1
+
+    def _flush_pre_roll(self) -> None:
+        while self._pre_roll_buffer:
+            chunk, decoded, _ = self._pre_roll_buffer.popleft()
+            self._forward(chunk, decoded)
+        self._pre_roll_duration = 0.0
@@ -6,6 +6,7 @@ import typer
 
 from runtime.config import load_config
 from runtime.cortex import CortexRuntime
+from runtime.profiler import profile_startup
 
 app = typer.Typer()
 
@@ -22,6 +23,20 @@ def start(config_name: str, debug: bool = False) -> None:
     asyncio.run(runtime.run())
 
 
+@app.command()
+def profile(
+    config_name: str,
+    output: str = "startup_profile.json",
+    timeout: float = 120.0,
+    debug: bool = False,
+) -> None:
+    logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+    # Load the configuration and run until the first tick, reporting the
+    # import, construction and first tick times
+    profile_startup(config_name, output, timeout)
+
+
 if __name__ == "__main__":
     dotenv.load_dotenv()
     app()
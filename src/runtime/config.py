@@ -10,6 +10,7 @@ from inputs import load_input
 from inputs.base import Sensor, SensorConfig
 from llm import LLM, LLMConfig, load_llm
 from llm.output_model import CortexOutputModel
+from providers.startup_profile_provider import StartupProfileProvider
 from runtime.robotics import load_unitree
 from simulators import load_simulator
 from simulators.base import Simulator, SimulatorConfig
@@ -81,33 +82,49 @@ def load_config(config_name: str) -> RuntimeConfig:
             "No global API key found in the configuration. Rate limits may apply."
         )
 
-    parsed_config = {
-        **raw_config,
-        "agent_inputs": [
-            load_input(input["type"])(
-                config=SensorConfig(
-                    **add_api_key(input.get("config", {}), global_api_key)
+    startup_profile = StartupProfileProvider()
+
+    agent_inputs = []
+    for input in raw_config.get("agent_inputs", []):
+        input_class = load_input(input["type"])
+        with startup_profile.measure("input", input["type"]):
+            agent_inputs.append(
+                input_class(
+                    config=SensorConfig(
+                        **add_api_key(input.get("config", {}), global_api_key)
+                    )
                 )
             )
-            for input in raw_config.get("agent_inputs", [])
-        ],
-        "cortex_llm": load_llm(raw_config["cortex_llm"]["type"])(
+
+    llm_class = load_llm(raw_config["cortex_llm"]["type"])
+    with startup_profile.measure("llm", raw_config["cortex_llm"]["type"]):
+        cortex_llm = llm_class(
             config=LLMConfig(
                 **add_api_key(
                     raw_config["cortex_llm"].get("config", {}), global_api_key
                 )
             ),
             output_model=CortexOutputModel,
-        ),
-        "simulators": [
-            load_simulator(simulator["type"])(
-                config=SimulatorConfig(
-                    name=simulator["type"],
-                    **add_api_key(simulator.get("config", {}), global_api_key),
+        )
+
+    simulators = []
+    for simulator in raw_config.get("simulators", []):
+        simulator_class = load_simulator(simulator["type"])
+        with startup_profile.measure("simulator", simulator["type"]):
+            simulators.append(
+                simulator_class(
+                    config=SimulatorConfig(
+                        name=simulator["type"],
+                        **add_api_key(simulator.get("config", {}), global_api_key),
+                    )
                 )
             )
-            for simulator in raw_config.get("simulators", [])
-        ],
+
+    parsed_config = {
+        **raw_config,
+        "agent_inputs": agent_inputs,
+        "cortex_llm": cortex_llm,
+        "simulators": simulators,
         "agent_actions": [
             load_action(
                 {
@@ -104,8 +104,9 @@ class CortexRuntime:
         while True:
             if not self.sleep_ticker_provider.skip_sleep:
                 await self.sleep_ticker_provider.sleep(1 / self.config.hertz)
-            await self._tick()
+            # reset before the tick, so a wake-up requested during it is kept
             self.sleep_ticker_provider.skip_sleep = False
+            await self._tick()
 
     async def _tick(self) -> None:
         """
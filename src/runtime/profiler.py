@@ -0,0 +1,302 @@
+import asyncio
+import importlib.abc
+import json
+import logging
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from providers.startup_profile_provider import StartupProfileProvider
+
+
+@dataclass
+class ImportRecord:
+    """
+    Timing of a single module import.
+
+    Parameters
+    ----------
+    module : str
+        Fully qualified module name.
+    parent : str, optional
+        Module whose import triggered this one, None for top-level imports.
+    cumulative_s : float
+        Time spent importing the module including its own imports.
+    self_s : float
+        Time spent importing the module excluding its own imports.
+    """
+
+    module: str
+    parent: Optional[str]
+    cumulative_s: float
+    self_s: float
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """
+    Loader proxy that reports module creation and execution to an ImportProfiler.
+    """
+
+    def __init__(self, loader: importlib.abc.Loader, profiler: "ImportProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        self._profiler._enter(spec.name)
+        try:
+            return self._loader.create_module(spec)
+        except BaseException:
+            self._profiler._exit(spec.name)
+            raise
+
+    def exec_module(self, module):
+        # hide the proxy from the module itself
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(module.__name__)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """
+    Records an import-time tree while active.
+
+    Installs itself at the front of sys.meta_path, delegates finding to the
+    remaining finders and wraps the returned loaders to time module creation
+    and execution. Imports are tracked per thread.
+    """
+
+    def __init__(self):
+        self.records: List[ImportRecord] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __enter__(self) -> "ImportProfiler":
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if (
+            spec.loader is None
+            or spec.origin in ("built-in", "frozen")
+            or not hasattr(spec.loader, "exec_module")
+        ):
+            return spec
+
+        spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _enter(self, module: str) -> None:
+        # [module, start time, time spent in nested imports]
+        self._stack().append([module, time.perf_counter(), 0.0])
+
+    def _exit(self, module: str) -> None:
+        stack = self._stack()
+        if not stack or stack[-1][0] != module:
+            return
+        _, start, children = stack.pop()
+        cumulative = time.perf_counter() - start
+        if stack:
+            stack[-1][2] += cumulative
+        with self._lock:
+            self.records.append(
+                ImportRecord(
+                    module=module,
+                    parent=stack[-1][0] if stack else None,
+                    cumulative_s=cumulative,
+                    self_s=cumulative - children,
+                )
+            )
+
+    def format_tree(self, min_seconds: float = 0.005) -> str:
+        """
+        Format the import tree, hiding imports faster than min_seconds.
+
+        Parameters
+        ----------
+        min_seconds : float
+            Cumulative import time below which a module and its children
+            are omitted.
+
+        Returns
+        -------
+        str
+            Indented tree of imports, slowest first at each level.
+        """
+        children: Dict[Optional[str], List[ImportRecord]] = {}
+        for record in self.records:
+            children.setdefault(record.parent, []).append(record)
+
+        lines = []
+
+        def add(parent: Optional[str], depth: int):
+            for record in sorted(
+                children.get(parent, []), key=lambda r: r.cumulative_s, reverse=True
+            ):
+                if record.cumulative_s < min_seconds:
+                    continue
+                lines.append(
+                    f"{record.cumulative_s * 1000:10.1f} ms {record.self_s * 1000:10.1f} ms  "
+                    f"{'  ' * depth}{record.module}"
+                )
+                add(record.module, depth + 1)
+
+        add(None, 0)
+        header = f"{'cumulative':>13} {'self':>13}  module"
+        return "\n".join([header] + lines)
+
+
+async def _run_until_first_tick(runtime, timeout: float) -> Optional[float]:
+    """
+    Run the runtime until its first cortex tick completes.
+
+    Parameters
+    ----------
+    runtime : CortexRuntime
+        The runtime to run.
+    timeout : float
+        Maximum number of seconds to wait for the first tick.
+
+    Returns
+    -------
+    float or None
+        perf_counter() timestamp of the first completed tick, or None on timeout.
+    """
+    first_tick = asyncio.Event()
+    tick = runtime._tick
+
+    first_tick_time = None
+
+    async def timed_tick():
+        nonlocal first_tick_time
+        await tick()
+        if first_tick_time is None:
+            first_tick_time = time.perf_counter()
+            first_tick.set()
+
+    runtime._tick = timed_tick
+
+    run_task = asyncio.create_task(runtime.run())
+    tick_task = asyncio.create_task(first_tick.wait())
+    await asyncio.wait(
+        {run_task, tick_task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+    )
+    ticked = first_tick.is_set()
+
+    for task in (run_task, tick_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logging.error(f"Runtime failed before the first tick: {e}")
+
+    if not ticked:
+        logging.warning(f"No cortex tick completed within {timeout} seconds")
+        return None
+    return first_tick_time
+
+
+def profile_startup(config_name: str, output_path: str, timeout: float) -> Dict:
+    """
+    Load a configuration and report where the startup time goes.
+
+    Records an import-time tree while the config is loaded, the construction
+    time of every input, LLM, simulator, action implementation and connector,
+    and the time until the first cortex tick completes. Prints a sorted table
+    and writes the full report as JSON.
+
+    Parameters
+    ----------
+    config_name : str
+        Name of the configuration file (without .json extension).
+    output_path : str
+        Path of the JSON report.
+    timeout : float
+        Maximum number of seconds to wait for the first tick.
+
+    Returns
+    -------
+    Dict
+        The report that was written to output_path.
+    """
+    from runtime.config import load_config
+    from runtime.cortex import CortexRuntime
+
+    startup_profile = StartupProfileProvider()
+    startup_profile.reset()
+
+    start = time.perf_counter()
+    with ImportProfiler() as import_profiler:
+        config = load_config(config_name)
+        config_loaded = time.perf_counter()
+        runtime = CortexRuntime(config)
+    first_tick = asyncio.run(_run_until_first_tick(runtime, timeout))
+
+    components = [
+        {"kind": t.kind, "name": t.name, "seconds": t.seconds}
+        for t in startup_profile.timings
+    ]
+    import_seconds = sum(
+        r.cumulative_s for r in import_profiler.records if r.parent is None
+    )
+
+    summary = [
+        {"kind": "startup", "name": "imports", "seconds": import_seconds},
+        {"kind": "startup", "name": "load_config", "seconds": config_loaded - start},
+        {
+            "kind": "startup",
+            "name": "first_tick",
+            "seconds": None if first_tick is None else first_tick - start,
+        },
+    ]
+
+    print(import_profiler.format_tree())
+    print()
+    print(f"{'seconds':>10}  {'kind':<22} name")
+    rows = sorted(
+        summary + components,
+        key=lambda row: -1 if row["seconds"] is None else row["seconds"],
+        reverse=True,
+    )
+    for row in rows:
+        seconds = "timeout" if row["seconds"] is None else f"{row['seconds']:.3f}"
+        print(f"{seconds:>10}  {row['kind']:<22} {row['name']}")
+
+    report = {
+        "config": config_name,
+        "summary": summary,
+        "components": components,
+        "imports": [asdict(r) for r in import_profiler.records],
+    }
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2)
+    logging.info(f"Startup profile written to {output_path}")
+
+    return report
@@ -8,11 +8,20 @@ from simulators.base import Simulator, SimulatorConfig
 
 __all__ = ["Simulator", "SimulatorConfig", "load_simulator"]
 
+# Maps simulator class names to the module in simulators/plugins that defines
+# them, so only the requested simulator is imported.
+SIMULATOR_PLUGINS: T.Dict[str, str] = {
+    "WebSim": "WebSim",
+}
+
 
 def load_simulator(sim_type: str) -> T.Type[Simulator]:
     """
     Load a simulator from the simulators directory.
 
+    Simulators listed in SIMULATOR_PLUGINS are imported directly. Any other name
+    falls back to importing every module in the plugins directory.
+
     Parameters
     ----------
     sim_type : str
@@ -23,6 +32,14 @@ def load_simulator(sim_type: str) -> T.Type[Simulator]:
     T.Type[Simulator]
         An instance of the simulator.
     """
+    if sim_type in SIMULATOR_PLUGINS:
+        module = importlib.import_module(
+            f"simulators.plugins.{SIMULATOR_PLUGINS[sim_type]}"
+        )
+        simulator_class = getattr(module, sim_type, None)
+        if inspect.isclass(simulator_class) and issubclass(simulator_class, Simulator):
+            return simulator_class
+
     # Get all files in plugins directory
     plugins_dir = os.path.join(os.path.dirname(__file__), "plugins")
     plugin_files = [f[:-3] for f in os.listdir(plugins_dir) if f.endswith(".py")]
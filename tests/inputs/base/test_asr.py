@@ -1,9 +1,11 @@
+import asyncio
 import json
 from unittest.mock import Mock, patch
 
 import pytest
 
-from inputs.plugins.asr import ASRInput
+from inputs.base import Message
+from inputs.plugins.asr import SPEECH_END, ASRInput
 
 
 @pytest.fixture
@@ -26,12 +28,15 @@ def asr_input(mock_asr_provider, mock_sleep_ticker):
 
 
 def test_init(asr_input, mock_asr_provider):
-    assert asr_input.messages == []
+    assert len(asr_input.messages) == 0
     assert asr_input.message_buffer.empty()
     mock_asr_provider.start.assert_called_once()
     mock_asr_provider.register_message_callback.assert_called_once_with(
         asr_input._handle_asr_message
     )
+    mock_asr_provider.register_speech_end_callback.assert_called_once_with(
+        asr_input._handle_speech_end
+    )
 
 
 def test_handle_asr_message(asr_input):
@@ -40,6 +45,24 @@ def test_handle_asr_message(asr_input):
     assert asr_input.message_buffer.get_nowait() == "test speech"
 
 
+def test_partial_hypothesis_is_held_back(asr_input):
+    asr_input._handle_asr_message(json.dumps({"asr_reply": "hel", "is_final": False}))
+    assert asr_input.message_buffer.empty()
+
+
+def test_handle_end_of_utterance(asr_input):
+    asr_input._handle_asr_message(
+        json.dumps({"asr_reply": "hello", "end_of_utterance": True})
+    )
+    assert asr_input.message_buffer.get_nowait() == "hello"
+    assert asr_input.message_buffer.get_nowait() is None
+
+
+def test_handle_speech_end(asr_input):
+    asr_input._handle_speech_end()
+    assert asr_input.message_buffer.get_nowait() == SPEECH_END
+
+
 def test_handle_invalid_json(asr_input):
     invalid_json = "invalid json"
     asr_input._handle_asr_message(invalid_json)
@@ -49,13 +72,21 @@ def test_handle_invalid_json(asr_input):
 @pytest.mark.asyncio
 async def test_poll_with_message(asr_input):
     test_message = "test message"
-    asr_input.message_buffer.put(test_message)
+    asr_input.message_buffer.put_nowait(test_message)
     result = await asr_input._poll()
     assert result == test_message
 
 
 @pytest.mark.asyncio
 async def test_poll_empty_queue(asr_input):
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(asr_input._poll(), timeout=0.1)
+
+
+@pytest.mark.asyncio
+async def test_poll_silence_after_utterance(asr_input):
+    asr_input.messages.append(Message(timestamp=123.456, message="pending utterance"))
+    asr_input.utterance_open = True
     result = await asr_input._poll()
     assert result is None
 
@@ -69,18 +100,97 @@ async def test_raw_to_text_conversion(asr_input):
 @pytest.mark.asyncio
 async def test_raw_to_text_buffer_management(asr_input, mock_sleep_ticker):
     await asr_input.raw_to_text("first message")
-    assert asr_input.messages == ["first message"]
+    assert len(asr_input.messages) == 1
+    assert asr_input.messages[0].message == "first message"
 
     await asr_input.raw_to_text("second message")
-    assert asr_input.messages == ["first message second message"]
+    assert len(asr_input.messages) == 1
+    assert asr_input.messages[0].message == "first message second message"
 
 
 def test_formatted_latest_buffer(asr_input):
-    asr_input.messages = ["test message"]
+    asr_input.messages.append(Message(timestamp=123.456, message="test message"))
     result = asr_input.formatted_latest_buffer()
     assert "test message" in result
-    assert asr_input.messages == []
+    assert len(asr_input.messages) == 0
 
 
 def test_formatted_latest_buffer_empty(asr_input):
     assert asr_input.formatted_latest_buffer() is None
+
+
+@pytest.mark.asyncio
+async def test_utterance_is_held_until_it_ends(asr_input, mock_sleep_ticker):
+    mock_sleep_ticker.skip_sleep = False
+    await asr_input.raw_to_text("turn on")
+    await asr_input.raw_to_text("the lights")
+    assert asr_input.formatted_latest_buffer() is None
+    assert mock_sleep_ticker.skip_sleep is False
+
+    await asr_input.raw_to_text(None)
+    assert mock_sleep_ticker.skip_sleep is True
+    assert "turn on the lights" in asr_input.formatted_latest_buffer()
+
+
+@pytest.mark.asyncio
+async def test_end_of_utterance_wakes_without_waiting(asr_input, mock_sleep_ticker):
+    mock_sleep_ticker.skip_sleep = False
+    asr_input._handle_asr_message(
+        json.dumps({"asr_reply": "stop", "end_of_utterance": True})
+    )
+    loop = asr_input._listen_loop()
+    try:
+        for _ in range(2):
+            event = await asyncio.wait_for(loop.__anext__(), 0.1)
+            await asr_input.raw_to_text(event)
+    finally:
+        await loop.aclose()
+
+    assert mock_sleep_ticker.skip_sleep is True
+    assert "stop" in asr_input.formatted_latest_buffer()
+
+
+async def listen(asr_input, events, timeout=1.0):
+    loop = asr_input._listen_loop()
+    try:
+        for _ in range(events):
+            event = await asyncio.wait_for(loop.__anext__(), timeout)
+            await asr_input.raw_to_text(event)
+    finally:
+        await loop.aclose()
+
+
+@pytest.mark.asyncio
+async def test_speech_end_before_final_reply(asr_input, mock_sleep_ticker):
+    mock_sleep_ticker.skip_sleep = False
+    asr_input._handle_asr_message(json.dumps({"asr_reply": "turn on"}))
+    asr_input._handle_speech_end()
+
+    async def late_final():
+        await asyncio.sleep(0.1)
+        asr_input._handle_asr_message(json.dumps({"asr_reply": "the lights"}))
+
+    final = asyncio.create_task(late_final())
+    await listen(asr_input, 3)
+    await final
+
+    assert asr_input.utterance_open is False
+    assert mock_sleep_ticker.skip_sleep is True
+    assert len(asr_input.messages) == 1
+    assert "turn on the lights" in asr_input.formatted_latest_buffer()
+
+
+@pytest.mark.asyncio
+async def test_speech_end_grace_expires(asr_input, mock_sleep_ticker):
+    mock_sleep_ticker.skip_sleep = False
+    asr_input.speech_end_grace = 0.05
+    asr_input._handle_asr_message(json.dumps({"asr_reply": "stop"}))
+    asr_input._handle_speech_end()
+
+    start = asyncio.get_running_loop().time()
+    # the fragment, the end of speech and the expired grace period
+    await listen(asr_input, 3)
+
+    assert asyncio.get_running_loop().time() - start < 0.4
+    assert mock_sleep_ticker.skip_sleep is True
+    assert "stop" in asr_input.formatted_latest_buffer()
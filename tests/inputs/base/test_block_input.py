@@ -0,0 +1,190 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+import websockets
+
+from inputs.base import SensorConfig
+from inputs.base.block_input import BlockInput, NewHeadsSubscription
+
+
+class NodeStandIn:
+    """Local websocket JSON-RPC node that announces blocks to subscribers."""
+
+    def __init__(self):
+        self.connections = []
+        self.subscriptions = 0
+        self.server = None
+        self.port = None
+
+    async def handler(self, ws):
+        self.connections.append(ws)
+        try:
+            async for raw_message in ws:
+                request = json.loads(raw_message)
+                if request["method"] == "eth_subscribe":
+                    self.subscriptions += 1
+                    await ws.send(
+                        json.dumps(
+                            {"jsonrpc": "2.0", "id": request["id"], "result": "0xabc"}
+                        )
+                    )
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.connections.remove(ws)
+
+    async def start(self):
+        self.server = await websockets.serve(self.handler, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}"
+
+    async def announce(self, number):
+        notification = json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "method": "eth_subscription",
+                "params": {"subscription": "0xabc", "result": {"number": hex(number)}},
+            }
+        )
+        for ws in list(self.connections):
+            await ws.send(notification)
+
+    async def drop_connections(self):
+        for ws in list(self.connections):
+            await ws.close()
+
+
+async def wait_until(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+class MockBlockInput(BlockInput[int]):
+    poll_interval = 0.05
+    max_poll_interval = 0.4
+
+    def __init__(self, config: SensorConfig = SensorConfig()):
+        super().__init__(config)
+        self.polls = 0
+
+    async def _poll(self) -> int:
+        self.polls += 1
+        return 0
+
+
+@pytest.fixture
+async def node():
+    stand_in = NodeStandIn()
+    await stand_in.start()
+    yield stand_in
+    await stand_in.stop()
+
+
+@pytest.fixture
+def mock_io_provider():
+    with patch("inputs.base.buffered_input.IOProvider"):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_subscription_reports_blocks(node):
+    subscription = NewHeadsSubscription(node.url)
+    subscription.start()
+    try:
+        await wait_until(lambda: subscription.connected)
+        await node.announce(42)
+        assert await subscription.wait_for_block(1.0) is True
+        assert subscription.block_number == 42
+        assert await subscription.wait_for_block(0.05) is False
+    finally:
+        await subscription.stop()
+
+
+@pytest.mark.asyncio
+async def test_subscription_reconnects(node):
+    subscription = NewHeadsSubscription(node.url, reconnect_delay=0.05)
+    subscription.start()
+    try:
+        await wait_until(lambda: subscription.connected)
+        await node.drop_connections()
+        await wait_until(lambda: node.subscriptions == 2)
+        await wait_until(lambda: subscription.connected)
+
+        await node.announce(43)
+        assert await subscription.wait_for_block(1.0) is True
+        assert subscription.block_number == 43
+    finally:
+        await subscription.stop()
+
+
+@pytest.mark.asyncio
+async def test_polls_only_on_new_blocks(node, mock_io_provider):
+    sensor = MockBlockInput(SensorConfig(ws_url=node.url))
+    loop = sensor._listen_loop()
+    try:
+        # polls on the timer until the subscription is up
+        await loop.__anext__()
+        await wait_until(lambda: sensor.block_subscription.connected)
+
+        next_poll = asyncio.ensure_future(loop.__anext__())
+        await asyncio.sleep(0.15)
+        assert not next_poll.done()
+
+        polls = sensor.polls
+        await node.announce(1)
+        await asyncio.wait_for(next_poll, 1.0)
+        assert sensor.polls == polls + 1
+    finally:
+        await loop.aclose()
+        await sensor.block_subscription.stop()
+
+
+@pytest.mark.asyncio
+async def test_closing_the_loop_stops_the_subscription(node, mock_io_provider):
+    sensor = MockBlockInput(SensorConfig(ws_url=node.url))
+    loop = sensor._listen_loop()
+    await loop.__anext__()
+    await wait_until(lambda: sensor.block_subscription.connected)
+    task = sensor.block_subscription._task
+
+    await loop.aclose()
+
+    assert task.done()
+    assert sensor.block_subscription._task is None
+    assert sensor.block_subscription.connected is False
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_polling_without_node(mock_io_provider):
+    sensor = MockBlockInput(
+        SensorConfig(ws_url="ws://127.0.0.1:1", max_poll_interval=None)
+    )
+    loop = sensor._listen_loop()
+    try:
+        for _ in range(3):
+            await asyncio.wait_for(loop.__anext__(), 1.0)
+        assert sensor.polls == 3
+        assert sensor.block_subscription.connected is False
+    finally:
+        await loop.aclose()
+        await sensor.block_subscription.stop()
+
+
+@pytest.mark.asyncio
+async def test_without_ws_url_only_polls(mock_io_provider):
+    sensor = MockBlockInput()
+    assert sensor.block_subscription is None
+    loop = sensor._listen_loop()
+    await asyncio.wait_for(loop.__anext__(), 1.0)
+    await loop.aclose()
@@ -0,0 +1,112 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from inputs.base import Message, SensorConfig
+from inputs.base.buffered_input import BufferedInput
+
+
+class MockBufferedInput(BufferedInput[str]):
+    async def _raw_to_text(self, raw_input):
+        if raw_input is None:
+            return None
+        return Message(timestamp=time.time(), message=raw_input)
+
+
+@pytest.fixture
+def mock_io_provider():
+    with patch("inputs.base.buffered_input.IOProvider") as mock:
+        mock_instance = Mock()
+        mock.return_value = mock_instance
+        yield mock_instance
+
+
+def make_input(**kwargs):
+    return MockBufferedInput(SensorConfig(**kwargs))
+
+
+def test_init_defaults(mock_io_provider):
+    sensor = make_input()
+    assert sensor.buffer_size == 10
+    assert sensor.message_ttl is None
+    assert sensor.aggregation == "latest"
+    assert sensor.descriptor_for_LLM == "MockBufferedInput"
+    assert len(sensor.messages) == 0
+
+
+def test_init_unknown_aggregation(mock_io_provider):
+    with pytest.raises(ValueError):
+        make_input(aggregation="median")
+
+
+@pytest.mark.asyncio
+async def test_buffer_is_bounded(mock_io_provider):
+    sensor = make_input(buffer_size=3)
+    for i in range(5):
+        await sensor.raw_to_text(f"message {i}")
+
+    assert [m.message for m in sensor.messages] == [
+        "message 2",
+        "message 3",
+        "message 4",
+    ]
+    assert sensor.dropped_messages == 2
+
+
+@pytest.mark.asyncio
+async def test_raw_to_text_skips_empty_result(mock_io_provider):
+    sensor = make_input()
+    await sensor.raw_to_text(None)
+    assert len(sensor.messages) == 0
+
+
+def test_stale_messages_are_not_reported(mock_io_provider):
+    sensor = make_input(message_ttl=1.0)
+    sensor.add_message(Message(timestamp=time.time() - 5, message="stale"))
+
+    assert sensor.formatted_latest_buffer() is None
+    assert sensor.dropped_messages == 1
+    mock_io_provider.add_input.assert_not_called()
+
+
+def test_fresh_messages_filters_by_ttl(mock_io_provider):
+    sensor = make_input(message_ttl=1.0)
+    now = time.time()
+    sensor.add_message(Message(timestamp=now - 5, message="stale"))
+    sensor.add_message(Message(timestamp=now, message="fresh"))
+
+    assert [m.message for m in sensor.fresh_messages()] == ["fresh"]
+    assert len(sensor.messages) == 1
+
+
+def test_formatted_latest_buffer(mock_io_provider):
+    sensor = make_input()
+    sensor.add_message(Message(timestamp=123.0, message="old"))
+    sensor.add_message(Message(timestamp=124.0, message="new"))
+
+    result = sensor.formatted_latest_buffer()
+
+    assert "MockBufferedInput INPUT" in result
+    assert "new" in result
+    assert "old" not in result
+    mock_io_provider.add_input.assert_called_once_with(
+        "MockBufferedInput", "new", 124.0
+    )
+    assert len(sensor.messages) == 0
+
+
+def test_aggregation_all(mock_io_provider):
+    sensor = make_input(aggregation="all")
+    sensor.add_message(Message(timestamp=123.0, message="first"))
+    sensor.add_message(Message(timestamp=124.0, message="second"))
+
+    assert "first\nsecond" in sensor.formatted_latest_buffer()
+
+
+def test_aggregation_count(mock_io_provider):
+    sensor = make_input(aggregation="count")
+    for text in ["a person", "a dog", "a person"]:
+        sensor.add_message(Message(timestamp=time.time(), message=text))
+
+    assert sensor.aggregate(list(sensor.messages)) == "a dog\na person (seen 2 times)"
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from inputs.base.face_tracker import FaceTracker
+
+HAPPY = np.array([0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0])
+SAD = np.array([0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0])
+
+
+def crop(value=100):
+    return np.full((48, 48), value, dtype=np.uint8)
+
+
+def test_identities_persist_while_faces_move():
+    tracker = FaceTracker()
+    tracker.update([(10, 10, 40, 40), (200, 10, 40, 40)], [crop(), crop()], now=0.0)
+    tracker.classified([0, 1], [HAPPY, SAD])
+
+    # the faces swap their order in the detector output
+    tracker.update([(205, 12, 40, 40), (14, 10, 40, 40)], [crop(), crop()], now=1.0)
+
+    faces = tracker.visible()
+    assert [face.track_id for face in faces] == [1, 2]
+    assert faces[0].bbox == (14, 10, 40, 40)
+    assert np.argmax(faces[1].probabilities) == 4
+
+
+def test_faces_are_reclassified_every_n_frames():
+    tracker = FaceTracker(reclassify_every=3)
+    assert tracker.update([(10, 10, 40, 40)], [crop()]) == [0]
+    tracker.classified([0], [HAPPY])
+
+    assert tracker.update([(10, 10, 40, 40)], [crop()]) == []
+    assert tracker.update([(10, 10, 40, 40)], [crop()]) == []
+    assert tracker.update([(10, 10, 40, 40)], [crop()]) == [0]
+
+
+def test_changed_crop_is_reclassified_immediately():
+    tracker = FaceTracker(reclassify_every=10, crop_change_threshold=0.1)
+    tracker.update([(10, 10, 40, 40)], [crop(100)])
+    tracker.classified([0], [HAPPY])
+
+    # small changes, e.g. sensor noise, keep the classification
+    assert tracker.update([(10, 10, 40, 40)], [crop(110)]) == []
+    assert tracker.update([(10, 10, 40, 40)], [crop(160)]) == [0]
+
+
+def test_emotions_are_smoothed():
+    tracker = FaceTracker(smoothing=0.4, reclassify_every=1)
+    tracker.update([(10, 10, 40, 40)], [crop()])
+    tracker.classified([0], [HAPPY])
+
+    # a single misread frame does not flip the emotion
+    tracker.update([(10, 10, 40, 40)], [crop()])
+    tracker.classified([0], [SAD])
+    probabilities = tracker.visible()[0].probabilities
+    assert np.argmax(probabilities) == 3
+    assert probabilities[3] == pytest.approx(0.6)
+    assert probabilities[4] == pytest.approx(0.4)
+
+    # a lasting change does
+    tracker.update([(10, 10, 40, 40)], [crop()])
+    tracker.classified([0], [SAD])
+    assert np.argmax(tracker.visible()[0].probabilities) == 4
+
+
+def test_faces_expire():
+    tracker = FaceTracker(max_misses=2)
+    tracker.update([(10, 10, 40, 40)], [crop()])
+    tracker.classified([0], [HAPPY])
+
+    # briefly missed faces are still reported
+    tracker.update([], [])
+    tracker.update([], [])
+    assert len(tracker.visible()) == 1
+
+    tracker.update([], [])
+    assert tracker.visible() == []
+    assert tracker.faces == {}
+
+
+def test_undetected_faces_expire_after_max_age():
+    tracker = FaceTracker(max_misses=10, max_age=2.0)
+    tracker.update([(10, 10, 40, 40)], [crop()], now=0.0)
+    tracker.classified([0], [HAPPY])
+    assert tracker.stale(now=1.0) is False
+
+    tracker.update([], [], now=1.0)
+    assert len(tracker.visible()) == 1
+    assert tracker.stale(now=2.5) is True
+
+    # the face is confirmed by a detection
+    tracker.update([(10, 10, 40, 40)], [crop()], now=2.5)
+    assert tracker.stale(now=3.0) is False
+
+    tracker.update([], [], now=5.0)
+    assert tracker.visible() == []
+    assert tracker.faces == {}
+    assert tracker.stale(now=5.0) is False
+
+
+def test_unclassified_faces_are_not_visible():
+    tracker = FaceTracker()
+    assert tracker.update([(10, 10, 40, 40)], [crop()]) == [0]
+    assert tracker.visible() == []
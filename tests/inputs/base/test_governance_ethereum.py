@@ -1,15 +1,49 @@
+import asyncio
+import json
 import logging
-from unittest.mock import patch
+import threading
+from unittest.mock import Mock, patch
 
 import pytest
 
+from inputs.base import SensorConfig
 from inputs.plugins.ethereum_governance import GovernanceEthereum
 
+RULES = "Here are the laws that govern your actions."
+
+
+def encode_string(text):
+    """ABI-encode a string the way getRuleSet() returns it."""
+    data = text.encode()
+    padding = (32 - len(data) % 32) % 32
+    return (
+        "0x"
+        + (
+            (32).to_bytes(32, "big")
+            + (1).to_bytes(32, "big")
+            + (32).to_bytes(32, "big")
+            + len(data).to_bytes(32, "big")
+            + data
+            + bytes(padding)
+        ).hex()
+    )
+
+
+def rpc_response(result):
+    response = Mock(status_code=200)
+    response.json.return_value = {"jsonrpc": "2.0", "id": 1, "result": result}
+    return response
+
 
 @pytest.fixture
-def governance():
+def cache_path(tmp_path):
+    return str(tmp_path / "governance_rules.json")
+
+
+@pytest.fixture
+def governance(cache_path):
     """Fixture to initialize GovernanceEthereum."""
-    return GovernanceEthereum()
+    return GovernanceEthereum(SensorConfig(rules_cache_path=cache_path))
 
 
 @pytest.fixture
@@ -21,8 +55,8 @@ def mock_requests_get():
 
 @pytest.fixture
 def mock_requests_post():
-    """Patch `requests.post` to simulate blockchain responses."""
-    with patch("requests.post") as mock:
+    """Patch the session `post` to simulate blockchain responses."""
+    with patch("requests.Session.post") as mock:
         yield mock
 
 
@@ -55,6 +89,84 @@ def test_load_rules_from_blockchain_failure(governance, mock_requests_post):
     logging.info("Test Blockchain Failure: No rules loaded")
 
 
+# ------------------------
+# TEST: Version Gating
+# ------------------------
+
+
+def chain(mock_requests_post, versions):
+    """Answer version queries from `versions` and rule set queries with RULES."""
+    versions = iter(versions)
+
+    def post(url, json=None, **kwargs):
+        data = json["params"][0]["data"]
+        if data.startswith("0x254e2f1e"):
+            return rpc_response(hex(next(versions)))
+        return rpc_response(encode_string(f"{RULES} v{int(data[10:], 16)}"))
+
+    mock_requests_post.side_effect = post
+
+
+def rule_set_calls(mock_requests_post):
+    return [
+        call
+        for call in mock_requests_post.call_args_list
+        if call.kwargs["json"]["params"][0]["data"].startswith("0x1db3d5ff")
+    ]
+
+
+def test_refresh_fetches_rules_only_on_version_change(governance, mock_requests_post):
+    chain(mock_requests_post, [2, 2, 2, 3])
+
+    assert governance.refresh_rules() == f"{RULES} v2"
+    assert governance.refresh_rules() == f"{RULES} v2"
+    assert governance.refresh_rules() == f"{RULES} v2"
+    assert len(rule_set_calls(mock_requests_post)) == 1
+
+    assert governance.refresh_rules() == f"{RULES} v3"
+    assert governance.rule_version == 3
+    assert len(rule_set_calls(mock_requests_post)) == 2
+
+
+def test_refresh_writes_cache(governance, mock_requests_post, cache_path):
+    chain(mock_requests_post, [3])
+    governance.refresh_rules()
+
+    with open(cache_path) as f:
+        assert json.load(f) == {"version": 3, "rules": f"{RULES} v3"}
+
+
+def test_cached_rules_available_on_boot(cache_path, mock_requests_post):
+    with open(cache_path, "w") as f:
+        json.dump({"version": 3, "rules": f"{RULES} v3"}, f)
+
+    governance = GovernanceEthereum(SensorConfig(rules_cache_path=cache_path))
+
+    mock_requests_post.assert_not_called()
+    assert governance.rule_version == 3
+    assert f"{RULES} v3" in governance.formatted_latest_buffer()
+
+
+def test_refresh_keeps_cached_rules_when_unreachable(cache_path, mock_requests_post):
+    with open(cache_path, "w") as f:
+        json.dump({"version": 3, "rules": f"{RULES} v3"}, f)
+    mock_requests_post.side_effect = ConnectionError("unreachable")
+
+    governance = GovernanceEthereum(SensorConfig(rules_cache_path=cache_path))
+
+    assert governance.refresh_rules() == f"{RULES} v3"
+
+
+def test_corrupt_cache_is_ignored(cache_path):
+    with open(cache_path, "w") as f:
+        f.write("not json")
+
+    governance = GovernanceEthereum(SensorConfig(rules_cache_path=cache_path))
+
+    assert governance.universal_rule is None
+    assert governance.formatted_latest_buffer() is None
+
+
 # ------------------------
 # TEST: Polling Behavior
 # ------------------------
@@ -67,3 +179,29 @@ def test_load_rules_from_blockchain_failure(governance, mock_requests_post):
 #     await governance._poll()
 #     assert governance.universal_rule == governance.backup_universal_rule
 #     logging.info("Test `_poll()` correctly updated rules.")
+
+
+@pytest.mark.asyncio
+async def test_poll_skips_while_an_abandoned_refresh_runs(governance):
+    governance.rpc_timeout = 0.05
+    release = threading.Event()
+    calls = []
+
+    def slow_refresh():
+        with governance._refresh_lock:
+            calls.append(1)
+            release.wait(5)
+            return f"{RULES} v3"
+
+    governance.refresh_rules = slow_refresh
+    governance.universal_rule = f"{RULES} v2"
+
+    # the first poll gives up on the refresh, which keeps its worker thread
+    assert await governance._poll() is None
+    assert await governance._poll() == f"{RULES} v2"
+    assert calls == [1]
+
+    release.set()
+    await asyncio.sleep(0.1)
+    assert await governance._poll() == f"{RULES} v3"
+    assert calls == [1, 1]
@@ -0,0 +1,117 @@
+from collections import namedtuple
+
+import cv2
+import numpy as np
+import pytest
+
+from inputs.base.object_tracker import ObjectTracker, iou
+
+Detection = namedtuple("Detection", "label, bbox, score")
+
+
+def scene(offset_x=0, offset_y=0):
+    """Plain frame with a textured object at (100, 100) - (180, 180)."""
+    frame = np.full((240, 320, 3), 90, dtype=np.uint8)
+    rng = np.random.default_rng(0)
+    texture = rng.integers(0, 256, (80, 80, 3), dtype=np.uint8)
+    frame[100 + offset_y : 180 + offset_y, 100 + offset_x : 180 + offset_x] = texture
+    return frame
+
+
+def test_iou():
+    assert iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+    assert iou((0, 0, 10, 10), (5, 0, 15, 10)) == pytest.approx(1 / 3)
+    assert iou((0, 0, 10, 10), (20, 20, 30, 30)) == 0.0
+
+
+def test_ids_persist_while_objects_move():
+    tracker = ObjectTracker()
+    tracker.update([Detection("person", (10, 10, 50, 90), 0.9)], now=0.0)
+    track_id = tracker.tracks[0].track_id
+
+    for step in range(1, 5):
+        x = 10 + 8 * step
+        tracker.update([Detection("person", (x, 10, x + 40, 90), 0.9)], now=step)
+
+    assert len(tracker.tracks) == 1
+    assert tracker.tracks[0].track_id == track_id
+    assert tracker.tracks[0].age(now=4.0) == 4.0
+
+
+def test_centroid_matching_without_overlap():
+    tracker = ObjectTracker()
+    tracker.update([Detection("dog", (0, 0, 40, 40), 0.9)], now=0.0)
+    # IoU below the threshold, centroid within half the box diagonal
+    tracker.update([Detection("dog", (25, 0, 65, 40), 0.9)], now=1.0)
+    assert [t.track_id for t in tracker.tracks] == [1]
+
+
+def test_labels_are_not_mixed():
+    tracker = ObjectTracker()
+    tracker.update([Detection("cat", (0, 0, 40, 40), 0.9)], now=0.0)
+    tracker.update([Detection("dog", (0, 0, 40, 40), 0.9)], now=1.0)
+    assert sorted(t.label for t in tracker.tracks) == ["cat", "dog"]
+    assert sorted(t.track_id for t in tracker.tracks) == [1, 2]
+
+
+def test_missed_tracks_are_dropped():
+    tracker = ObjectTracker(max_misses=1)
+    tracker.update([Detection("cup", (0, 0, 20, 20), 0.9)], now=0.0)
+
+    # a single missed detection does not drop the object
+    tracker.update([], now=1.0)
+    assert len(tracker.tracks) == 1
+    tracker.update([Detection("cup", (1, 0, 21, 20), 0.9)], now=2.0)
+    assert tracker.tracks[0].misses == 0
+
+    tracker.update([], now=3.0)
+    tracker.update([], now=4.0)
+    assert tracker.tracks == []
+
+
+def test_propagate_follows_the_object():
+    tracker = ObjectTracker()
+    tracker.update([Detection("box", (100, 100, 180, 180), 0.9)], scene(), now=0.0)
+
+    assert tracker.propagate(scene(offset_x=6, offset_y=-4)) is True
+    x1, y1, x2, y2 = tracker.tracks[0].bbox
+    assert x1 == pytest.approx(106, abs=1)
+    assert y1 == pytest.approx(96, abs=1)
+
+
+def test_propagate_reports_lost_track():
+    tracker = ObjectTracker()
+    # the box covers a featureless part of the frame
+    tracker.update([Detection("wall", (200, 10, 300, 80), 0.9)], scene(), now=0.0)
+    assert tracker.propagate(scene()) is False
+
+
+def textured_scene(object_x=None):
+    """Textured background with the textured object at (object_x, 100)."""
+    background = np.random.default_rng(1).integers(0, 256, (240, 320, 3), np.uint8)
+    frame = cv2.GaussianBlur(background, (5, 5), 0)
+    if object_x is not None:
+        texture = np.random.default_rng(0).integers(0, 256, (80, 80, 3), np.uint8)
+        frame[100:180, object_x : object_x + 80] = texture
+    return frame
+
+
+def test_propagate_follows_the_object_over_a_textured_background():
+    tracker = ObjectTracker()
+    tracker.update(
+        [Detection("person", (100, 100, 180, 180), 0.9)], textured_scene(100), now=0.0
+    )
+
+    assert tracker.propagate(textured_scene(106)) is True
+    assert tracker.tracks[0].bbox[0] == pytest.approx(106, abs=1)
+
+
+def test_propagate_reports_an_object_that_left():
+    tracker = ObjectTracker()
+    tracker.update(
+        [Detection("person", (100, 100, 180, 180), 0.9)], textured_scene(100), now=0.0
+    )
+
+    # the box now holds the static background
+    assert tracker.propagate(textured_scene()) is False
+    assert tracker.propagate(textured_scene()) is False
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from inputs.base.queue_input import QueueInput
+
+
+class MockQueueInput(QueueInput[str]):
+    async def raw_to_text(self, raw_input):
+        pass
+
+    def formatted_latest_buffer(self):
+        return None
+
+
+@pytest.fixture
+def queue_input():
+    return MockQueueInput()
+
+
+@pytest.mark.asyncio
+async def test_message_before_first_poll(queue_input):
+    queue_input.put_message("early")
+    assert await queue_input._poll() == "early"
+
+
+@pytest.mark.asyncio
+async def test_message_from_provider_thread(queue_input):
+    poll_task = asyncio.create_task(queue_input._poll())
+    await asyncio.sleep(0.05)
+
+    sent_at = time.perf_counter()
+    threading.Thread(target=queue_input.put_message, args=("threaded",)).start()
+
+    assert await poll_task == "threaded"
+    assert time.perf_counter() - sent_at < 0.1
+
+
+@pytest.mark.asyncio
+async def test_messages_keep_order(queue_input):
+    queue_input.put_message("first")
+    assert await queue_input._poll() == "first"
+
+    thread = threading.Thread(
+        target=lambda: [queue_input.put_message(str(i)) for i in range(10)]
+    )
+    thread.start()
+    thread.join()
+
+    assert [await queue_input._poll() for _ in range(10)] == [str(i) for i in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_poll_waits_for_message(queue_input):
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(queue_input._poll(), timeout=0.1)
+
+
+@pytest.mark.asyncio
+async def test_next_message_timeout(queue_input):
+    assert await queue_input._next_message(0.05) is None
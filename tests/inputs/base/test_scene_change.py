@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import numpy as np
+
+from inputs.base import SensorConfig
+from inputs.base.scene_change import SceneChangeGate
+
+
+def wall(brightness=100):
+    rng = np.random.default_rng(0)
+    frame = np.full((480, 640, 3), brightness, dtype=np.uint8)
+    frame += rng.integers(0, 20, frame.shape, dtype=np.uint8)
+    return frame
+
+
+def test_static_scene_is_skipped():
+    gate = SceneChangeGate("test")
+    results = [gate.should_process(wall()) for _ in range(10)]
+    assert results == [True] + [False] * 9
+    assert gate.skip_ratio == 0.9
+
+
+def test_sensor_noise_is_skipped():
+    gate = SceneChangeGate("test")
+    rng = np.random.default_rng(1)
+    gate.should_process(wall())
+    noisy = np.clip(
+        wall().astype(np.int16) + rng.integers(-3, 4, (480, 640, 3)), 0, 255
+    ).astype(np.uint8)
+    assert gate.should_process(noisy) is False
+
+
+def test_changed_scene_is_processed():
+    gate = SceneChangeGate("test")
+    gate.should_process(wall())
+
+    frame = wall()
+    frame[100:380, 200:440] = 250  # someone walks in
+    assert gate.should_process(frame) is True
+    assert gate.should_process(frame) is False
+
+
+def test_slow_drift_adds_up():
+    gate = SceneChangeGate("test", threshold=0.02)
+    results = [gate.should_process(wall(100 + step)) for step in range(0, 12, 2)]
+    # each step is below the threshold, the distance to the analyzed frame is not
+    assert results[1] is False
+    assert True in results[2:]
+
+
+def test_refresh_interval_forces_processing():
+    gate = SceneChangeGate("test", refresh_interval=10.0)
+    with patch("inputs.base.scene_change.time.time", return_value=1000.0):
+        gate.should_process(wall())
+        assert gate.should_process(wall()) is False
+    with patch("inputs.base.scene_change.time.time", return_value=1010.0):
+        assert gate.should_process(wall()) is True
+
+
+def test_zero_threshold_processes_every_frame():
+    gate = SceneChangeGate.from_config("test", SensorConfig(scene_change_threshold=0))
+    assert all(gate.should_process(wall()) for _ in range(3))
+    assert gate.skip_ratio == 0.0
+
+
+def test_grayscale_and_float_frames():
+    gate = SceneChangeGate("test")
+    assert gate.thumbnail(np.zeros((100, 100))).shape == (24, 32)
+    assert gate.thumbnail(np.ones((100, 100, 3))).max() == 1.0
@@ -0,0 +1,200 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+
+from inputs.base import SensorConfig
+from inputs.plugins.twitter import TwitterInput
+
+
+class RAGStandIn:
+    """Local query endpoint that answers with a configurable text per query."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.texts = {}
+        self.queries = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.failing = False
+        self.runner = None
+        self.url = None
+
+    async def handle(self, request):
+        query = (await request.json())["query"]
+        self.queries.append(query)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if self.failing:
+            return web.Response(status=500, text="unavailable")
+        text = self.texts.get(query, f"context for {query}")
+        return web.json_response({"results": [{"content": {"text": text}}]})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/query", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}/query"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+@pytest.fixture
+async def endpoint():
+    stand_in = RAGStandIn()
+    await stand_in.start()
+    yield stand_in
+    await stand_in.stop()
+
+
+@pytest.fixture
+def mock_io_provider():
+    with patch("inputs.base.buffered_input.IOProvider") as mock:
+        yield mock.return_value
+
+
+async def make_input(endpoint, **kwargs):
+    sensor = TwitterInput(SensorConfig(**kwargs))
+    sensor.api_url = endpoint.url
+    await sensor._init_session()
+    return sensor
+
+
+@pytest.mark.asyncio
+async def test_single_query_from_config(endpoint, mock_io_provider):
+    sensor = await make_input(endpoint, query="AI news")
+    assert sensor.queries == ["AI news"]
+    try:
+        await sensor.raw_to_text(await sensor._poll())
+        assert "context for AI news" in sensor.formatted_latest_buffer()
+    finally:
+        await sensor.session.close()
+
+
+@pytest.mark.asyncio
+async def test_queries_are_fetched_concurrently(endpoint, mock_io_provider):
+    endpoint.delay = 0.2
+    sensor = await make_input(endpoint, queries=["a", "b", "c"])
+    try:
+        start = asyncio.get_running_loop().time()
+        context = await sensor._poll()
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert endpoint.max_in_flight == 3
+        assert elapsed < 0.5
+        assert context == "context for a\n\ncontext for b\n\ncontext for c"
+    finally:
+        await sensor.session.close()
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_until_ttl(endpoint, mock_io_provider):
+    sensor = await make_input(endpoint, queries=["a"], cache_ttl=60)
+    try:
+        await sensor._poll()
+        await sensor._poll()
+        assert endpoint.queries == ["a"]
+
+        with patch("inputs.plugins.twitter.time.time", return_value=1e12):
+            await sensor._poll()
+        assert endpoint.queries == ["a", "a"]
+    finally:
+        await sensor.session.close()
+
+
+@pytest.mark.asyncio
+async def test_default_ttl_spans_several_polls(endpoint, mock_io_provider):
+    sensor = await make_input(endpoint, queries=["a"])
+    try:
+        now = 1000.0
+        for _ in range(3):
+            with patch("inputs.plugins.twitter.time.time", return_value=now):
+                await sensor._poll()
+            now += TwitterInput.poll_interval
+        assert endpoint.queries == ["a"]
+    finally:
+        await sensor.session.close()
+
+
+@pytest.mark.asyncio
+async def test_fuse_clears_updates_and_keeps_context(endpoint, mock_io_provider):
+    sensor = await make_input(endpoint, queries=["a"], cache_ttl=0)
+    try:
+        await sensor.raw_to_text(await sensor._poll())
+
+        assert "context for a" in sensor.formatted_latest_buffer()
+        assert len(sensor.messages) == 0
+        mock_io_provider.add_input.assert_called_once()
+        assert mock_io_provider.add_input.call_args.args[1] == "context for a"
+
+        # the context is still reported, but not added again
+        assert "context for a" in sensor.formatted_latest_buffer()
+        mock_io_provider.add_input.assert_called_once()
+    finally:
+        await sensor.session.close()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_context_is_not_buffered(endpoint, mock_io_provider):
+    sensor = await make_input(endpoint, queries=["a"], cache_ttl=0)
+    try:
+        for _ in range(3):
+            await sensor.raw_to_text(await sensor._poll())
+        assert len(sensor.messages) == 1
+
+        endpoint.texts["a"] = "fresh"
+        await sensor.raw_to_text(await sensor._poll())
+        assert len(sensor.messages) == 2
+        assert sensor.context == "fresh"
+    finally:
+        await sensor.session.close()
+
+
+@pytest.mark.asyncio
+async def test_buffer_is_bounded(endpoint, mock_io_provider):
+    sensor = await make_input(endpoint, queries=["a"], cache_ttl=0, buffer_size=2)
+    try:
+        for i in range(5):
+            endpoint.texts["a"] = f"version {i}"
+            await sensor.raw_to_text(await sensor._poll())
+        assert [m.message for m in sensor.messages] == ["version 3", "version 4"]
+        assert sensor.dropped_messages == 3
+    finally:
+        await sensor.session.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_query_keeps_context(endpoint, mock_io_provider):
+    sensor = await make_input(endpoint, queries=["a"], cache_ttl=0)
+    try:
+        await sensor.raw_to_text(await sensor._poll())
+        endpoint.failing = True
+        assert await sensor._poll() == "context for a"
+
+        sensor._cache.clear()
+        assert await sensor._poll() is None
+        assert sensor.context == "context for a"
+    finally:
+        await sensor.session.close()
+
+
+@pytest.mark.asyncio
+async def test_first_refresh_is_immediate(endpoint, mock_io_provider):
+    sensor = await make_input(endpoint, queries=["a"])
+    loop = sensor._listen_loop()
+    try:
+        assert await asyncio.wait_for(loop.__anext__(), 1.0) == "context for a"
+        assert sensor.current_poll_interval == TwitterInput.poll_interval
+    finally:
+        await loop.aclose()
+        await sensor.session.close()
@@ -0,0 +1,83 @@
+from collections import namedtuple
+from unittest.mock import AsyncMock, Mock, patch
+
+import cv2
+import numpy as np
+import pytest
+
+from inputs.base import SensorConfig
+from inputs.plugins.vlm_coco_local import VLM_COCO_Local
+
+Detection = namedtuple("Detection", "label, bbox, score")
+
+PERSON = Detection("person", (100, 100, 180, 180), 0.9)
+
+
+def scene(person=True):
+    """Textured room, with a textured person at (100, 100) - (180, 180)."""
+    room = np.random.default_rng(1).integers(0, 256, (240, 320, 3), np.uint8)
+    frame = cv2.GaussianBlur(room, (5, 5), 0)
+    if person:
+        frame[100:180, 100:180] = np.random.default_rng(0).integers(
+            0, 256, (80, 80, 3), np.uint8
+        )
+    return frame
+
+
+@pytest.fixture
+def mock_detector():
+    with patch("inputs.plugins.vlm_coco_local.COCODetectionProvider") as mock:
+        yield mock.return_value
+
+
+@pytest.fixture
+def mock_io_provider():
+    with patch("inputs.base.buffered_input.IOProvider") as mock:
+        yield mock.return_value
+
+
+@pytest.fixture
+def coco(mock_detector, mock_io_provider):
+    capture = Mock()
+    capture.get.side_effect = lambda prop: {3: 320, 4: 240}[prop]
+    with (
+        patch("inputs.plugins.vlm_coco_local.check_webcam", return_value=True),
+        patch("inputs.plugins.vlm_coco_local.cv2.VideoCapture", return_value=capture),
+    ):
+        yield VLM_COCO_Local(SensorConfig(camera_index=0, detect_interval=5.0))
+
+
+async def run(coco, frames, start=1000.0, step=0.5):
+    messages = []
+    for i, frame in enumerate(frames):
+        with patch("inputs.plugins.vlm_coco_local.time.time", return_value=start):
+            messages.append(await coco._raw_to_text([frame]))
+        start += step
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_person_that_leaves_is_no_longer_reported(coco, mock_detector):
+    mock_detector.detect_many = AsyncMock(
+        side_effect=lambda frames: [
+            [PERSON] if frame[140, 140].tolist() == scene()[140, 140].tolist() else []
+            for frame in frames
+        ]
+    )
+
+    messages = await run(coco, [scene()] * 3 + [scene(person=False)] * 20)
+
+    assert "person" in messages[2].message
+    assert all(message is None for message in messages[5:])
+    assert coco.cameras[0].tracker.tracks == []
+
+
+@pytest.mark.asyncio
+async def test_static_scene_is_detected_on_an_interval(coco, mock_detector):
+    mock_detector.detect_many = AsyncMock(return_value=[[PERSON]])
+
+    # 10 s of identical frames, every 0.5 s
+    await run(coco, [scene()] * 20)
+
+    # the first frame, then every detect_interval whatever the gate says
+    assert mock_detector.detect_many.await_count == 2
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from unittest.mock import Mock, patch
 
@@ -20,7 +21,7 @@ def vlm_input(mock_vlm_provider):
 
 
 def test_init(vlm_input, mock_vlm_provider):
-    assert vlm_input.messages == []
+    assert len(vlm_input.messages) == 0
     assert vlm_input.message_buffer.empty()
     mock_vlm_provider.start.assert_called_once()
     mock_vlm_provider.register_message_callback.assert_called_once_with(
@@ -43,15 +44,15 @@ def test_handle_invalid_json(vlm_input):
 @pytest.mark.asyncio
 async def test_poll_with_message(vlm_input):
     test_message = "test message"
-    vlm_input.message_buffer.put(test_message)
+    vlm_input.message_buffer.put_nowait(test_message)
     result = await vlm_input._poll()
     assert result == test_message
 
 
 @pytest.mark.asyncio
 async def test_poll_empty_queue(vlm_input):
-    result = await vlm_input._poll()
-    assert result is None
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(vlm_input._poll(), timeout=0.1)
 
 
 @pytest.mark.asyncio
@@ -75,7 +76,7 @@ def test_formatted_latest_buffer(vlm_input):
     vlm_input.messages = [Message(message="test message", timestamp=123.456)]
     result = vlm_input.formatted_latest_buffer()
     assert "test message" in result
-    assert vlm_input.messages == []
+    assert len(vlm_input.messages) == 0
 
 
 def test_formatted_latest_buffer_empty(vlm_input):
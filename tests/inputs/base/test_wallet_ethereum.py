@@ -21,7 +21,7 @@ def mock_web3():
 
 @pytest.fixture
 def mock_io_provider():
-    with patch("inputs.plugins.wallet_ethereum.IOProvider") as mock:
+    with patch("inputs.base.buffered_input.IOProvider") as mock:
         mock_instance = Mock()
         mock.return_value = mock_instance
         yield mock_instance
@@ -36,7 +36,7 @@ def wallet_eth(mock_web3, mock_io_provider):
 def test_init(wallet_eth, mock_web3, mock_io_provider):
     assert wallet_eth.ETH_balance == 0
     assert wallet_eth.ETH_balance_previous == 0
-    assert isinstance(wallet_eth.messages, list)
+    assert len(wallet_eth.messages) == 0
     assert wallet_eth.ACCOUNT_ADDRESS == "0xTestAddress"
     assert wallet_eth.web3 is not None
     mock_web3.is_connected.assert_called_once()
@@ -0,0 +1,200 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+
+from inputs.base import SensorConfig
+from inputs.plugins.wallet_ethereum_fleet import WEI_PER_ETH, WalletEthereumFleet
+
+
+class RPCStandIn:
+    """Local JSON-RPC node that serves a block number and balances."""
+
+    def __init__(self):
+        self.block_number = 100
+        self.balances = {}
+        self.requests = []
+        self.failing = set()
+        # indexes of requests answered with an HTTP error
+        self.broken_requests = set()
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stand_in.requests.append(body)
+                if len(stand_in.requests) - 1 in stand_in.broken_requests:
+                    self.send_error(500)
+                    return
+                calls = body if isinstance(body, list) else [body]
+                replies = [stand_in.reply(call) for call in calls]
+                data = json.dumps(replies if isinstance(body, list) else replies[0])
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data.encode())
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reply(self, call):
+        if call["method"] == "eth_blockNumber":
+            result = hex(self.block_number)
+        else:
+            address = call["params"][0]
+            if address in self.failing:
+                return {
+                    "jsonrpc": "2.0",
+                    "id": call["id"],
+                    "error": {"code": -32000, "message": "failed"},
+                }
+            result = hex(self.balances.get(address, 0))
+        return {"jsonrpc": "2.0", "id": call["id"], "result": result}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def node():
+    stand_in = RPCStandIn()
+    yield stand_in
+    stand_in.close()
+
+
+@pytest.fixture
+def mock_io_provider():
+    with patch("inputs.base.buffered_input.IOProvider") as mock:
+        mock_instance = Mock()
+        mock.return_value = mock_instance
+        yield mock_instance
+
+
+def make_fleet(node, addresses, **kwargs):
+    for i, address in enumerate(addresses):
+        node.balances.setdefault(address, i * WEI_PER_ETH)
+    return WalletEthereumFleet(
+        SensorConfig(rpc_url=node.url, addresses=addresses, **kwargs)
+    )
+
+
+def addresses(count):
+    return [f"0x{i:040x}" for i in range(count)]
+
+
+def test_init_requires_addresses(mock_io_provider):
+    with patch.dict("os.environ", {"ETH_ADDRESSES": ""}):
+        with pytest.raises(ValueError):
+            WalletEthereumFleet()
+
+
+def test_init_addresses_from_environment(mock_io_provider):
+    with patch.dict("os.environ", {"ETH_ADDRESSES": "0xA, 0xB"}):
+        assert WalletEthereumFleet().addresses == ["0xA", "0xB"]
+
+
+@pytest.mark.asyncio
+async def test_first_poll_reads_baseline(node, mock_io_provider):
+    fleet = make_fleet(node, addresses(3))
+
+    assert await fleet._poll() == []
+    assert fleet.block_number == 100
+    assert len(fleet.balances) == 3
+
+    # one block number request and one batch with every balance
+    assert len(node.requests) == 2
+    assert [call["method"] for call in node.requests[1]] == ["eth_getBalance"] * 3
+
+
+@pytest.mark.asyncio
+async def test_no_balance_requests_without_new_block(node, mock_io_provider):
+    fleet = make_fleet(node, addresses(3))
+    await fleet._poll()
+    node.requests.clear()
+
+    assert await fleet._poll() == []
+    assert len(node.requests) == 1
+    assert node.requests[0][0]["method"] == "eth_blockNumber"
+
+
+@pytest.mark.asyncio
+async def test_balance_changes_on_new_block(node, mock_io_provider):
+    watched = addresses(3)
+    fleet = make_fleet(node, watched)
+    await fleet._poll()
+
+    node.block_number += 1
+    node.balances[watched[0]] += 2 * WEI_PER_ETH
+    node.balances[watched[2]] -= WEI_PER_ETH
+
+    changes = await fleet._poll()
+    assert changes == [(watched[0], 2.0), (watched[2], -1.0)]
+
+    await fleet.raw_to_text(changes)
+    result = fleet.formatted_latest_buffer()
+    assert f"Wallet {watched[0]} received 2.000 ETH." in result
+    assert f"Wallet {watched[2]} sent 1.000 ETH." in result
+
+
+@pytest.mark.asyncio
+async def test_balances_are_batched(node, mock_io_provider):
+    fleet = make_fleet(node, addresses(250), batch_size=100)
+    await fleet._poll()
+
+    batch_sizes = [len(request) for request in node.requests[1:]]
+    assert batch_sizes == [100, 100, 50]
+    assert fleet.request_count == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_address_keeps_previous_balance(node, mock_io_provider):
+    watched = addresses(2)
+    fleet = make_fleet(node, watched)
+    await fleet._poll()
+
+    node.block_number += 1
+    node.failing.add(watched[0])
+    node.balances[watched[0]] += WEI_PER_ETH
+
+    assert await fleet._poll() == []
+    assert fleet.balances[watched[0]] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_keeps_changes_for_retry(node, mock_io_provider):
+    watched = addresses(4)
+    fleet = make_fleet(node, watched, batch_size=2)
+    await fleet._poll()
+    node.requests.clear()
+
+    node.block_number += 1
+    node.balances[watched[0]] += WEI_PER_ETH
+    node.balances[watched[3]] += WEI_PER_ETH
+    # the block number and the first batch succeed, the second batch fails
+    node.broken_requests.add(2)
+
+    assert await fleet._poll() == []
+    assert fleet.block_number == 100
+    assert fleet.balances[watched[0]] == 0
+
+    node.broken_requests.clear()
+    changes = await fleet._poll()
+    assert changes == [(watched[0], 1.0), (watched[3], 1.0)]
+
+
+@pytest.mark.asyncio
+async def test_unreachable_node(mock_io_provider):
+    fleet = WalletEthereumFleet(
+        SensorConfig(rpc_url="http://127.0.0.1:1", addresses=["0xA"], rpc_timeout=1)
+    )
+    assert await fleet._poll() == []
@@ -1,9 +1,16 @@
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import numpy as np
 import pytest
 
 from inputs.plugins.webcam_to_face_emotion import FaceEmotionCapture, Message
+from providers.face_emotion_provider import EMOTION_LABELS, Face
+
+
+def make_face(emotion):
+    probabilities = np.full(len(EMOTION_LABELS), 0.05)
+    probabilities[EMOTION_LABELS.index(emotion)] = 0.7
+    return Face((10, 10, 50, 50), probabilities)
 
 
 @pytest.fixture
@@ -19,25 +26,26 @@ def mock_cv2():
 
 
 @pytest.fixture
-def mock_deepface():
-    with patch("inputs.plugins.webcam_to_face_emotion.DeepFace") as mock:
-        mock.analyze.return_value = [{"dominant_emotion": "happy"}]
-        yield mock
+def mock_analyzer():
+    with patch("inputs.plugins.webcam_to_face_emotion.FaceEmotionProvider") as mock:
+        mock_instance = Mock()
+        mock_instance.analyze = AsyncMock(return_value=[make_face("happy")])
+        mock.return_value = mock_instance
+        yield mock_instance
 
 
 @pytest.fixture
 def mock_io_provider():
-    with patch("inputs.plugins.webcam_to_face_emotion.IOProvider") as mock:
+    with patch("inputs.base.buffered_input.IOProvider") as mock:
         mock_instance = Mock()
         mock.return_value = mock_instance
         yield mock_instance
 
 
 @pytest.fixture
-def face_emotion(mock_cv2, mock_io_provider, mock_deepface):
+def face_emotion(mock_cv2, mock_io_provider, mock_analyzer):
     with patch("inputs.plugins.webcam_to_face_emotion.check_webcam", return_value=True):
         instance = FaceEmotionCapture()
-        instance.face_cascade.detectMultiScale = Mock(return_value=[(10, 10, 50, 50)])
         instance.have_cam = True
         mock_cap = Mock()
         mock_cap.read.return_value = (True, np.zeros((100, 100, 3)))
@@ -45,13 +53,19 @@ def face_emotion(mock_cv2, mock_io_provider, mock_deepface):
         return instance
 
 
-def test_init(face_emotion, mock_cv2):
-    assert isinstance(face_emotion.messages, list)
+def test_init(face_emotion, mock_cv2, mock_analyzer):
+    assert len(face_emotion.messages) == 0
     assert face_emotion.emotion == ""
-    mock_cv2.CascadeClassifier.assert_called_once()
+    assert face_emotion.analyzer is mock_analyzer
     mock_cv2.VideoCapture.assert_called_once_with(0)
 
 
+def test_warm_up(face_emotion, mock_analyzer):
+    assert face_emotion.ready is False
+    face_emotion.warm_up()
+    mock_analyzer.load.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_poll(face_emotion):
     face_emotion.cap.read.return_value = (True, np.zeros((100, 100, 3)))
@@ -61,32 +75,57 @@ async def test_poll(face_emotion):
 
 
 @pytest.mark.asyncio
-async def test_raw_to_text_with_face(face_emotion, mock_cv2, mock_deepface):
+async def test_raw_to_text_with_face(face_emotion, mock_cv2, mock_analyzer):
     frame = np.zeros((100, 100, 3), dtype=np.uint8)
-    face_emotion.face_cascade.detectMultiScale.return_value = [(10, 10, 50, 50)]
 
     result = await face_emotion._raw_to_text(frame)
 
     assert isinstance(result, Message)
     assert "happy" in result.message
-    mock_deepface.analyze.assert_called_once()
+    mock_analyzer.analyze.assert_awaited_once_with(frame, face_emotion.face_tracker)
 
 
 @pytest.mark.asyncio
-async def test_raw_to_text_no_face(face_emotion, mock_cv2, mock_deepface):
+async def test_raw_to_text_no_face(face_emotion, mock_cv2, mock_analyzer):
     frame = np.zeros((100, 100, 3), dtype=np.uint8)
-    face_emotion.face_cascade.detectMultiScale.return_value = []
+    mock_analyzer.analyze.return_value = []
 
     result = await face_emotion._raw_to_text(frame)
 
     assert isinstance(result, Message)
-    mock_deepface.analyze.assert_not_called()
+    assert "do not see anyone" in result.message
+
+
+@pytest.mark.asyncio
+async def test_emotion_is_cleared_when_the_person_leaves(face_emotion, mock_analyzer):
+    await face_emotion._raw_to_text(np.zeros((100, 100, 3), dtype=np.uint8))
+    assert face_emotion.emotion == "happy"
+
+    mock_analyzer.analyze.return_value = []
+    result = await face_emotion._raw_to_text(np.full((100, 100, 3), 255, np.uint8))
+
+    assert face_emotion.emotion == ""
+    assert "do not see anyone" in result.message
 
 
 @pytest.mark.asyncio
-async def test_raw_to_text_buffer_management(face_emotion, mock_deepface):
+async def test_raw_to_text_with_several_faces(face_emotion, mock_analyzer):
+    mock_analyzer.analyze.return_value = [
+        make_face("happy"),
+        make_face("sad"),
+        make_face("neutral"),
+    ]
+
+    result = await face_emotion._raw_to_text(np.zeros((100, 100, 3), dtype=np.uint8))
+
+    assert result.message == (
+        "I see 3 people. Their emotions are happy, sad and neutral."
+    )
+
+
+@pytest.mark.asyncio
+async def test_raw_to_text_buffer_management(face_emotion, mock_analyzer):
     frame = np.zeros((100, 100, 3), dtype=np.uint8)
-    mock_deepface.analyze.return_value = [{"dominant_emotion": "happy"}]
 
     await face_emotion.raw_to_text(frame)
     assert len(face_emotion.messages) == 1
@@ -94,6 +133,55 @@ async def test_raw_to_text_buffer_management(face_emotion, mock_deepface):
     assert "happy" in face_emotion.messages[0].message
 
 
+@pytest.mark.asyncio
+async def test_unchanged_scene_reuses_result(face_emotion, mock_analyzer):
+    frame = np.zeros((100, 100, 3), dtype=np.uint8)
+
+    first = await face_emotion._raw_to_text(frame)
+    second = await face_emotion._raw_to_text(frame)
+
+    assert second.message == first.message
+    mock_analyzer.analyze.assert_awaited_once()
+    assert face_emotion.scene_gate.skipped == 1
+
+
+@pytest.mark.asyncio
+async def test_person_who_left_a_static_scene_is_forgotten(face_emotion, mock_analyzer):
+    face_box = [(10, 10, 40, 40)]
+
+    async def analyze(frame, tracker):
+        boxes = face_box if frame.any() else []
+        pending = tracker.update(boxes, [np.zeros((48, 48), np.uint8)] * len(boxes))
+        tracker.classified(pending, [make_face("happy").probabilities] * len(pending))
+        return tracker.visible()
+
+    mock_analyzer.analyze.side_effect = analyze
+    face = np.full((100, 100, 3), 255, np.uint8)
+    empty = np.zeros((100, 100, 3), np.uint8)
+
+    clock = [1000.0]
+    with patch("time.time", side_effect=lambda: clock[0]):
+        result = await face_emotion._raw_to_text(face)
+        assert "happy" in result.message
+
+        # the person leaves, then the camera looks at a static background
+        clock[0] += 0.5
+        result = await face_emotion._raw_to_text(empty)
+        assert "happy" in result.message
+
+        messages = []
+        with patch.object(
+            face_emotion.scene_gate, "should_process", return_value=False
+        ):
+            for _ in range(6):
+                clock[0] += 0.5
+                messages.append((await face_emotion._raw_to_text(empty)).message)
+
+    assert "do not see anyone" in messages[-1]
+    assert face_emotion.emotion == ""
+    assert mock_analyzer.analyze.await_count < 8
+
+
 def test_formatted_latest_buffer_with_message(face_emotion):
     test_message = Message(timestamp=123.456, message="test emotion")
     face_emotion.messages = [test_message]
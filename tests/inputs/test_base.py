@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+import pytest
+
+from inputs.base import SensorConfig
+from inputs.base.loop import FuserInput
+
+
+class MockInput(FuserInput[str]):
+    def __init__(self, config: SensorConfig = SensorConfig()):
+        super().__init__(config)
+        self.warm_up_thread = None
+
+    async def _poll(self) -> str:
+        await asyncio.sleep(0.01)
+        return "event"
+
+
+class SlowWarmUpInput(MockInput):
+    def warm_up(self) -> None:
+        self.warm_up_thread = threading.current_thread()
+        threading.Event().wait(0.2)
+
+
+class FailingWarmUpInput(MockInput):
+    def warm_up(self) -> None:
+        raise RuntimeError("model missing")
+
+
+async def first_event(sensor):
+    async for event in sensor.listen():
+        return event
+
+
+def test_sensor_not_ready_before_listen():
+    assert MockInput().ready is False
+
+
+@pytest.mark.asyncio
+async def test_listen_without_warm_up():
+    sensor = MockInput()
+    assert await first_event(sensor) == "event"
+    assert sensor.ready is True
+
+
+@pytest.mark.asyncio
+async def test_warm_up_runs_off_the_event_loop():
+    sensor = SlowWarmUpInput()
+    listen_task = asyncio.create_task(first_event(sensor))
+
+    # the event loop keeps running while the sensor warms up
+    ticks = 0
+    while not listen_task.done():
+        await asyncio.sleep(0.01)
+        ticks += 1
+
+    assert await listen_task == "event"
+    assert ticks >= 10
+    assert sensor.ready is True
+    assert sensor.warm_up_thread is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_yields_nothing():
+    sensor = FailingWarmUpInput()
+    assert await first_event(sensor) is None
+    assert sensor.ready is False
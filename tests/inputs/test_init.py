@@ -1,8 +1,10 @@
+import ast
+import os
 from unittest.mock import Mock, patch
 
 import pytest
 
-from inputs import load_input
+from inputs import INPUT_PLUGINS, load_input
 from inputs.base import Sensor
 
 
@@ -82,3 +84,37 @@ def test_load_input_non_input_class():
 
         with pytest.raises(ValueError, match="Input type NonInput not found"):
             load_input("NonInput")
+
+
+def test_load_input_registry_imports_only_plugin_module():
+    with (
+        patch.dict("inputs.INPUT_PLUGINS", {"MockInput": "mock_input"}),
+        patch("os.listdir") as mock_listdir,
+        patch("importlib.import_module") as mock_import,
+    ):
+        mock_module = Mock()
+        mock_module.MockInput = MockInput
+        mock_import.return_value = mock_module
+
+        result = load_input("MockInput")
+
+        mock_import.assert_called_once_with("inputs.plugins.mock_input")
+        mock_listdir.assert_not_called()
+        assert result == MockInput
+
+
+def test_input_registry_matches_plugins():
+    plugins_dir = os.path.join("src", "inputs", "plugins")
+    plugin_classes = {}
+    for plugin_file in os.listdir(plugins_dir):
+        if not plugin_file.endswith(".py"):
+            continue
+        with open(os.path.join(plugins_dir, plugin_file)) as f:
+            tree = ast.parse(f.read())
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and any(
+                ast.unparse(base).split("[")[0].endswith("Input") for base in node.bases
+            ):
+                plugin_classes[node.name] = plugin_file[:-3]
+
+    assert INPUT_PLUGINS == plugin_classes
@@ -0,0 +1,67 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from inputs.base import SensorConfig
+from inputs.base.loop import FuserInput
+
+
+class MockPolledInput(FuserInput[int]):
+    poll_interval = 1.0
+    max_poll_interval = 8.0
+
+    def __init__(self, readings, config: SensorConfig = SensorConfig()):
+        super().__init__(config)
+        self.readings = iter(readings)
+
+    async def _poll(self) -> int:
+        return next(self.readings)
+
+
+async def collect_sleeps(sensor, count):
+    with patch("inputs.base.loop.asyncio.sleep", new_callable=AsyncMock) as sleep:
+        loop = sensor._listen_loop()
+        for _ in range(count):
+            await loop.__anext__()
+    return [call.args[0] for call in sleep.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_backoff_while_unchanged():
+    sensor = MockPolledInput([1, 1, 1, 1, 1, 1])
+    sleeps = await collect_sleeps(sensor, 6)
+    assert sleeps == [1.0, 1.0, 2.0, 4.0, 8.0, 8.0]
+    assert sensor.current_poll_interval == 8.0
+
+
+@pytest.mark.asyncio
+async def test_snap_back_on_change():
+    sensor = MockPolledInput([1, 1, 1, 2, 2])
+    sleeps = await collect_sleeps(sensor, 5)
+    assert sleeps == [1.0, 1.0, 2.0, 4.0, 1.0]
+    assert sensor.current_poll_interval == 2.0
+
+
+@pytest.mark.asyncio
+async def test_fixed_interval_without_max():
+    sensor = MockPolledInput([1, 1, 1], SensorConfig(max_poll_interval=None))
+    sleeps = await collect_sleeps(sensor, 3)
+    assert sleeps == [1.0, 1.0, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_bounds_from_config():
+    sensor = MockPolledInput(
+        [1, 1, 1, 1],
+        SensorConfig(poll_interval=0.5, max_poll_interval=3.0, poll_backoff=3.0),
+    )
+    sleeps = await collect_sleeps(sensor, 4)
+    assert sleeps == [0.5, 0.5, 1.5, 3.0]
+
+
+@pytest.mark.asyncio
+async def test_no_pacing_without_poll_interval():
+    sensor = MockPolledInput([1, 1], SensorConfig(poll_interval=None))
+    sleeps = await collect_sleeps(sensor, 2)
+    assert sleeps == []
+    assert sensor.current_poll_interval is None
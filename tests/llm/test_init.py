@@ -1,9 +1,11 @@
+import ast
+import os
 from unittest.mock import Mock, patch
 
 import pytest
 from pydantic import BaseModel
 
-from llm import LLM, LLMConfig, load_llm
+from llm import LLM, LLM_PLUGINS, LLMConfig, load_llm
 from providers.io_provider import IOProvider
 
 
@@ -70,3 +72,37 @@ def test_load_llm_not_found():
 
         with pytest.raises(ValueError, match="LLM type NonexistentLLM not found"):
             load_llm("NonexistentLLM")
+
+
+def test_load_llm_registry_imports_only_plugin_module():
+    with (
+        patch.dict("llm.LLM_PLUGINS", {"MockLLM": "mock_llm"}),
+        patch("os.listdir") as mock_listdir,
+        patch("importlib.import_module") as mock_import,
+    ):
+        mock_module = Mock()
+        mock_module.MockLLM = MockLLM
+        mock_import.return_value = mock_module
+
+        result = load_llm("MockLLM")
+
+        mock_import.assert_called_once_with("llm.plugins.mock_llm")
+        mock_listdir.assert_not_called()
+        assert result == MockLLM
+
+
+def test_llm_registry_matches_plugins():
+    plugins_dir = os.path.join("src", "llm", "plugins")
+    plugin_classes = {}
+    for plugin_file in os.listdir(plugins_dir):
+        if not plugin_file.endswith(".py"):
+            continue
+        with open(os.path.join(plugins_dir, plugin_file)) as f:
+            tree = ast.parse(f.read())
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and any(
+                ast.unparse(base).startswith("LLM") for base in node.bases
+            ):
+                plugin_classes[node.name] = plugin_file[:-3]
+
+    assert LLM_PLUGINS == plugin_classes
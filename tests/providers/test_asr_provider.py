@@ -1,8 +1,10 @@
+import time
 from unittest.mock import Mock, patch
 
 import pytest
 
 from providers.asr_provider import ASRProvider
+from providers.singleton import singleton
 
 
 @pytest.fixture
@@ -12,7 +14,7 @@ def ws_url():
 
 @pytest.fixture(autouse=True)
 def reset_singleton():
-    ASRProvider._instance = None
+    singleton.instances = {}
     yield
 
 
@@ -46,7 +48,33 @@ def test_register_message_callback(ws_url, mock_dependencies):
     callback = Mock()
     provider.register_message_callback(callback)
 
-    provider.ws_client.register_message_callback.assert_called_once_with(callback)
+    provider.ws_client.register_message_callback.assert_called_once_with(
+        provider._handle_message
+    )
+    provider._handle_message('{"asr_reply": "hello"}')
+    callback.assert_called_once_with('{"asr_reply": "hello"}')
+
+
+def test_encoding_answer_is_not_forwarded(ws_url, mock_dependencies):
+    provider = ASRProvider(ws_url, audio_encoding="mulaw")
+    callback = Mock()
+    provider.register_message_callback(callback)
+
+    provider._handle_message('{"audio_encoding": {"accept": "mulaw"}}')
+    callback.assert_not_called()
+    assert provider.encoder.accepted == "mulaw"
+
+
+def test_encoding_offers_are_limited(ws_url, mock_dependencies):
+    provider = ASRProvider(ws_url, audio_encoding="mulaw")
+    provider.offer_interval = 0
+
+    for _ in range(5):
+        provider._offer_encoding()
+
+    offers = provider.ws_client.send_message.call_args_list
+    assert len(offers) == provider.max_offers
+    assert "audio_encoding" in offers[0].args[0]
 
 
 def test_start(ws_url, mock_dependencies):
@@ -78,3 +106,83 @@ def test_stop(ws_url, mock_dependencies):
     provider.audio_stream.stop.assert_called_once()
     provider.ws_client.stop.assert_called_once()
     assert not provider._thread.is_alive()
+
+
+def test_vad_gates_audio_stream(ws_url, mock_dependencies):
+    _, mock_audio_stream = mock_dependencies
+    provider = ASRProvider(ws_url, audio_encoding="mulaw")
+
+    callback = mock_audio_stream.call_args.kwargs["audio_data_callback"]
+    assert callback is provider.vad
+    assert provider.vad.send is provider.encoder
+    assert provider.vad.pass_decoded
+    assert provider.encoder.send is provider.ws_client.send_message
+
+
+def test_no_encoding_by_default(ws_url, mock_dependencies):
+    _, mock_audio_stream = mock_dependencies
+    provider = ASRProvider(ws_url)
+
+    assert provider.encoder is None
+    assert provider.vad.send is provider.ws_client.send_message
+    assert not provider.vad.pass_decoded
+
+
+def test_encoding_is_offered_once_connected(ws_url, mock_dependencies):
+    provider = ASRProvider(ws_url, audio_encoding="mulaw")
+    provider.ws_client.is_connected.return_value = False
+    provider.start()
+    try:
+        time.sleep(0.25)
+        provider.ws_client.send_message.assert_not_called()
+
+        provider.ws_client.is_connected.return_value = True
+        deadline = time.time() + 1.0
+        while not provider.ws_client.send_message.called:
+            assert time.time() < deadline
+            time.sleep(0.01)
+        assert "audio_encoding" in provider.ws_client.send_message.call_args.args[0]
+    finally:
+        provider.stop()
+
+
+def test_encoding_is_offered_without_connection_state(ws_url, mock_dependencies):
+    mock_ws_client, _ = mock_dependencies
+    mock_ws_client.return_value = Mock(
+        spec=["start", "stop", "send_message", "register_message_callback"]
+    )
+    provider = ASRProvider(ws_url, audio_encoding="mulaw")
+    provider.offer_interval = 0.05
+    provider.start()
+    try:
+        deadline = time.time() + 1.0
+        while provider.ws_client.send_message.call_count <= provider.max_offers:
+            assert time.time() < deadline
+            time.sleep(0.01)
+        assert "audio_encoding" in provider.ws_client.send_message.call_args.args[0]
+
+        provider._handle_message('{"audio_encoding": {"accept": "mulaw"}}')
+        time.sleep(0.15)
+        sent = provider.ws_client.send_message.call_count
+        time.sleep(0.15)
+        assert provider.ws_client.send_message.call_count == sent
+    finally:
+        provider.stop()
+
+
+def test_vad_disabled(ws_url, mock_dependencies):
+    _, mock_audio_stream = mock_dependencies
+    provider = ASRProvider(ws_url, vad=False, audio_encoding=None)
+
+    assert provider.vad is None
+    assert provider.encoder is None
+    callback = mock_audio_stream.call_args.kwargs["audio_data_callback"]
+    assert callback is provider.ws_client.send_message
+
+
+def test_register_speech_end_callback(ws_url, mock_dependencies):
+    provider = ASRProvider(ws_url)
+    callback = Mock()
+    provider.register_speech_end_callback(callback)
+
+    assert provider.vad.on_speech_end is callback
@@ -0,0 +1,324 @@
+import base64
+import json
+import os
+import threading
+import time
+import warnings
+import wave
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.client import connect
+from websockets.sync.server import serve
+
+from providers.asr_provider import ASRProvider
+from providers.audio_encoder import (
+    AudioEncoder,
+    _Decimator,
+    decode_audio_chunk,
+    mulaw_decode,
+    mulaw_encode,
+)
+from providers.singleton import singleton
+
+AUDIO_DIR = os.path.join(os.path.dirname(__file__), "audio")
+
+
+def as_messages(name, chunk_samples=320):
+    with wave.open(os.path.join(AUDIO_DIR, name), "rb") as wav:
+        rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    size = chunk_samples * 2
+    return [
+        json.dumps(
+            {"audio": base64.b64encode(frames[i : i + size]).decode(), "rate": rate}
+        )
+        for i in range(0, len(frames), size)
+    ]
+
+
+class ASRStandIn:
+    """Local ASR websocket service that answers encoding offers."""
+
+    def __init__(self, supported=("mulaw", "pcm16")):
+        self.supported = supported
+        self.offers = []
+        self.audio_messages = []
+        self.samples = []
+        self.bytes_received = 0
+        self.server = serve(self.handler, "127.0.0.1", 0)
+        self.url = f"ws://127.0.0.1:{self.server.socket.getsockname()[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def handler(self, ws):
+        try:
+            for raw_message in ws:
+                self.bytes_received += len(raw_message)
+                message = json.loads(raw_message)
+                if "audio_encoding" in message:
+                    self.offers.append(message["audio_encoding"])
+                    if self.supported:
+                        offered = message["audio_encoding"]["offer"]
+                        accept = next(
+                            (e for e in offered if e in self.supported), "pcm16"
+                        )
+                        ws.send(json.dumps({"audio_encoding": {"accept": accept}}))
+                elif "audio" in message:
+                    self.audio_messages.append(message)
+                    data = base64.b64decode(message["audio"])
+                    if message.get("encoding") == "mulaw":
+                        self.samples.append(mulaw_decode(data))
+                    else:
+                        self.samples.append(np.frombuffer(data, dtype=np.int16))
+        except ConnectionClosed:
+            pass
+
+    def close(self):
+        self.server.shutdown()
+
+
+class ThreadedClient:
+    """Websocket client with the interface of om1_utils.ws.Client."""
+
+    def __init__(self, url):
+        self.url = url
+        self.callback = None
+        self.connection = None
+        self.connected = threading.Event()
+
+    def is_connected(self):
+        return self.connected.is_set()
+
+    def register_message_callback(self, callback):
+        self.callback = callback
+
+    def start(self):
+        self.connection = connect(self.url)
+        self.connected.set()
+        threading.Thread(target=self._receive, daemon=True).start()
+
+    def _receive(self):
+        try:
+            for raw_message in self.connection:
+                if self.callback:
+                    self.callback(raw_message)
+        except ConnectionClosed:
+            pass
+
+    def send_message(self, message):
+        self.connection.send(message)
+
+    def stop(self):
+        self.connected.clear()
+        self.connection.close()
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture(autouse=True)
+def reset_singleton():
+    singleton.instances = {}
+    yield
+
+
+@pytest.fixture
+def make_provider():
+    providers = []
+
+    def factory(url, **kwargs):
+        with (
+            patch("providers.asr_provider.ws.Client", ThreadedClient),
+            patch("providers.asr_provider.AudioInputStream") as audio_stream,
+        ):
+            provider = ASRProvider(url, **{"vad": False, **kwargs})
+        provider.start()
+        providers.append(provider)
+        return provider, audio_stream.call_args.kwargs["audio_data_callback"]
+
+    yield factory
+    for provider in providers:
+        provider.stop()
+
+
+def test_mulaw_matches_reference():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        audioop = pytest.importorskip("audioop")
+
+    samples = np.arange(-32768, 32768, dtype=np.int16)
+    encoded = mulaw_encode(samples)
+    assert encoded == audioop.lin2ulaw(samples.tobytes(), 2)
+    decoded = np.frombuffer(audioop.ulaw2lin(encoded, 2), dtype=np.int16)
+    assert np.array_equal(mulaw_decode(encoded), decoded)
+
+
+def test_mulaw_round_trip_quality():
+    with wave.open(os.path.join(AUDIO_DIR, "utterance.wav"), "rb") as wav:
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    decoded = mulaw_decode(mulaw_encode(samples))
+
+    signal = np.mean(samples.astype(np.float64) ** 2)
+    noise = np.mean((samples.astype(np.float64) - decoded) ** 2)
+    assert 10 * np.log10(signal / noise) > 30
+
+
+def test_decimator_is_continuous_across_chunks():
+    t = np.arange(48000) / 48000
+    samples = (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+
+    whole = _Decimator(3)(samples)
+    decimator = _Decimator(3)
+    chunked = np.concatenate(
+        [decimator(samples[i : i + 1000]) for i in range(0, len(samples), 1000)]
+    )
+    assert len(whole) == 16000
+    assert np.array_equal(whole, chunked)
+
+
+def test_chunks_pass_through_until_accepted():
+    sent = []
+    encoder = AudioEncoder(sent.append, encoding="mulaw")
+    message = as_messages("utterance.wav")[0]
+
+    encoder(message)
+    assert sent == [message]
+
+    assert encoder.handle_reply('{"asr_reply": "hi"}') is False
+    assert encoder.handle_reply('{"audio_encoding": {"accept": "mulaw"}}') is True
+    encoder(message)
+    encoded = json.loads(sent[1])
+    assert encoded["encoding"] == "mulaw"
+    assert len(base64.b64decode(encoded["audio"])) == 320
+    assert decode_audio_chunk(sent[1], 16000) is None
+
+
+def test_rejected_offer_keeps_raw_stream():
+    sent = []
+    encoder = AudioEncoder(sent.append, encoding="mulaw", target_rate=8000)
+    encoder.handle_reply('{"audio_encoding": {"accept": "opus"}}')
+    message = as_messages("utterance.wav")[0]
+
+    encoder(message)
+    assert encoder.accepted == "pcm16"
+    assert sent == [message]
+
+
+def test_bytes_in_counts_decoded_audio():
+    sent = []
+    encoder = AudioEncoder(sent.append, encoding="mulaw")
+    encoder.handle_reply('{"audio_encoding": {"accept": "mulaw"}}')
+    message = as_messages("utterance.wav")[0]
+
+    encoder(json.loads(message))
+    assert encoder.bytes_in == 640
+
+
+def test_decoded_chunk_is_not_decoded_again():
+    sent = []
+    encoder = AudioEncoder(sent.append, encoding="mulaw")
+    encoder.handle_reply('{"audio_encoding": {"accept": "mulaw"}}')
+    message = as_messages("utterance.wav")[0]
+    decoded = decode_audio_chunk(message, 16000)
+
+    with patch("providers.audio_encoder.decode_audio_chunk") as decode:
+        encoder(message, decoded)
+    decode.assert_not_called()
+    assert json.loads(sent[0])["encoding"] == "mulaw"
+
+
+def test_reset_forgets_the_answer():
+    sent = []
+    encoder = AudioEncoder(sent.append, encoding="pcm16", target_rate=8000)
+    encoder.handle_reply('{"audio_encoding": {"accept": "opus"}}')
+    assert encoder.target_rate is None
+
+    encoder.reset()
+    assert encoder.accepted is None
+    assert encoder.target_rate == 8000
+
+
+def test_downsampling():
+    sent = []
+    encoder = AudioEncoder(sent.append, encoding="pcm16", target_rate=8000)
+    encoder.handle_reply('{"audio_encoding": {"accept": "pcm16"}}')
+    encoder(as_messages("utterance.wav")[40])
+
+    encoded = json.loads(sent[0])
+    assert encoded["rate"] == 8000
+    assert len(base64.b64decode(encoded["audio"])) == 320
+
+
+def test_uplink_negotiates_mulaw(make_provider):
+    server = ASRStandIn()
+    try:
+        provider, audio_callback = make_provider(server.url, audio_encoding="mulaw")
+        wait_until(lambda: provider.encoder.accepted == "mulaw")
+        assert server.offers == [{"offer": ["mulaw"], "rate": None}]
+
+        messages = as_messages("utterance.wav")
+        raw_bytes = sum(len(message) for message in messages)
+        server.bytes_received = 0
+        for message in messages:
+            audio_callback(message)
+        wait_until(lambda: len(server.audio_messages) == len(messages))
+
+        assert all(m["encoding"] == "mulaw" for m in server.audio_messages)
+        assert server.bytes_received < 0.6 * raw_bytes
+        assert sum(len(samples) for samples in server.samples) == 320 * len(messages)
+    finally:
+        server.close()
+
+
+def test_uplink_without_negotiation_stays_raw(make_provider):
+    server = ASRStandIn(supported=())
+    try:
+        provider, audio_callback = make_provider(server.url, audio_encoding="mulaw")
+        provider.offer_interval = 0.05
+        wait_until(lambda: provider._offers_sent > provider.max_offers)
+        assert len(server.offers) == provider.max_offers
+
+        messages = as_messages("utterance.wav")[:5]
+        for message in messages:
+            audio_callback(message)
+        wait_until(lambda: len(server.audio_messages) == len(messages))
+        assert all("encoding" not in m for m in server.audio_messages)
+    finally:
+        server.close()
+
+
+def test_uplink_is_raw_by_default(make_provider):
+    server = ASRStandIn()
+    try:
+        provider, audio_callback = make_provider(server.url)
+        assert provider.encoder is None
+
+        messages = as_messages("utterance.wav")[:5]
+        for message in messages:
+            audio_callback(message)
+        wait_until(lambda: len(server.audio_messages) == len(messages))
+        assert server.offers == []
+        assert all("encoding" not in m for m in server.audio_messages)
+    finally:
+        server.close()
+
+
+def test_encoding_is_offered_again_after_reconnecting(make_provider):
+    server = ASRStandIn()
+    try:
+        provider, _ = make_provider(server.url, audio_encoding="mulaw")
+        wait_until(lambda: provider.encoder.accepted == "mulaw")
+
+        provider.ws_client.stop()
+        wait_until(lambda: not provider._connected)
+        provider.ws_client.start()
+        wait_until(lambda: len(server.offers) == 2)
+        wait_until(lambda: provider.encoder.accepted == "mulaw")
+    finally:
+        server.close()
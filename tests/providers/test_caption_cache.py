@@ -0,0 +1,103 @@
+import cv2
+import numpy as np
+import pytest
+
+from providers.caption_cache import CaptionCache, frame_signature
+
+
+def scene(seed=0):
+    """Smooth random scene, like a shrunk camera view."""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (60, 80, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (9, 9), 0)
+
+
+def with_noise(image, seed=1):
+    rng = np.random.default_rng(seed)
+    return np.clip(image + rng.normal(0, 2, image.shape), 0, 255).astype(np.uint8)
+
+
+def test_similar_frames_hit():
+    cache = CaptionCache("test")
+    cache.store(frame_signature(scene()), "a kitchen", now=0.0)
+
+    assert cache.lookup(frame_signature(with_noise(scene())), now=1.0) == "a kitchen"
+    assert cache.lookup(frame_signature(scene(seed=5)), now=1.0) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+
+def test_same_structure_in_other_colors_misses():
+    cache = CaptionCache("test")
+    image = scene()
+    cache.store(frame_signature(image), "a red corridor", now=0.0)
+
+    # same layout, color channels swapped
+    assert cache.lookup(frame_signature(image[:, :, ::-1].copy()), now=1.0) is None
+
+
+def test_closest_entry_wins():
+    cache = CaptionCache("test", max_histogram_distance=1.0)
+    image = scene()
+    cache.store(frame_signature(cv2.convertScaleAbs(image, alpha=0.8)), "dim", now=0)
+    cache.store(frame_signature(image), "bright", now=0)
+
+    assert cache.lookup(frame_signature(with_noise(image)), now=1.0) == "bright"
+
+
+def test_old_entries_expire():
+    cache = CaptionCache("test", max_age=60.0)
+    cache.store(frame_signature(scene()), "a kitchen", now=0.0)
+
+    assert cache.lookup(frame_signature(scene()), now=59.0) == "a kitchen"
+    assert cache.lookup(frame_signature(scene()), now=61.0) is None
+    assert cache.expired == 1
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = CaptionCache("test", max_entries=2)
+    cache.store(frame_signature(scene(1)), "one", now=0.0)
+    cache.store(frame_signature(scene(2)), "two", now=0.0)
+    assert cache.lookup(frame_signature(scene(1)), now=1.0) == "one"
+
+    cache.store(frame_signature(scene(3)), "three", now=2.0)
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.lookup(frame_signature(scene(2)), now=3.0) is None
+    assert cache.lookup(frame_signature(scene(1)), now=3.0) == "one"
+    assert cache.lookup(frame_signature(scene(3)), now=3.0) == "three"
+
+
+def test_cache_survives_restarts(tmp_path):
+    path = str(tmp_path / "cache" / "captions.json")
+    cache = CaptionCache("test", path=path, save_every=2)
+    cache.store(frame_signature(scene(1)), {"caption": "one"}, now=0.0)
+    cache.store(frame_signature(scene(2)), {"caption": "two"}, now=0.0)
+
+    restored = CaptionCache("test", path=path)
+
+    assert len(restored) == 2
+    assert restored.lookup(frame_signature(scene(2)), now=1.0) == {"caption": "two"}
+
+
+def test_unreadable_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "captions.json"
+    path.write_text("not json")
+
+    cache = CaptionCache("test", path=str(path))
+
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("size", [10, 5000])
+def test_lookup_scales_to_large_caches(size):
+    cache = CaptionCache("test", max_entries=size)
+    rng = np.random.default_rng(0)
+    for i in range(size):
+        signature = frame_signature(scene(100 + i % 50))
+        cache.store(signature._replace(phash=int(rng.integers(0, 2**63))), i, now=0)
+    cache.store(frame_signature(scene()), "target", now=0.0)
+
+    assert cache.lookup(frame_signature(scene()), now=1.0) == "target"
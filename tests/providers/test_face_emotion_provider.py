@@ -0,0 +1,148 @@
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from inputs.base.face_tracker import FaceTracker
+from providers.face_emotion_provider import (
+    EMOTION_LABELS,
+    STAGES,
+    FaceEmotionProvider,
+    dominant_emotion,
+)
+from providers.singleton import singleton
+
+
+@pytest.fixture(autouse=True)
+def reset_singleton():
+    singleton.instances = {}
+    yield
+
+
+def emotion_model(emotion="happy"):
+    """
+    Stand-in for the keras emotion model, scoring every crop as emotion.
+    """
+
+    def forward(batch, training=False):
+        scores = np.full((len(batch), len(EMOTION_LABELS)), 1.0, dtype=np.float32)
+        scores[:, EMOTION_LABELS.index(emotion)] = 4.0
+        return scores
+
+    return Mock(side_effect=forward)
+
+
+@pytest.fixture(autouse=True)
+def face_cascade():
+    with patch(
+        "providers.face_emotion_provider.cv2.CascadeClassifier", create=True
+    ) as mock:
+        mock.return_value.detectMultiScale.return_value = []
+        yield mock.return_value
+
+
+@pytest.fixture
+def mock_deepface():
+    with patch("providers.face_emotion_provider.DeepFace") as mock:
+        mock.build_model.return_value.model = emotion_model()
+        yield mock
+
+
+@pytest.fixture
+def provider(mock_deepface):
+    provider = FaceEmotionProvider(detection_width=320)
+    provider.load()
+    provider.model.reset_mock()
+    return provider
+
+
+def test_load_builds_model_once(mock_deepface):
+    provider = FaceEmotionProvider()
+    provider.load()
+    provider.load()
+
+    mock_deepface.build_model.assert_called_once_with(
+        task="facial_attribute", model_name="Emotion"
+    )
+    # the dummy inference of the first load
+    provider.model.assert_called_once()
+
+
+def test_faces_of_a_frame_are_classified_in_one_batch(provider, face_cascade):
+    face_cascade.detectMultiScale.return_value = [
+        (10, 10, 20, 20),
+        (100, 20, 30, 30),
+        (200, 40, 25, 25),
+    ]
+    frame = np.random.default_rng(0).integers(0, 256, (240, 320, 3), dtype=np.uint8)
+
+    faces = provider.analyze_frame(frame)
+
+    assert len(faces) == 3
+    provider.model.assert_called_once()
+    batch = provider.model.call_args.args[0]
+    assert batch.shape == (3, 48, 48, 1)
+    assert batch.dtype == np.float32 and batch.max() <= 1.0
+    for face in faces:
+        assert face.probabilities.sum() == pytest.approx(1.0)
+        assert dominant_emotion(face.probabilities) == "happy"
+
+
+def test_no_face_skips_the_model(provider, face_cascade):
+    face_cascade.detectMultiScale.return_value = []
+
+    assert provider.analyze_frame(np.zeros((240, 320, 3), dtype=np.uint8)) == []
+    provider.model.assert_not_called()
+
+
+def test_detection_runs_on_a_shrunk_frame(provider, face_cascade):
+    face_cascade.detectMultiScale.return_value = [(40, 30, 20, 20)]
+
+    faces = provider.analyze_frame(np.zeros((960, 1280, 3), dtype=np.uint8))
+
+    detected_on = face_cascade.detectMultiScale.call_args.args[0]
+    assert detected_on.shape == (240, 320)
+    # boxes are scaled back to frame pixels
+    assert faces[0].bbox == (160, 120, 80, 80)
+
+
+def test_stage_timings(provider, face_cascade):
+    face_cascade.detectMultiScale.return_value = [(10, 10, 20, 20)]
+
+    provider.analyze_frame(np.zeros((240, 320, 3), dtype=np.uint8))
+    provider.analyze_frame(np.zeros((240, 320, 3), dtype=np.uint8))
+
+    assert provider.frames == 2
+    assert provider.faces == 2
+    milliseconds = provider.stage_milliseconds()
+    assert set(milliseconds) == set(STAGES)
+    assert all(ms >= 0 for ms in milliseconds.values())
+    assert "1.0 faces and 1.0 classifications" in provider.timings_summary()
+
+
+@pytest.mark.asyncio
+async def test_analyze_runs_on_the_worker(provider, face_cascade):
+    face_cascade.detectMultiScale.return_value = [(10, 10, 20, 20)]
+
+    faces = await provider.analyze(np.zeros((240, 320, 3), dtype=np.uint8))
+
+    assert len(faces) == 1
+    assert provider.frames == 1
+
+
+def test_tracked_faces_are_classified_when_needed(provider, face_cascade):
+    face_cascade.detectMultiScale.return_value = [(10, 10, 40, 40), (150, 10, 40, 40)]
+    tracker = FaceTracker(reclassify_every=3)
+    frame = np.random.default_rng(0).integers(0, 256, (240, 320, 3), dtype=np.uint8)
+
+    faces = provider.analyze_frame(frame, tracker)
+    assert [face.track_id for face in faces] == [1, 2]
+    assert provider.model.call_args.args[0].shape[0] == 2
+
+    # the same faces are classified again on every third frame
+    provider.analyze_frame(frame, tracker)
+    provider.analyze_frame(frame, tracker)
+    assert provider.model.call_count == 1
+    provider.analyze_frame(frame, tracker)
+    assert provider.model.call_count == 2
+    assert provider.classified_faces == 4
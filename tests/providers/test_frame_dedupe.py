@@ -0,0 +1,84 @@
+import base64
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+
+from providers.frame_dedupe import (
+    FrameDeduplicator,
+    decode_frame,
+    hamming_distance,
+    perceptual_hash,
+)
+
+
+def scene(seed=0):
+    """Smooth random scene, like a camera view."""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (31, 31), 0)
+
+
+def encode(image):
+    return base64.b64encode(cv2.imencode(".jpg", image)[1]).decode()
+
+
+def with_noise(image, seed=1):
+    rng = np.random.default_rng(seed)
+    return np.clip(image + rng.normal(0, 4, image.shape), 0, 255).astype(np.uint8)
+
+
+def test_decode_frame():
+    assert decode_frame(encode(scene())).shape == (60, 80)
+    assert decode_frame("fake_frame") is None
+    assert decode_frame("") is None
+
+
+def test_hash_is_robust_to_noise_but_not_to_changes():
+    image = scene()
+    reference = perceptual_hash(image)
+
+    assert hamming_distance(reference, perceptual_hash(with_noise(image))) <= 6
+    assert hamming_distance(reference, perceptual_hash(scene(seed=2))) > 16
+    assert hamming_distance(reference, perceptual_hash(np.roll(image, 120, 1))) > 16
+
+
+def test_near_duplicates_are_dropped():
+    dedupe = FrameDeduplicator("test")
+    image = scene()
+
+    assert dedupe.should_send(encode(image))
+    for seed in range(1, 10):
+        assert not dedupe.should_send(encode(with_noise(image, seed)))
+    assert dedupe.should_send(encode(scene(seed=2)))
+
+    assert (dedupe.frames, dedupe.sent, dedupe.dropped) == (11, 2, 9)
+    assert dedupe.savings == 9 / 11
+
+
+def test_static_scene_is_refreshed():
+    dedupe = FrameDeduplicator("test", refresh_interval=5.0)
+    frame = encode(scene())
+
+    with patch("providers.frame_dedupe.time.time", return_value=100.0):
+        assert dedupe.should_send(frame)
+        assert dedupe.last_reason == "first"
+        assert not dedupe.should_send(frame)
+        assert dedupe.last_reason is None
+    with patch("providers.frame_dedupe.time.time", return_value=105.0):
+        assert dedupe.should_send(frame)
+        assert dedupe.last_reason == "refresh"
+        assert dedupe.should_send(encode(scene(seed=2)))
+        assert dedupe.last_reason == "changed"
+
+
+def test_undecodable_frames_are_sent():
+    dedupe = FrameDeduplicator("test")
+    assert dedupe.should_send("fake_frame")
+    assert dedupe.should_send("fake_frame")
+
+
+def test_negative_distance_sends_every_frame():
+    dedupe = FrameDeduplicator("test", max_distance=-1)
+    frame = encode(scene())
+    assert all(dedupe.should_send(frame) for _ in range(3))
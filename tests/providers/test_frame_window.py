@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+from providers.frame_window import LatestFrameWindow
+
+
+class SlowAPI:
+    """Request stand-in whose replies are released by the test."""
+
+    def __init__(self):
+        self.calls = []
+        self.replies = {}
+
+    async def request(self, frame):
+        self.calls.append(frame)
+        self.replies[frame] = asyncio.get_running_loop().create_future()
+        return await self.replies[frame]
+
+    def reply(self, frame, response=None):
+        self.replies[frame].set_result(response or f"reply to {frame}")
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_only_the_newest_frame_waits():
+    api, delivered = SlowAPI(), []
+    window = LatestFrameWindow("test", api.request, delivered.append)
+
+    first = asyncio.create_task(window.submit("f1"))
+    await settle()
+    for frame in ("f2", "f3", "f4"):
+        await window.submit(frame)
+
+    assert api.calls == ["f1"]
+    assert window.queue_depth == 2
+    assert window.dropped == 2
+
+    api.reply("f1")
+    await settle()
+    # the request that finished continues with the parked frame
+    assert api.calls == ["f1", "f4"]
+    api.reply("f4")
+    await first
+
+    assert delivered == ["reply to f1", "reply to f4"]
+    assert (window.frames, window.requests) == (4, 2)
+    assert window.queue_depth == 0
+    assert window.max_queue_depth == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_replies_are_discarded():
+    api, delivered = SlowAPI(), []
+    window = LatestFrameWindow("test", api.request, delivered.append, max_in_flight=2)
+
+    first = asyncio.create_task(window.submit("f1"))
+    second = asyncio.create_task(window.submit("f2"))
+    await settle()
+    assert api.calls == ["f1", "f2"]
+
+    # the newer frame is answered first
+    api.reply("f2")
+    await second
+    api.reply("f1")
+    await first
+
+    assert delivered == ["reply to f2"]
+    assert window.stale == 1
+
+
+@pytest.mark.asyncio
+async def test_sequential_frames_are_all_requested():
+    delivered = []
+
+    async def request(frame):
+        return frame.upper()
+
+    window = LatestFrameWindow("test", request, delivered.append)
+    for frame in ("a", "b", "c"):
+        await window.submit(frame)
+
+    assert delivered == ["A", "B", "C"]
+    assert window.dropped == window.stale == 0
+
+
+@pytest.mark.asyncio
+async def test_empty_replies_are_not_delivered():
+    delivered = []
+
+    async def request(frame):
+        return None
+
+    window = LatestFrameWindow("test", request, delivered.append)
+    await window.submit("a")
+
+    assert delivered == []
+    assert window.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_request_continues_with_the_parked_frame():
+    api, delivered = SlowAPI(), []
+    window = LatestFrameWindow("test", api.request, delivered.append)
+
+    first = asyncio.create_task(window.submit("f1"))
+    await settle()
+    await window.submit("f2")
+
+    api.replies["f1"].set_exception(RuntimeError("connection reset"))
+    await settle()
+    assert api.calls == ["f1", "f2"]
+    api.reply("f2")
+    await first
+
+    assert delivered == ["reply to f2"]
+    assert window.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_drops_the_parked_frame():
+    api, delivered = SlowAPI(), []
+    window = LatestFrameWindow("test", api.request, delivered.append)
+
+    first = asyncio.create_task(window.submit("f1"))
+    await settle()
+    await window.submit("f2")
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert window.queue_depth == 0
+    assert window.dropped == 1
+
+    # the next frame is requested right away
+    second = asyncio.create_task(window.submit("f3"))
+    await settle()
+    assert api.calls == ["f1", "f3"]
+    api.reply("f3")
+    await second
+    assert delivered == ["reply to f3"]
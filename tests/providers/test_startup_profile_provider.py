@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+from providers.startup_profile_provider import ComponentTiming, StartupProfileProvider
+
+
+@pytest.fixture
+def startup_profile():
+    provider = StartupProfileProvider()
+    provider.reset()
+    yield provider
+    provider.reset()
+
+
+def test_record(startup_profile):
+    startup_profile.record("input", "ASRInput", 0.5)
+    assert startup_profile.timings == [ComponentTiming("input", "ASRInput", 0.5)]
+
+
+def test_measure(startup_profile):
+    with startup_profile.measure("llm", "OpenAILLM"):
+        time.sleep(0.05)
+
+    timing = startup_profile.timings[0]
+    assert timing.kind == "llm"
+    assert timing.name == "OpenAILLM"
+    assert timing.seconds >= 0.05
+
+
+def test_measure_records_on_error(startup_profile):
+    with pytest.raises(RuntimeError):
+        with startup_profile.measure("simulator", "WebSim"):
+            raise RuntimeError("boom")
+
+    assert len(startup_profile.timings) == 1
+
+
+def test_reset(startup_profile):
+    startup_profile.record("input", "ASRInput", 0.5)
+    startup_profile.reset()
+    assert startup_profile.timings == []
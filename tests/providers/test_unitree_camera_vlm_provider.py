@@ -1,4 +1,6 @@
 import base64
+import logging
+import queue
 import time
 from unittest.mock import Mock, patch
 
@@ -6,9 +8,15 @@ import cv2
 import numpy as np
 import pytest
 
+from providers.singleton import singleton
 from providers.unitree_camera_vlm_provider import (
+    AdaptiveJpegQuality,
     UnitreeCameraVideoStream,
     UnitreeCameraVLMProvider,
+    UplinkMeter,
+    decode_flag,
+    jpeg_size,
+    target_size,
 )
 
 
@@ -47,7 +55,7 @@ def fps():
 
 @pytest.fixture(autouse=True)
 def reset_singleton():
-    UnitreeCameraVLMProvider._instance = None
+    singleton.instances = {}
     yield
 
 
@@ -131,3 +139,210 @@ def test_vlm_provider_singleton_pattern(mock_video_client, ws_url, fps):
     assert provider1 is provider2
     assert provider1.ws_client is provider2.ws_client
     assert provider1.video_stream is provider2.video_stream
+
+
+def _jpeg(width, height):
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return cv2.imencode(".jpg", img)[1].tobytes()
+
+
+def test_jpeg_size():
+    assert jpeg_size(_jpeg(1280, 720)) == (1280, 720)
+    assert jpeg_size(b"not a jpeg") is None
+    assert jpeg_size(b"\xff\xd8") is None
+
+
+def test_target_size():
+    assert target_size(1280, 720) == (640, 360)
+    assert target_size(600, 800) == (360, 480)
+    assert target_size(320, 240) == (320, 240)
+
+
+def test_decode_flag():
+    assert decode_flag(1280, 720, (640, 360)) == cv2.IMREAD_REDUCED_COLOR_2
+    assert decode_flag(2560, 1440, (640, 360)) == cv2.IMREAD_REDUCED_COLOR_4
+    assert decode_flag(1600, 1200, (640, 480)) == cv2.IMREAD_REDUCED_COLOR_2
+    assert decode_flag(800, 600, (640, 480)) == cv2.IMREAD_COLOR
+
+
+def test_process_frame_reduced_decode(mock_video_client):
+    stream = UnitreeCameraVideoStream(fps=30)
+
+    frame = stream.process_frame(_jpeg(1280, 720))
+
+    data = np.frombuffer(base64.b64decode(frame), dtype=np.uint8)
+    assert cv2.imdecode(data, cv2.IMREAD_COLOR).shape == (360, 640, 3)
+    assert stream.passed_through == 0
+    assert stream.stage_seconds["decode"] > 0
+
+
+def test_process_frame_passthrough(mock_video_client):
+    stream = UnitreeCameraVideoStream(fps=30)
+    jpeg = _jpeg(640, 480)
+
+    assert base64.b64decode(stream.process_frame(jpeg)) == jpeg
+    assert stream.passed_through == 1
+
+    # a frame that does not fit the uplink is encoded again
+    stream.record_upload(len(jpeg), 1.0)
+    frame = stream.process_frame(jpeg)
+    assert base64.b64decode(frame) != jpeg
+    assert stream.passed_through == 1
+
+
+def test_process_frame_invalid(mock_video_client):
+    stream = UnitreeCameraVideoStream(fps=30)
+
+    assert stream.process_frame(b"not a jpeg") is None
+
+
+def test_adaptive_jpeg_quality():
+    quality = AdaptiveJpegQuality(fps=10, quality=70, min_quality=40, max_quality=80)
+
+    # no throughput measured yet
+    assert quality.update(10**6) == 70
+    assert quality.fits(10**6)
+
+    # 100 kB/s at 10 fps leaves 8 kB per frame
+    quality.record_upload(100_000, 1.0)
+    assert quality.frame_budget == pytest.approx(8000)
+    assert quality.update(10_000) == 65
+    assert quality.update(6_000) == 65
+    assert quality.update(3_000) == 70
+
+    for _ in range(20):
+        quality.update(10**6)
+    assert quality.quality == 40
+    for _ in range(20):
+        quality.update(1)
+    assert quality.quality == 80
+
+
+def test_adaptive_jpeg_quality_defaults_and_probing():
+    quality = AdaptiveJpegQuality(fps=10)
+    assert quality.max_quality == 70
+
+    # the uplink kept up, which bounds the throughput from below
+    quality.record_upload(10_000, 1.0, saturated=False)
+    assert quality.throughput is None
+
+    quality.record_upload(100_000, 1.0)
+    quality.record_upload(10_000, 1.0, saturated=False)
+    assert quality.throughput == pytest.approx(120_000)
+
+
+def test_uplink_meter():
+    meter = UplinkMeter(window=1.0)
+
+    assert meter.record(1000, pending=0, now=0.0) is None
+    assert meter.record(1000, pending=1, now=0.5) is None
+    # both frames left the queue
+    assert meter.record(1000, pending=0, now=1.0) == (2000, 1.0, False)
+    assert meter.record(1000, pending=1, now=1.5) is None
+    assert meter.record(1000, pending=1, now=2.0) == (1000, 1.0, True)
+
+
+class SlowUplinkClient:
+    """Websocket client stand-in whose send queue drains at a fixed rate."""
+
+    def __init__(self, bytes_per_second):
+        self.bytes_per_second = bytes_per_second
+        self.message_queue = queue.Queue()
+        self.credit = 0.0
+
+    def send_message(self, message):
+        self.message_queue.put(message)
+
+    def transmit(self, seconds):
+        self.credit += self.bytes_per_second * seconds
+        while not self.message_queue.empty():
+            size = len(self.message_queue.queue[0])
+            if size > self.credit:
+                break
+            self.credit -= size
+            self.message_queue.get()
+        if self.message_queue.empty():
+            self.credit = 0.0
+
+
+def run_uplink(provider, client, frame_bytes, seconds, fps=10):
+    clock = [0.0]
+    with patch(
+        "providers.unitree_camera_vlm_provider.time.perf_counter",
+        side_effect=lambda: clock[0],
+    ):
+        for _ in range(int(seconds * fps)):
+            provider._send_frame("x" * frame_bytes)
+            clock[0] += 1 / fps
+            client.transmit(1 / fps)
+
+
+def test_vlm_provider_measures_a_slow_uplink(mock_video_client, ws_url):
+    client = SlowUplinkClient(bytes_per_second=50_000)
+    with patch("providers.unitree_camera_vlm_provider.ws.Client", return_value=client):
+        provider = UnitreeCameraVLMProvider(ws_url, fps=10, dedupe_distance=-1)
+
+    # handing a frame to the client is instant, the network is not
+    run_uplink(provider, client, frame_bytes=10_000, seconds=10)
+
+    quality = provider.video_stream.quality
+    assert quality.throughput == pytest.approx(50_000, rel=0.25)
+    assert quality.update(10_000) == 65
+
+
+def test_vlm_provider_on_a_fast_uplink(mock_video_client, ws_url):
+    client = SlowUplinkClient(bytes_per_second=10**7)
+    with patch("providers.unitree_camera_vlm_provider.ws.Client", return_value=client):
+        provider = UnitreeCameraVLMProvider(ws_url, fps=10, dedupe_distance=-1)
+
+    run_uplink(provider, client, frame_bytes=10_000, seconds=10)
+
+    # the uplink never fell behind, the quality stays at its default cap
+    quality = provider.video_stream.quality
+    assert quality.throughput is None
+    assert quality.update(10_000) == 70
+
+
+def test_vlm_provider_without_a_send_queue(mock_video_client, ws_url):
+    provider = UnitreeCameraVLMProvider(ws_url, fps=10, dedupe_distance=-1)
+    provider.ws_client = Mock(spec=["send_message"])
+
+    provider._send_frame("frame")
+
+    provider.ws_client.send_message.assert_called_once_with("frame")
+    assert provider.video_stream.quality.throughput is None
+
+
+def test_vlm_provider_warns_once_without_a_send_queue(
+    mock_video_client, ws_url, caplog
+):
+    provider = UnitreeCameraVLMProvider(ws_url, fps=10, dedupe_distance=-1)
+    provider.ws_client = Mock(spec=["start", "stop", "send_message"])
+    provider.video_stream = Mock()
+    try:
+        with caplog.at_level(logging.WARNING):
+            provider.start()
+            provider._send_frame("frame")
+    finally:
+        provider.stop()
+
+    warnings = [r for r in caplog.records if "send queue" in r.getMessage()]
+    assert len(warnings) == 1
+
+
+def test_vlm_provider_does_not_warn_with_a_send_queue(
+    mock_video_client, ws_url, caplog
+):
+    client = SlowUplinkClient(bytes_per_second=50_000)
+    client.start = client.stop = Mock()
+    with patch("providers.unitree_camera_vlm_provider.ws.Client", return_value=client):
+        provider = UnitreeCameraVLMProvider(ws_url, fps=10, dedupe_distance=-1)
+    provider.video_stream = Mock()
+    try:
+        with caplog.at_level(logging.WARNING):
+            provider.start()
+    finally:
+        provider.stop()
+
+    assert not [r for r in caplog.records if "send queue" in r.getMessage()]
@@ -1,7 +1,13 @@
-from unittest.mock import Mock, patch
+import asyncio
+import base64
+from unittest.mock import AsyncMock, Mock, patch
 
+import cv2
+import numpy as np
 import pytest
+from openai.types.chat import ChatCompletion
 
+from providers.singleton import singleton
 from providers.vlm_openai_provider import VLMOpenAIProvider
 
 
@@ -22,7 +28,7 @@ def api_key():
 
 @pytest.fixture(autouse=True)
 def reset_singleton():
-    VLMOpenAIProvider._instance = None
+    singleton.instances = {}
     yield
 
 
@@ -101,3 +107,126 @@ def test_stop(base_url, api_key, fps, mock_dependencies):
     assert not provider.running
     provider.video_stream.stop.assert_called_once()
     assert not provider._thread.is_alive()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_frames_are_not_sent(base_url, api_key, fps, mock_dependencies):
+    provider = VLMOpenAIProvider(base_url, api_key, fps=fps)
+    provider.api_client.chat.completions.create.reset_mock()
+    image = cv2.GaussianBlur(
+        np.random.default_rng(0).integers(0, 256, (240, 320, 3), dtype=np.uint8),
+        (15, 15),
+        0,
+    )
+    frame = base64.b64encode(cv2.imencode(".jpg", image)[1]).decode()
+
+    await provider._process_frame(frame)
+    await provider._process_frame(frame)
+
+    provider.api_client.chat.completions.create.assert_called_once()
+    assert provider.frame_filter.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_frames_wait_for_the_request_in_flight(
+    base_url, api_key, fps, mock_dependencies
+):
+    provider = VLMOpenAIProvider(base_url, api_key, fps=fps)
+    callback = Mock()
+    provider.register_message_callback(callback)
+    replies = [asyncio.get_running_loop().create_future() for _ in range(2)]
+    provider.api_client.chat.completions.create = Mock(side_effect=replies)
+
+    first = asyncio.create_task(provider._process_frame("frame_1"))
+    await asyncio.sleep(0)
+    await provider._process_frame("frame_2")
+    await provider._process_frame("frame_3")
+
+    provider.api_client.chat.completions.create.assert_called_once()
+    assert provider.frame_window.dropped == 1
+
+    replies[0].set_result("response")
+    replies[1].set_result("newest")
+    await first
+
+    assert provider.api_client.chat.completions.create.call_count == 2
+    assert "frame_3" in str(provider.api_client.chat.completions.create.call_args)
+    assert [c.args[0] for c in callback.call_args_list] == ["response", "newest"]
+
+
+@pytest.mark.asyncio
+async def test_similar_frames_are_answered_from_the_cache(
+    base_url, api_key, fps, mock_dependencies
+):
+    provider = VLMOpenAIProvider(base_url, api_key, fps=fps, dedupe_distance=-1)
+    callback = Mock()
+    provider.register_message_callback(callback)
+    response = ChatCompletion.model_validate(
+        {
+            "id": "1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "a kitchen"},
+                }
+            ],
+        }
+    )
+    provider.api_client.chat.completions.create = AsyncMock(return_value=response)
+    image = cv2.GaussianBlur(
+        np.random.default_rng(0).integers(0, 256, (240, 320, 3), dtype=np.uint8),
+        (15, 15),
+        0,
+    )
+    frame = base64.b64encode(cv2.imencode(".jpg", image)[1]).decode()
+
+    await provider._process_frame(frame)
+    await provider._process_frame(frame)
+
+    provider.api_client.chat.completions.create.assert_awaited_once()
+    assert provider.caption_cache.hits == 1
+    replies = [c.args[0].choices[0].message.content for c in callback.call_args_list]
+    assert replies == ["a kitchen", "a kitchen"]
+
+
+@pytest.mark.asyncio
+async def test_static_scene_refresh_is_not_answered_from_the_cache(
+    base_url, api_key, fps, mock_dependencies
+):
+    provider = VLMOpenAIProvider(base_url, api_key, fps=fps, dedupe_interval=10.0)
+    assert provider.caption_cache.max_age == 600.0
+    response = ChatCompletion.model_validate(
+        {
+            "id": "1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "a kitchen"},
+                }
+            ],
+        }
+    )
+    provider.api_client.chat.completions.create = AsyncMock(return_value=response)
+    image = cv2.GaussianBlur(
+        np.random.default_rng(0).integers(0, 256, (240, 320, 3), dtype=np.uint8),
+        (15, 15),
+        0,
+    )
+    frame = base64.b64encode(cv2.imencode(".jpg", image)[1]).decode()
+
+    for now in (100.0, 105.0, 110.0):
+        with patch("time.time", return_value=now):
+            await provider._process_frame(frame)
+
+    # the duplicate is dropped, the refresh reaches the API
+    assert provider.frame_filter.dropped == 1
+    assert provider.api_client.chat.completions.create.await_count == 2
+    assert provider.caption_cache.hits == 0
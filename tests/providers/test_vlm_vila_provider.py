@@ -35,7 +35,7 @@ def test_initialization(ws_url, fps, mock_dependencies):
     provider = VLMVilaProvider(ws_url, fps=fps)
 
     mock_ws_client.assert_called_once_with(url=ws_url)
-    mock_video_stream.assert_called_once_with(provider.ws_client.send_message, fps=fps)
+    mock_video_stream.assert_called_once_with(provider._send_frame, fps=fps)
 
     assert not provider.running
     assert provider._thread is None
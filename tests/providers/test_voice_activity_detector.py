@@ -0,0 +1,148 @@
+import base64
+import json
+import os
+import wave
+
+import numpy as np
+import pytest
+
+from providers.audio_encoder import decode_audio_chunk
+from providers.voice_activity_detector import VoiceActivityDetector
+
+AUDIO_DIR = os.path.join(os.path.dirname(__file__), "audio")
+
+# 20 ms chunks at 16 kHz
+CHUNK_SAMPLES = 320
+
+
+def read_chunks(name):
+    with wave.open(os.path.join(AUDIO_DIR, name), "rb") as wav:
+        rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    size = CHUNK_SAMPLES * 2
+    return rate, [frames[i : i + size] for i in range(0, len(frames), size)]
+
+
+def as_messages(name):
+    rate, chunks = read_chunks(name)
+    return [
+        json.dumps({"audio": base64.b64encode(chunk).decode("utf-8"), "rate": rate})
+        for chunk in chunks
+    ]
+
+
+def run(vad, messages):
+    for message in messages:
+        vad(message)
+
+
+@pytest.fixture
+def sent():
+    return []
+
+
+@pytest.fixture
+def vad(sent):
+    return VoiceActivityDetector(sent.append)
+
+
+def test_room_tone_is_not_sent(vad, sent):
+    run(vad, as_messages("room_tone.wav"))
+    assert sent == []
+    assert vad.in_speech is False
+
+
+def test_fan_noise_is_not_sent(vad, sent):
+    run(vad, as_messages("fan_noise.wav"))
+    assert sent == []
+
+
+def test_utterance_is_sent_with_pre_roll_and_hangover(vad, sent):
+    messages = as_messages("utterance.wav")
+    run(vad, messages)
+
+    first = messages.index(sent[0])
+    last = messages.index(sent[-1])
+
+    # speech lasts from 0.6 s (chunk 30) to 1.8 s (chunk 90), followed
+    # by a 0.5 s hangover
+    assert 15 <= first <= 30
+    assert 100 <= last <= 116
+
+    # the short pause between the words is bridged by the hangover
+    assert sent == messages[first : last + 1]
+    assert len(sent) < len(messages) * 0.8
+    assert vad.in_speech is False
+
+
+def test_pre_roll_is_bounded(sent):
+    vad = VoiceActivityDetector(sent.append, pre_roll=0.1)
+    messages = as_messages("utterance.wav")
+    run(vad, messages)
+
+    onset = messages.index(sent[0])
+    # at most 0.1 s of audio is buffered before the onset chunk
+    assert vad.dropped_chunks >= onset - 5
+
+
+def test_speech_end_callback(vad, sent):
+    ends = []
+    vad.on_speech_end = lambda: ends.append(len(sent))
+    run(vad, as_messages("utterance.wav"))
+    assert ends == [len(sent)]
+
+
+def test_raw_pcm_chunks(vad, sent):
+    _, chunks = read_chunks("utterance.wav")
+    run(vad, chunks)
+    assert 0 < len(sent) < len(chunks)
+    assert all(isinstance(chunk, bytes) for chunk in sent)
+
+
+def test_messages_without_audio_are_forwarded(vad, sent):
+    vad(json.dumps({"tts_state": "started"}))
+    vad("not json")
+    assert sent == [json.dumps({"tts_state": "started"}), "not json"]
+
+
+def test_decoded_samples_are_passed_on():
+    forwarded = []
+    vad = VoiceActivityDetector(
+        lambda chunk, decoded: forwarded.append((chunk, decoded)), pass_decoded=True
+    )
+    run(vad, as_messages("utterance.wav"))
+
+    assert forwarded
+    for chunk, (samples, rate, _) in forwarded:
+        assert rate == 16000
+        assert np.array_equal(samples, decode_audio_chunk(chunk, 16000)[0])
+
+
+def hum(seconds, amplitude, seed=0):
+    """Motor hum: a loud 120 Hz tone with a little broadband noise, 20 ms chunks."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * 16000)) / 16000
+    audio = amplitude * np.sin(2 * np.pi * 120 * t) + rng.normal(0, 0.002, len(t))
+    pcm = (np.clip(audio, -1, 1) * 32767).astype("<i2").tobytes()
+    size = CHUNK_SAMPLES * 2
+    return [pcm[i : i + size] for i in range(0, len(pcm), size)]
+
+
+def test_noise_floor_recovers_from_a_step_in_background_noise(sent):
+    ends = []
+    vad = VoiceActivityDetector(sent.append, max_speech=5.0)
+    vad.on_speech_end = lambda: ends.append(len(sent))
+
+    run(vad, hum(2.0, 0.002))
+    assert sent == []
+
+    # a motor starts and keeps running
+    run(vad, hum(12.0, 0.1, seed=1))
+
+    assert ends
+    assert vad.in_speech is False
+    # the motor is only sent until the noise floor has caught up
+    assert len(sent) < 6.0 / 0.02
+    sent.clear()
+    run(vad, hum(2.0, 0.1, seed=2))
+    assert sent == []
@@ -1,8 +1,14 @@
 import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from inputs.base import SensorConfig
+from inputs.plugins.wallet_ethereum import WalletEthereum
 from llm.output_model import Command, CommandArgument
 from runtime.config import RuntimeConfig
 from runtime.cortex import CortexRuntime
@@ -134,6 +140,29 @@ async def test_run_cortex_loop(runtime):
     assert mocks["sleep_ticker_provider"].sleep.call_count == 3
 
 
+@pytest.mark.asyncio
+async def test_wake_during_tick_skips_next_sleep(runtime):
+    cortex_runtime, mocks = runtime
+    ticker = mocks["sleep_ticker_provider"]
+    ticker.skip_sleep = False
+    ticker.sleep = AsyncMock()
+
+    # an input requests a wake-up while the first tick is running
+    async def side_effect(*args):
+        if cortex_runtime._tick.call_count == 1:
+            ticker.skip_sleep = True
+        if cortex_runtime._tick.call_count >= 3:
+            raise Exception("Stop loop")
+
+    cortex_runtime._tick = AsyncMock(side_effect=side_effect)
+
+    with pytest.raises(Exception, match="Stop loop"):
+        await cortex_runtime._run_cortex_loop()
+
+    assert cortex_runtime._tick.call_count == 3
+    assert ticker.sleep.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_start_input_listeners(runtime):
     cortex_runtime, mocks = runtime
@@ -162,3 +191,76 @@ async def test_run_full_runtime(runtime):
 
     cortex_runtime._start_input_listeners.assert_called_once()
     cortex_runtime._run_cortex_loop.assert_called_once()
+
+
+class SlowRPCHandler(BaseHTTPRequestHandler):
+    """JSON-RPC stand-in that answers chain queries after a long delay."""
+
+    delay = 1.0
+    slow_calls = 0
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if request["method"] in ("eth_blockNumber", "eth_getBalance"):
+            SlowRPCHandler.slow_calls += 1
+            time.sleep(self.delay)
+            result = "0x10"
+        else:
+            result = "test/v1"
+
+        body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": result})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def slow_rpc_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowRPCHandler)
+    server.daemon_threads = True
+    SlowRPCHandler.slow_calls = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_slow_rpc_does_not_delay_ticks(runtime, slow_rpc_url):
+    cortex_runtime, mocks = runtime
+    mocks["sleep_ticker_provider"].skip_sleep = False
+    mocks["sleep_ticker_provider"].sleep = asyncio.sleep
+
+    wallet = WalletEthereum(
+        SensorConfig(rpc_url=slow_rpc_url, poll_interval=0.01, max_poll_interval=None)
+    )
+    cortex_runtime.config.agent_inputs = [wallet]
+
+    tick_times = []
+
+    async def tick():
+        tick_times.append(time.perf_counter())
+
+    cortex_runtime._tick = tick
+
+    listener_task = await cortex_runtime._start_input_listeners()
+    cortex_task = asyncio.create_task(cortex_runtime._run_cortex_loop())
+    await asyncio.sleep(1.5)
+
+    for task in (listener_task, cortex_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    assert SlowRPCHandler.slow_calls >= 1
+    gaps = [later - earlier for earlier, later in zip(tick_times, tick_times[1:])]
+    # ticks every 0.1 seconds at 10 hertz, a blocked loop would stall for 1 second
+    assert len(tick_times) >= 10
+    assert max(gaps) < 0.3
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import sys
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from runtime.profiler import ImportProfiler, _run_until_first_tick, profile_startup
+
+
+@pytest.fixture
+def plugin_modules(tmp_path):
+    (tmp_path / "profiled_child.py").write_text("import time\ntime.sleep(0.02)\n")
+    (tmp_path / "profiled_parent.py").write_text("import profiled_child\n")
+    sys.path.insert(0, str(tmp_path))
+    yield
+    sys.path.remove(str(tmp_path))
+    for name in ("profiled_parent", "profiled_child"):
+        sys.modules.pop(name, None)
+
+
+def test_import_profiler_records_tree(plugin_modules):
+    with ImportProfiler() as profiler:
+        import profiled_parent  # noqa: F401
+
+    records = {r.module: r for r in profiler.records}
+    assert records["profiled_parent"].parent is None
+    assert records["profiled_child"].parent == "profiled_parent"
+    assert records["profiled_child"].self_s >= 0.02
+    assert (
+        records["profiled_parent"].cumulative_s
+        >= records["profiled_child"].cumulative_s
+    )
+    assert profiler not in sys.meta_path
+    assert "profiled_child" in profiler.format_tree()
+
+
+def test_import_profiler_restores_loader(plugin_modules):
+    with ImportProfiler():
+        import profiled_parent
+
+    assert type(profiled_parent.__loader__).__name__ == "SourceFileLoader"
+
+
+@pytest.mark.asyncio
+async def test_run_until_first_tick():
+    runtime = Mock()
+    runtime._tick = AsyncMock()
+
+    async def run():
+        while True:
+            await runtime._tick()
+            await asyncio.sleep(0.01)
+
+    runtime.run = run
+    assert await _run_until_first_tick(runtime, timeout=1.0) is not None
+
+
+@pytest.mark.asyncio
+async def test_run_until_first_tick_timeout():
+    runtime = Mock()
+    runtime._tick = AsyncMock()
+
+    async def run():
+        await asyncio.sleep(10)
+
+    runtime.run = run
+
+    assert await _run_until_first_tick(runtime, timeout=0.05) is None
+
+
+def test_profile_startup_writes_report(tmp_path):
+    output = tmp_path / "profile.json"
+    with (
+        patch("runtime.config.load_config") as mock_load_config,
+        patch("runtime.cortex.CortexRuntime"),
+        patch(
+            "runtime.profiler._run_until_first_tick", new=AsyncMock(return_value=None)
+        ),
+    ):
+        report = profile_startup("test_config", str(output), timeout=1.0)
+
+    mock_load_config.assert_called_once_with("test_config")
+    assert json.loads(output.read_text()) == report
+    assert [s["name"] for s in report["summary"]] == [
+        "imports",
+        "load_config",
+        "first_tick",
+    ]
@@ -1,8 +1,10 @@
+import ast
+import os
 from unittest.mock import Mock, patch
 
 import pytest
 
-from simulators import load_simulator
+from simulators import SIMULATOR_PLUGINS, load_simulator
 from simulators.base import Simulator
 
 
@@ -79,3 +81,37 @@ def test_load_simulator_non_simulator_class():
 
         with pytest.raises(ValueError, match="Simulator NonSimulator not found"):
             load_simulator("NonSimulator")
+
+
+def test_load_simulator_registry_imports_only_plugin_module():
+    with (
+        patch.dict("simulators.SIMULATOR_PLUGINS", {"MockSimulator": "mock_simulator"}),
+        patch("os.listdir") as mock_listdir,
+        patch("importlib.import_module") as mock_import,
+    ):
+        mock_module = Mock()
+        mock_module.MockSimulator = MockSimulator
+        mock_import.return_value = mock_module
+
+        result = load_simulator("MockSimulator")
+
+        mock_import.assert_called_once_with("simulators.plugins.mock_simulator")
+        mock_listdir.assert_not_called()
+        assert result == MockSimulator
+
+
+def test_simulator_registry_matches_plugins():
+    plugins_dir = os.path.join("src", "simulators", "plugins")
+    plugin_classes = {}
+    for plugin_file in os.listdir(plugins_dir):
+        if not plugin_file.endswith(".py"):
+            continue
+        with open(os.path.join(plugins_dir, plugin_file)) as f:
+            tree = ast.parse(f.read())
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and any(
+                ast.unparse(base) == "Simulator" for base in node.bases
+            ):
+                plugin_classes[node.name] = plugin_file[:-3]
+
+    assert SIMULATOR_PLUGINS == plugin_classes